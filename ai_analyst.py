@@ -1,27 +1,35 @@
 import streamlit as st
 import os
-from langchain_google_genai import ChatGoogleGenerativeAI
+import time
+import queue
+import hashlib
+import threading
 
-def ask_ai(ticker, name, fwd, growth, accel_str, bond_msg, cli_msg, signal_msg):
-    # Streamlit Cloud의 Secrets 또는 로컬 환경변수 사용
-    api_key = st.secrets.get("GOOGLE_API_KEY") or os.getenv("GOOGLE_API_KEY")
-    if not api_key: return "⚠️ API Key가 설정되지 않았습니다. (Secrets 설정 필요)"
+import recorder
+from cache import Cache
+from recorder import wrap_llm
+from telemetry import record_span, cache_hook
 
-    try:
-        llm = ChatGoogleGenerativeAI(model="gemini-2.5-flash", temperature=0.1, google_api_key=api_key)
-        prompt = f"""
+MODEL_NAME = "gemini-2.5-flash"
+CACHE_TTL = 3600
+CACHE_MAX_ENTRIES = 256
+# AI_FAKE_LLM=1 이면 Gemini 대신 로컬 가짜 모델 사용 (오프라인 테스트용)
+FAKE_LLM = os.getenv("AI_FAKE_LLM") == "1"
+
+def build_prompt(ticker, name, fwd, growth, accel_str, bond_msg, cli_msg, signal_msg):
+    return f"""
         당신은 월가의 전설적인 펀드매니저입니다. '{name}({ticker})' 종목을 정밀 분석해 주세요.
 
         [1. 매크로 위험 평가 (Critical Rules)]
         - 채권 시장 상태: {bond_msg}
-          
+
         - 경기 선행 지수(CLI) 추세: {cli_msg}
-          
+
 
         [2. 종목 펀더멘털 (AI 자체 지식 활용)]
         - **섹터 판단**: 이 종목이 경기민감주(Cyclical)인지 방어주(Defensive)인지 판단하세요.
-        - {ticker}의 선행 PER을 검색해서 평가해. 
-        
+        - {ticker}의 선행 PER을 검색해서 평가해.
+
 
         [3. 이익 모멘텀 데이터]
         - 12M Fwd EPS: {fwd:,.2f}
@@ -33,14 +41,118 @@ def ask_ai(ticker, name, fwd, growth, accel_str, bond_msg, cli_msg, signal_msg):
         이 글은 투자권유가 아니며 투자의 책임은 본인에게 있습니다. 이글을 맨 앞에 명시해.
         너의 결론은 먼저 짧게 말하고 굵은 글씨로 써.
         경기 민감주는 메크로 위험평가에 가중을 더 두고, 경기 방어주는 메크로 위험 평가 가중을 덜 줘.
-        
+
         결론 이유 3가지:
         1. 매크로(CLI/채권)와 섹터의 적합성.
         2. 이익 모멘텀(가속도) 분석 결과.
         3. {ticker}의 선행 PER을 고려해.
-        
-        
+
+
         **반드시 한국어로 답변해 주세요.**
         """
-        return llm.invoke(prompt).content
-    except Exception as e: return f"Error: {e}"
\ No newline at end of file
+
+# -----------------------------------------------------------
+# 1. 응답 캐시 (TTL + LRU, 공용 캐시 구현 - 스트리밍이라 get/put 으로 직접 사용)
+# -----------------------------------------------------------
+_cache = Cache("ask_ai", ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES, hook=cache_hook)
+
+def cache_key(*inputs):
+    return hashlib.sha256(repr((MODEL_NAME,) + inputs).encode("utf-8")).hexdigest()
+
+# -----------------------------------------------------------
+# 2. LLM 클라이언트 (API 키별로 한 번만 생성해 재사용)
+# -----------------------------------------------------------
+class FakeLLM:
+    """네트워크 없이 프롬프트 요약을 조각 단위로 돌려주는 로컬 모델"""
+    class Chunk:
+        def __init__(self, content): self.content = content
+
+    def __init__(self, delay=0.0): self.delay = delay
+
+    def stream(self, prompt):
+        text = f"**[오프라인 모의 응답]** 이 글은 투자권유가 아닙니다. 프롬프트 {len(prompt)}자 수신."
+        for word in text.split(" "):
+            if self.delay: time.sleep(self.delay)
+            yield self.Chunk(word + " ")
+
+    def invoke(self, prompt):
+        return self.Chunk("".join(c.content for c in self.stream(prompt)))
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+def get_llm(api_key):
+    if FAKE_LLM: return FakeLLM()
+    with _clients_lock:
+        if api_key not in _clients:
+            def factory():  # 재생 모드에서는 호출되지 않으므로 langchain 없이도 동작
+                from langchain_google_genai import ChatGoogleGenerativeAI
+                return ChatGoogleGenerativeAI(model=MODEL_NAME, temperature=0.1, google_api_key=api_key)
+            _clients[api_key] = wrap_llm(factory)
+        return _clients[api_key]
+
+def get_api_key():
+    # Streamlit Cloud의 Secrets 또는 로컬 환경변수 사용
+    try: key = st.secrets.get("GOOGLE_API_KEY")
+    except Exception: key = None
+    return key or os.getenv("GOOGLE_API_KEY")
+
+# -----------------------------------------------------------
+# 3. 스트리밍 분석 (백그라운드 스레드에서 먼저 시작 -> 화면 렌더링과 동시 진행)
+# -----------------------------------------------------------
+def stream_ai(ticker, name, fwd, growth, accel_str, bond_msg, cli_msg, signal_msg, api_key=None, llm=None):
+    key = cache_key(ticker, name, f"{fwd:,.2f}", f"{growth:.2f}", accel_str, bond_msg, cli_msg, signal_msg)
+    cached = _cache.get(key)
+    if cached is not None:
+        yield cached
+        return
+
+    if llm is None:
+        api_key = api_key or get_api_key()
+        if not api_key and not FAKE_LLM and recorder.MODE != "replay":
+            yield "⚠️ API Key가 설정되지 않았습니다. (Secrets 설정 필요)"
+            return
+
+    parts = []
+    t0 = time.perf_counter()
+    try:
+        llm = llm or get_llm(api_key)
+        for chunk in llm.stream(build_prompt(ticker, name, fwd, growth, accel_str, bond_msg, cli_msg, signal_msg)):
+            if not parts: record_span("ai.first_token", (time.perf_counter() - t0) * 1000)
+            text = chunk.content if isinstance(chunk.content, str) else "".join(map(str, chunk.content))
+            parts.append(text)
+            yield text
+    except Exception as e:
+        record_span("ai.total", (time.perf_counter() - t0) * 1000, error=type(e).__name__)
+        yield f"Error: {e}"
+        return
+    record_span("ai.total", (time.perf_counter() - t0) * 1000)
+    if parts: _cache.put(key, "".join(parts))  # 오류/빈 응답은 캐시하지 않음
+
+class AIJob:
+    """LLM 호출을 즉시 시작하고, 나중에 chunks() 로 받은 토큰부터 차례로 소비"""
+    _DONE = object()
+
+    def __init__(self, *args, **kwargs):
+        self.q = queue.Queue()
+        self.thread = threading.Thread(target=self._run, args=args, kwargs=kwargs, name="ai-analyst", daemon=True)
+        self.thread.start()
+
+    def _run(self, *args, **kwargs):
+        try:
+            for text in stream_ai(*args, **kwargs): self.q.put(text)
+        finally:
+            self.q.put(self._DONE)
+
+    def chunks(self):
+        while True:
+            item = self.q.get()
+            if item is self._DONE: return
+            yield item
+
+def start_ai(ticker, name, fwd, growth, accel_str, bond_msg, cli_msg, signal_msg):
+    # st.secrets 는 스크립트 스레드에서 읽어 넘겨준다
+    return AIJob(ticker, name, fwd, growth, accel_str, bond_msg, cli_msg, signal_msg, api_key=get_api_key())
+
+def ask_ai(ticker, name, fwd, growth, accel_str, bond_msg, cli_msg, signal_msg):
+    return "".join(stream_ai(ticker, name, fwd, growth, accel_str, bond_msg, cli_msg, signal_msg))
@@ -0,0 +1,197 @@
+"""EPS 가속도 + CLI 국면 신호 워크포워드 백테스트
+
+사용법:
+  python backtest.py --snapshots eps.parquet --prices prices.csv --cli cli.csv
+  python backtest.py --synthetic 500 --years 12          # 합성 데이터로 속도 확인
+
+입력 (CSV 또는 Parquet)
+  snapshots: ticker, snapshot_date, year, quarter, source, value  (estimate_store 와 같은 형식)
+  prices   : date, ticker, close  (long) 또는 date 인덱스 x 티커 컬럼 (wide)
+  cli      : date 인덱스 x CLI 컬럼 ('미국_CLI', '한국_CLI' ...)
+"""
+import sys
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from logic import (quarter_ordinal, calculate_12m_fwd_rows, calculate_growth_accel,
+                   classify_cli_array, classify_trade_signal_codes, CLI_REGIMES, TRADE_SIGNALS)
+from ticker_index import country_of
+
+CLI_COLUMNS = {'US': '미국_CLI', 'KR': '한국_CLI'}
+# 신호 코드 = TRADE_SIGNALS 인덱스 (실시간 신호와 같은 classify_trade_signal_codes 사용)
+STRONG_BUY, WEAK_BUY, SELL = range(len(TRADE_SIGNALS))
+
+# -----------------------------------------------------------
+# 1. 입력 로딩
+# -----------------------------------------------------------
+def read_table(path, **kwargs):
+    return pd.read_parquet(path) if str(path).endswith(".parquet") else pd.read_csv(path, **kwargs)
+
+def load_snapshots(path):
+    df = read_table(path)
+    df['snapshot_date'] = pd.to_datetime(df['snapshot_date'])
+    return df
+
+def load_prices(path):
+    df = read_table(path)
+    if {'date', 'ticker', 'close'} <= set(df.columns):
+        df = df.pivot_table(index='date', columns='ticker', values='close', aggfunc='last')
+    else:
+        df = df.set_index(df.columns[0])
+    df.index = pd.to_datetime(df.index)
+    return df.sort_index()
+
+def load_cli(path):
+    df = read_table(path, index_col=0)
+    if 'date' in df.columns: df = df.set_index('date')
+    df.index = pd.to_datetime(df.index)
+    return df.sort_index()
+
+# -----------------------------------------------------------
+# 2. (종목, 월) 전체 신호를 배열 연산으로 계산
+# -----------------------------------------------------------
+def point_in_time_quarters(snapshots, tickers, months):
+    """월말 시점에 알려져 있던 분기 EPS 배열 (len(tickers)*len(months), Q)
+    우선순위: 확정 실적 > 분기 추정치 > 연간 추정치/4 (EpsPanel 과 동일)"""
+    df = snapshots.sort_values('snapshot_date')
+    df = df.assign(month=df['snapshot_date'].dt.to_period('M'),
+                   value=df['value'].fillna(np.inf))  # NULL(삭제 표시)은 ffill 뒤 다시 NaN
+    df = df.drop_duplicates(['ticker', 'month', 'source', 'year', 'quarter'], keep='last')
+    wide = df.pivot(index=['ticker', 'month'], columns=['source', 'year', 'quarter'], values='value')
+    wide = wide.reindex(pd.MultiIndex.from_product([tickers, months], names=['ticker', 'month']))
+    wide = wide.groupby(level='ticker').ffill().replace(np.inf, np.nan)
+
+    years = wide.columns.get_level_values('year')
+    base = quarter_ordinal(int(years.min()), 1)
+    width = (int(years.max()) - int(years.min()) + 1) * 4
+    layers = {s: np.full((len(wide), width), np.nan) for s in ('actual', 'quarter', 'annual')}
+    for (source, yr, q), col in zip(wide.columns, wide.to_numpy().T):
+        if source == 'annual':
+            start = quarter_ordinal(yr, 1) - base
+            layers['annual'][:, start:start + 4] = (col / 4)[:, None]
+        else:
+            layers[source][:, quarter_ordinal(yr, q) - base] = col
+
+    merged = np.where(np.isnan(layers['quarter']), layers['annual'], layers['quarter'])
+    merged = np.where(np.isnan(layers['actual']), merged, layers['actual'])
+    mask = ~np.isnan(merged)
+    return np.where(mask, merged, 0.0), mask, base
+
+def compute_signals(snapshots, cli, tickers, months, cli_lag=1):
+    """-> dict of (N, T) 배열: fwd, growth, accel, signal(TRADE_SIGNALS 인덱스), regime(-1~7)"""
+    values, mask, base = point_in_time_quarters(snapshots, tickers, months)
+    month_ords = np.tile(months.year * 12 + months.month - 1, len(tickers))
+    fwd = calculate_12m_fwd_rows(values, mask, base, month_ords).reshape(len(tickers), len(months))
+    growth, accel = calculate_growth_accel(fwd)
+
+    prev = np.concatenate([fwd[:, :1], fwd[:, :-1]], axis=1)
+    signal = classify_trade_signal_codes(fwd, prev, accel)
+    signal[:, 0] = SELL  # 비교할 전월 값 없음
+
+    # CLI 는 발표 지연이 있으므로 cli_lag 개월 전 값까지만 사용
+    cli_m = cli.groupby(cli.index.to_period('M')).last().reindex(months)
+    cli_m = cli_m.shift(cli_lag)
+    country_codes = {}
+    for country, column in CLI_COLUMNS.items():
+        if column in cli_m.columns:
+            country_codes[country] = classify_cli_array(cli_m[column].to_numpy())
+    no_data = np.full(len(months), -1, dtype=np.int8)
+    regime = np.stack([country_codes.get(country_of(t), no_data) for t in tickers])
+    return {'fwd': fwd, 'growth': growth, 'accel': accel, 'signal': signal, 'regime': regime}
+
+# -----------------------------------------------------------
+# 3. 포지션 시뮬레이션 + 국면별 성과
+# -----------------------------------------------------------
+def monthly_forward_returns(prices, tickers, months):
+    close = prices.reindex(columns=tickers)
+    close = close.groupby(close.index.to_period('M')).last().reindex(months)
+    return (close.shift(-1) / close - 1).to_numpy().T  # (N, T): 월말 진입 -> 다음 월말 청산
+
+def portfolio_stats(weights, fwd_ret):
+    """weights: (N, T) 보유 여부(1/0). 동일가중, 보유 종목이 없는 달은 현금"""
+    held = weights & ~np.isnan(fwd_ret)
+    count = held.sum(axis=0)
+    w = np.where(count > 0, held / np.maximum(count, 1), 0.0)
+    port = np.nansum(w * np.nan_to_num(fwd_ret), axis=0)
+    equity = np.cumprod(1 + port)
+    drawdown = equity / np.maximum.accumulate(equity) - 1
+    trades = fwd_ret[held]
+    return {
+        '포지션 수': int(held.sum()),
+        '누적 수익률(%)': (equity[-1] - 1) * 100 if len(equity) else 0.0,
+        '월평균 수익률(%)': port[count > 0].mean() * 100 if (count > 0).any() else 0.0,
+        '적중률(%)': (trades > 0).mean() * 100 if len(trades) else np.nan,
+        '최대 낙폭(%)': drawdown.min() * 100 if len(drawdown) else 0.0,
+        '월평균 회전율(%)': np.abs(np.diff(w, axis=1)).sum(axis=0).mean() / 2 * 100 if w.shape[1] > 1 else 0.0,
+    }
+
+def run_backtest(snapshots, prices, cli, buy_signals=(STRONG_BUY,), cli_lag=1, start=None, end=None):
+    tickers = sorted(set(snapshots['ticker']) & set(prices.columns))
+    first = pd.Timestamp(start) if start else snapshots['snapshot_date'].min()
+    last = pd.Timestamp(end) if end else prices.index.max()
+    months = pd.period_range(first, last, freq='M')
+
+    sig = compute_signals(snapshots, cli, tickers, months, cli_lag)
+    fwd_ret = monthly_forward_returns(prices, tickers, months)
+    long = np.isin(sig['signal'], buy_signals)
+
+    rows = {'전체': portfolio_stats(long, fwd_ret)}
+    for code, (label, _) in enumerate(CLI_REGIMES):
+        rows[label] = portfolio_stats(long & (sig['regime'] == code), fwd_ret)
+    rows['국면 정보 없음'] = portfolio_stats(long & (sig['regime'] < 0), fwd_ret)
+    report = pd.DataFrame.from_dict(rows, orient='index')
+    return report, sig
+
+# -----------------------------------------------------------
+# 4. 합성 데이터 (속도 측정용)
+# -----------------------------------------------------------
+def synthetic_inputs(n_tickers=300, years=12, seed=0):
+    rng = np.random.default_rng(seed)
+    end = pd.Timestamp.today().normalize()
+    months = pd.period_range(end - pd.DateOffset(years=years), end, freq='M')
+    tickers = [f"{i:06d}.KS" if i % 2 else f"US{i:04d}" for i in range(n_tickers)]
+
+    snaps = []
+    for t_i, t in enumerate(tickers):
+        level = rng.uniform(500, 5000)
+        for m in months:
+            level *= 1 + rng.normal(0.004, 0.03)
+            snap = m.to_timestamp(how='end').normalize()
+            for yr in (m.year, m.year + 1):
+                snaps.append((t, snap, yr, 0, 'annual', level * (1.08 if yr > m.year else 1)))
+    snapshots = pd.DataFrame(snaps, columns=['ticker', 'snapshot_date', 'year', 'quarter', 'source', 'value'])
+
+    days = pd.bdate_range(months[0].start_time, end)
+    rets = rng.normal(0.0003, 0.02, (len(days), n_tickers))
+    prices = pd.DataFrame(100 * np.exp(np.cumsum(rets, axis=0)), index=days, columns=tickers)
+    cli_idx = months.to_timestamp()
+    cli = pd.DataFrame({col: 100 + np.cumsum(rng.normal(0, 0.2, len(cli_idx))) for col in CLI_COLUMNS.values()},
+                       index=cli_idx)
+    return snapshots, prices, cli
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description="EPS 가속도 + CLI 국면 워크포워드 백테스트")
+    p.add_argument("--snapshots"); p.add_argument("--prices"); p.add_argument("--cli")
+    p.add_argument("--synthetic", type=int, help="합성 종목 수")
+    p.add_argument("--years", type=int, default=12)
+    p.add_argument("--include-weak", action="store_true", help="'소극 대응' 신호도 매수로 취급")
+    p.add_argument("--cli-lag", type=int, default=1)
+    args = p.parse_args()
+
+    if args.synthetic:
+        snapshots, prices, cli = synthetic_inputs(args.synthetic, args.years)
+    elif args.snapshots and args.prices and args.cli:
+        snapshots, prices, cli = load_snapshots(args.snapshots), load_prices(args.prices), load_cli(args.cli)
+    else:
+        p.print_help(); sys.exit(1)
+
+    t0 = time.perf_counter()
+    report, sig = run_backtest(snapshots, prices, cli, (STRONG_BUY, WEAK_BUY) if args.include_weak else (STRONG_BUY,), args.cli_lag)
+    elapsed = time.perf_counter() - t0
+    pd.set_option('display.width', 160)
+    print(report.round(2))
+    print(f"\n{sig['signal'].shape[0]} tickers x {sig['signal'].shape[1]} months, {len(snapshots):,} snapshot rows "
+          f"-> {elapsed:.2f}s")
@@ -0,0 +1,92 @@
+"""야간 배치: 전 종목 신호를 계산해 Parquet/CSV 로 저장 (streamlit 없이 실행)
+
+  python batch.py --universe krx --workers 16 --out data/signals.parquet
+  python batch.py --tickers "삼성전자,NVDA,AAPL" --out data/signals.csv
+  python batch.py --file watchlist.txt
+"""
+import os
+import sys
+import time
+import argparse
+import datetime
+import functools
+
+import pandas as pd
+
+import signals
+from screener import screen_universe, parse_watchlist, krx_universe, analyze_ticker, SCREEN_COLUMNS
+from peer_rank import add_peer_ranks
+
+RESULTS_PATH = os.getenv("BATCH_RESULTS_PATH", os.path.join("data", "signals.csv"))
+
+def write_results(df, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    if path.endswith(".parquet"):
+        try:
+            df.to_parquet(path, index=False)
+            return path
+        except ImportError:  # pyarrow/fastparquet 미설치
+            path = path[:-len(".parquet")] + ".csv"
+            print(f"⚠️ Parquet 엔진이 없어 CSV 로 저장합니다: {path}")
+    df.to_csv(path, index=False, encoding="utf-8-sig")
+    return path
+
+def results_path(path=RESULTS_PATH):
+    """실제로 읽을 파일: .parquet 대신 CSV 로 저장됐을 수 있으므로 둘 중 최신 (없으면 None)"""
+    candidates = [path] + ([path[:-len(".parquet")] + ".csv"] if path.endswith(".parquet") else [])
+    existing = [c for c in candidates if os.path.exists(c)]
+    return max(existing, key=os.path.getmtime) if existing else None
+
+def load_results(path=RESULTS_PATH):
+    path = results_path(path)
+    if path is None: return None
+    return pd.read_parquet(path) if path.endswith(".parquet") else pd.read_csv(path)
+
+def run_batch(targets, macro, workers=16, timeout=30, progress_every=100, prices=None):
+    analyze = functools.partial(analyze_ticker, macro=macro)
+    rows, t0 = [], time.perf_counter()
+    for row in screen_universe(targets, max_workers=workers, timeout=timeout, analyze=analyze):
+        rows.append(row)
+        if progress_every and len(rows) % progress_every == 0:
+            print(f"  {len(rows)}/{len(targets)} ({time.perf_counter() - t0:.0f}s)", flush=True)
+
+    df = pd.DataFrame(rows, columns=SCREEN_COLUMNS)
+    if prices is not None:
+        ok = df.loc[df['Status'] == "OK", 'Ticker'].tolist()
+        prices.update(ok)  # 종목별 호출 대신 묶음 요청, 마지막 저장일 이후만
+        df['Close'] = [(prices.latest_close(t) or (None, None))[1] for t in df['Ticker']]
+    cli_msgs = {country: macro.cli_for(country).msg for country in signals.CLI_NAMES}
+    df['CLI'] = df['Country'].map(cli_msgs)
+    df['Bond'] = macro.bond_risk_msg
+    df = add_peer_ranks(df)  # 시장 / 시장 x 섹터 안의 백분위와 z-점수
+    df['AsOf'] = datetime.datetime.now().isoformat(timespec='seconds')
+    return df.sort_values(['Accel', 'Growth'], ascending=False, na_position='last').reset_index(drop=True)
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description="EPS 가속도 신호 야간 배치")
+    p.add_argument("--universe", choices=["krx"], help="KRX 전 종목")
+    p.add_argument("--tickers", help="쉼표로 구분한 종목명/티커")
+    p.add_argument("--file", help="한 줄에 하나씩 종목명/티커가 적힌 파일")
+    p.add_argument("--workers", type=int, default=16)
+    p.add_argument("--timeout", type=float, default=30)
+    p.add_argument("--out", default=RESULTS_PATH)
+    p.add_argument("--no-prices", action="store_true", help="종가 저장소 갱신 생략")
+    args = p.parse_args()
+
+    if args.universe == "krx": targets = krx_universe()
+    elif args.file:
+        with open(args.file, encoding="utf-8") as f: targets = parse_watchlist(f.read())
+    elif args.tickers: targets = parse_watchlist(args.tickers)
+    else: p.print_help(); sys.exit(1)
+
+    from data_loader import get_macro_data
+    macro = signals.evaluate_macro(*get_macro_data())
+    print(f"{len(targets)}종목 분석 시작 (workers={args.workers})")
+    prices = None
+    if not args.no_prices:
+        from price_store import get_price_store
+        prices = get_price_store()
+    df = run_batch(targets, macro, args.workers, args.timeout, prices=prices)
+    path = write_results(df, args.out)
+    ok = (df['Status'] == "OK").sum()
+    print(f"완료: {ok}/{len(df)} 성공 -> {path}")
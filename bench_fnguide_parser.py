@@ -0,0 +1,58 @@
+"""FnGuide SVD_Main 파서 벤치마크: pd.read_html 전체 파싱 vs lxml 표적 파서
+
+사용법: python bench_fnguide_parser.py [HTML 폴더] [반복 횟수]   (기본 fixtures/fnguide 50)
+폴더에는 SVD_Main.asp 응답을 그대로 저장한 *.html 파일을 둔다.
+fixtures/fnguide/A005930_synthetic.html 은 실제 페이지 구조(하이라이트 표 4개 + 기타 표)를
+본뜬 합성 페이지로, 원격 접속 없이 동작 비교를 하기 위한 것이다.
+"""
+import os
+import re
+import sys
+import glob
+import time
+from io import StringIO
+
+import pandas as pd
+
+from fnguide_parser import parse_fnguide_eps
+
+# 교체 전 구현 (get_fnguide_data 의 파싱 부분)
+def legacy_parse(html):
+    tables = pd.read_html(StringIO(html))
+    merged = {}
+    for df in tables:
+        if any(df.iloc[:, 0].astype(str).str.contains("EPS|주당순이익")):
+            row = df[df.iloc[:, 0].astype(str).str.contains("EPS|주당순이익")].iloc[0]
+            for i, col in enumerate(df.columns):
+                if i == 0: continue
+                date_match = re.search(r"(\d{4}/\d{2})", str(col))
+                if date_match:
+                    is_quarter = "분기" in str(df.columns) or "Quarter" in str(df.columns)
+                    tag = "Q|" if is_quarter else "A|"
+                    val = str(row.iloc[i]).replace(',', '').split('(')[0]
+                    if val.strip() not in ['-', '', 'nan', 'N/A']:
+                        merged[f"{tag}{date_match.group(1)}"] = int(float(val))
+    return merged
+
+def timed(fn, html, repeat):
+    t0 = time.perf_counter()
+    for _ in range(repeat): out = fn(html)
+    return out, (time.perf_counter() - t0) / repeat
+
+if __name__ == "__main__":
+    folder = sys.argv[1] if len(sys.argv) > 1 else os.path.join("fixtures", "fnguide")
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    pages = sorted(glob.glob(os.path.join(folder, "*.html")))
+    if not pages: sys.exit(f"{folder} 에 HTML 파일이 없습니다.")
+
+    total_old = total_new = 0
+    for path in pages:
+        with open(path, encoding="utf-8") as f: html = f.read()
+        old, t_old = timed(legacy_parse, html, repeat)
+        new, t_new = timed(parse_fnguide_eps, html, repeat)
+        if old != new:
+            raise AssertionError(f"{os.path.basename(path)}: 결과 불일치\n{old}\n{new}")
+        total_old += t_old; total_new += t_new
+        print(f"{os.path.basename(path):<28} read_html {t_old*1000:7.2f} ms | lxml {t_new*1000:6.2f} ms "
+              f"| x{t_old / t_new:4.1f} | {len(new)} keys match")
+    print(f"{'TOTAL':<28} read_html {total_old*1000:7.2f} ms | lxml {total_new*1000:6.2f} ms | x{total_old / total_new:4.1f}")
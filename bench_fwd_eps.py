@@ -0,0 +1,123 @@
+"""12M Fwd EPS 엔진 벤치마크: 기존 이중 루프 vs NumPy 배치 엔진, 사전 병합 vs EpsPanel 일괄 병합
+
+사용법: python bench_fwd_eps.py [종목 수 ...]   (기본 1 5000)
+"""
+import sys
+import time
+import random
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from logic import calculate_12m_fwd_batch
+from estimate_store import split_layers
+from eps_panel import EpsPanel
+
+# 교체 전 구현 (결과 비교 기준)
+def legacy_12m_fwd_series(q_map):
+    if not q_map: return pd.DataFrame()
+
+    dates = pd.date_range(end=datetime.date.today(), periods=13, freq='ME')
+    trend_data = []
+
+    for d in dates:
+        fwd_eps_sum = 0
+        valid_months = 0
+        for i in range(12):
+            target_date = d + pd.DateOffset(months=i+1)
+            y = target_date.year
+            m = target_date.month
+            q = (m - 1) // 3 + 1
+            q_eps = q_map.get((y, q))
+            if q_eps is not None:
+                fwd_eps_sum += (q_eps / 3)
+                valid_months += 1
+
+        if valid_months >= 6:
+            trend_data.append(fwd_eps_sum * (12 / valid_months))
+        else:
+            trend_data.append(0)
+
+    return pd.DataFrame({'12M Fwd EPS': trend_data}, index=dates)
+
+# 교체 전 우선순위 병합 (사전 덮어쓰기: 연간/4 < 분기 추정치 < 확정 실적)
+def legacy_priority_map(past_map, est_annual, est_quarter):
+    q_map = {}
+    for yr, val in est_annual.items():
+        for q in range(1, 5): q_map[(yr, q)] = val / 4
+    for (yr, q), val in est_quarter.items(): q_map[(yr, q)] = val
+    for (yr, q), val in past_map.items(): q_map[(yr, q)] = val
+    return q_map
+
+def legacy_q_map(layers):
+    return legacy_priority_map(*split_layers(layers))
+
+def actual_layers(q_map):
+    """{(year, q): eps} -> 확정 실적 레이어 (EpsPanel 입력)"""
+    return {('actual', y, q): v for (y, q), v in q_map.items()}
+
+def random_q_map(rng):
+    curr_y = datetime.date.today().year
+    q_map = {}
+    for yr in range(curr_y - 2, curr_y + 3):
+        for q in range(1, 5):
+            if rng.random() < 0.85:
+                q_map[(yr, q)] = rng.uniform(-500, 5000)
+    return q_map
+
+def run(n):
+    rng = random.Random(n)
+    q_maps = {f"T{i:05d}": random_q_map(rng) for i in range(n)}
+
+    t0 = time.perf_counter()
+    legacy = {t: legacy_12m_fwd_series(m) for t, m in q_maps.items()}
+    t_legacy = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    batch = calculate_12m_fwd_batch(q_maps)
+    t_batch = time.perf_counter() - t0
+
+    fwd = batch['12M Fwd EPS']
+    for t, df in legacy.items():
+        if df.empty: continue
+        expected = df['12M Fwd EPS'].to_numpy(dtype=float)
+        if not np.array_equal(fwd.loc[t].to_numpy(), expected):
+            raise AssertionError(f"{t}: 배치 결과가 기존 구현과 다릅니다")
+        single = EpsPanel.from_layers({t: actual_layers(q_maps[t])}).fwd_series(t)['12M Fwd EPS'].to_numpy()
+        if not np.array_equal(single, expected):
+            raise AssertionError(f"{t}: 단일 결과가 기존 구현과 다릅니다")
+
+    print(f"{n:>6} tickers | legacy {t_legacy*1000:9.1f} ms | batch {t_batch*1000:8.1f} ms "
+          f"| x{t_legacy / t_batch:,.0f} | exact match")
+
+def random_layers(rng):
+    curr_y = datetime.date.today().year
+    layers = {('annual', yr, 0): rng.uniform(-500, 5000) for yr in range(curr_y - 1, curr_y + 3)}
+    for yr in range(curr_y - 2, curr_y + 3):
+        for q in range(1, 5):
+            if rng.random() < 0.4: layers[('quarter', yr, q)] = rng.uniform(-100, 1200)
+            if yr < curr_y and rng.random() < 0.8: layers[('actual', yr, q)] = rng.uniform(-100, 1200)
+    return layers
+
+def run_layers(n):
+    rng = random.Random(-n)
+    layers = {f"T{i:05d}": random_layers(rng) for i in range(n)}
+
+    t0 = time.perf_counter()
+    dict_fwd = calculate_12m_fwd_batch({t: legacy_q_map(l) for t, l in layers.items()})['12M Fwd EPS']
+    t_dict = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    panel_fwd = EpsPanel.from_layers(layers).fwd_batch()['12M Fwd EPS']
+    t_panel = time.perf_counter() - t0
+
+    if not np.array_equal(dict_fwd.to_numpy(), panel_fwd.to_numpy()):
+        raise AssertionError("EpsPanel 결과가 사전 병합과 다릅니다")
+    print(f"{n:>6} tickers | dict merge {t_dict*1000:7.1f} ms | panel {t_panel*1000:8.1f} ms "
+          f"| x{t_dict / t_panel:,.1f} | exact match")
+
+if __name__ == "__main__":
+    sizes = [int(a) for a in sys.argv[1:]] or [1, 5000]
+    for n in sizes: run(n)
+    for n in sizes: run_layers(n)
@@ -0,0 +1,73 @@
+"""공용 HTTP 클라이언트 동작 확인 (로컬 스텁 서버, 네트워크 불필요)
+
+사용법: python bench_http_client.py
+  1) 같은 URL 동시 요청 병합  2) 429/503 재시도 + 백오프  3) 호스트별 속도 제한  4) keep-alive 재사용
+기대한 동작이 아니면 AssertionError 로 끝난다.
+"""
+import time
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from http_client import HttpClient, HostPolicy
+
+hits = Counter()
+connections = set()
+hits_lock = threading.Lock()
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_GET(self):
+        with hits_lock:
+            hits[self.path] += 1
+            n = hits[self.path]
+            connections.add(self.client_address)
+        if self.path.startswith("/slow"): time.sleep(0.2)
+        status = 429 if self.path.startswith("/flaky") and n <= 2 else 200
+        body = f"{self.path} #{n}".encode()
+        self.send_response(status)
+        if status == 429: self.send_header("Retry-After", "0.1")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args): pass
+
+def main():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host = f"127.0.0.1:{server.server_port}"
+    base = f"http://{host}"
+    policy = HostPolicy(max_concurrency=4, rate=10.0, burst=2)
+    client = HttpClient(policies={host: policy}, backoff_base=0.05)
+
+    with ThreadPoolExecutor(20) as pool:
+        bodies = set(pool.map(lambda _: client.get(f"{base}/slow").text, range(20)))
+    print(f"[병합]   동시 요청 20건 -> 서버 도달 {hits['/slow']}건, 응답 {len(bodies)}종")
+    assert hits['/slow'] == 1 and len(bodies) == 1, "동시 요청이 하나로 병합되지 않음"
+
+    r = client.get(f"{base}/flaky")
+    print(f"[재시도] 429 두 번 뒤 상태 {r.status_code} (서버 도달 {hits['/flaky']}건)")
+    assert r.status_code == 200 and hits['/flaky'] == 3, "429 재시도 뒤 200 이 아님"
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda i: client.get(f"{base}/item/{i}"), range(22)))
+    elapsed = time.perf_counter() - t0
+    floor = (22 - policy.burst) / policy.rate
+    print(f"[속도]   서로 다른 URL 22건, 초당 10건 제한(버스트 2) -> {elapsed:.2f}s (이론 최소 {floor:.1f}s)")
+    assert elapsed >= floor * 0.95, "속도 제한보다 빠르게 요청함"
+
+    print(f"[풀]     총 요청 {sum(hits.values())}건, TCP 연결 {len(connections)}개")
+    assert len(connections) <= policy.max_concurrency, "동시 실행 수보다 많은 연결을 엶"
+    with hits_lock: connections.clear()
+    for i in range(5): client.get(f"{base}/seq/{i}")
+    print(f"[풀]     순차 요청 5건 -> TCP 연결 {len(connections)}개")
+    assert len(connections) == 1, "순차 요청이 연결을 재사용하지 않음"
+    server.shutdown()
+    print("모든 확인 통과")
+
+if __name__ == "__main__":
+    main()
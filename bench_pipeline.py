@@ -0,0 +1,252 @@
+"""파이프라인 단계별 벤치마크 (녹화본 재생 기반, 네트워크 불필요)
+
+  python bench_pipeline.py --record 삼성전자 NVDA       # 실제 서비스 응답을 fixtures/pipeline 에 녹화
+  python bench_pipeline.py 삼성전자 NVDA                # 녹화본 재생으로 단계별 시간 측정
+  python bench_pipeline.py --save-baseline ...          # 결과를 기준선으로 저장 (보정 루프 대비 배율로)
+  python bench_pipeline.py --tolerance 1.3 ...          # 기준선 대비 30% 넘게 느려진 단계가 있으면 종료 코드 1
+  python bench_pipeline.py --make-synthetic             # 네트워크 없이 결정적인 합성 녹화본 생성 (저장소에 포함된 것)
+
+단계: resolve(find_ticker) -> fetch(FnGuide/Yahoo) -> priority_map -> fwd_series -> ai, 그리고 macro
+단일 종목(첫 번째)과 배치(전체 목록) 각각의 단계별 중앙값과 end_to_end 를 보고한다.
+녹화본이 없거나 결과가 비면 그 표본은 실패로 버린다 (실패 경로의 시간을 재지 않도록).
+기준선에는 ms 대신 같은 실행에서 잰 보정 루프(calibrate) 대비 배율을 저장해, 기계가 달라도 비교할 수 있게 한다.
+추세 기준일은 녹화본의 meta.json 의 asof 로 고정해, 날짜가 바뀌어도 같은 입력(같은 LLM 프롬프트)이 된다.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+
+import recorder
+
+BASELINE_PATH = os.path.join("fixtures", "pipeline", "baseline.json")
+ABS_SLACK_MS = 0.5  # 아주 짧은 단계의 측정 잡음은 회귀로 보지 않음
+CALIBRATION_REPEAT = 7
+SYNTHETIC_ASOF = "2026-03-31"
+
+class SampleFailed(RuntimeError):
+    """녹화본은 있으나 결과가 비어 있는 등, 정상 경로를 재지 못한 표본"""
+
+def parse_args():
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("tickers", nargs="*", default=["삼성전자", "NVDA"])
+    p.add_argument("--record", action="store_true", help="실제 호출 + 녹화")
+    p.add_argument("--live", action="store_true", help="녹화 없이 실제 호출로 측정")
+    p.add_argument("--fixtures", default=recorder.FIXTURE_DIR)
+    p.add_argument("--repeat", type=int, default=5)
+    p.add_argument("--baseline", default=BASELINE_PATH)
+    p.add_argument("--save-baseline", action="store_true")
+    p.add_argument("--tolerance", type=float, default=1.25)
+    p.add_argument("--make-synthetic", action="store_true", help="합성 녹화본을 --fixtures 에 생성")
+    return p.parse_args()
+
+def fixture_asof(fixture_dir):
+    path = os.path.join(fixture_dir, "meta.json")
+    if not os.path.exists(path): return None
+    with open(path, encoding="utf-8") as f: return json.load(f).get('asof')
+
+class Timer:
+    def __init__(self): self.samples = {}
+
+    def run(self, stage, fn, *args, **kwargs):
+        """성공한 호출만 기록 (예외는 그대로 전달)"""
+        t0 = time.perf_counter()
+        result = fn(*args, **kwargs)
+        self.samples.setdefault(stage, []).append((time.perf_counter() - t0) * 1000)
+        return result
+
+    def medians(self):
+        return {k: statistics.median(v) for k, v in self.samples.items()}
+
+def calibrate(repeat=CALIBRATION_REPEAT):
+    """기계 속도 기준: 파이프라인과 비슷한 구성(순수 파이썬 + 작은 pandas 피벗)의 고정 작업 최솟값 (ms)
+
+    최솟값을 쓰는 건 보정값이 잡음에 흔들리면 모든 단계의 배율이 함께 흔들리기 때문."""
+    import pandas as pd
+    frame = pd.DataFrame({'k': [i % 40 for i in range(4000)], 'c': [i % 8 for i in range(4000)],
+                          'v': [float(i) for i in range(4000)]})
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        sum(i * i % 7 for i in range(100_000))
+        frame.pivot_table(index='k', columns='c', values='v', aggfunc='last').ffill().sum()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return min(samples)
+
+def run_pipeline(user_input, timer, asof=None):
+    """main.py 와 같은 순서로 한 종목을 처리 (로더 캐시와 로더의 예외 삼키기는 우회)"""
+    from data_loader import find_ticker, fetch_fnguide_html, parse_fnguide_frame, fetch_yahoo_estimates
+    from logic import classify_trade_signal
+    from estimate_store import layers_from_fnguide, layers_from_yahoo
+    from eps_panel import EpsPanel
+    from ai_analyst import stream_ai
+
+    ticker, name, country = timer.run("resolve", find_ticker, user_input)
+    if country == "KR":
+        df_raw = timer.run("fetch", lambda: parse_fnguide_frame(fetch_fnguide_html(ticker)))
+        layers = layers_from_fnguide(df_raw)
+    else:
+        past, est_a, est_q = timer.run("fetch", recorder.recorded_call, "yahoo", ticker, fetch_yahoo_estimates, ticker)
+        layers = layers_from_yahoo(past, est_a, est_q)
+    if not layers: raise SampleFailed(f"{user_input}: 추정치 없음")
+    panel = timer.run("priority_map", EpsPanel.from_layers, {ticker: layers})
+    trend = timer.run("fwd_series", panel.fwd_series, ticker, end=asof)
+    if trend.empty: raise SampleFailed(f"{user_input}: 12M Fwd EPS 없음")
+
+    fwd, prev = trend['12M Fwd EPS'].iloc[-1], trend['12M Fwd EPS'].iloc[-2]
+    growth, accel = trend['Growth'].iloc[-1], trend['Accel'].iloc[-1]
+    signal = classify_trade_signal(fwd, prev, accel)
+    # 응답 캐시를 비워 매번 실제(녹화) LLM 경로를 측정
+    import ai_analyst
+    ai_analyst._cache.clear()
+    def ai():
+        text = "".join(stream_ai(ticker, name, fwd, growth, f"{accel:+.2f}%p", "안정", "-", signal))
+        if text.startswith(("Error:", "⚠️")): raise SampleFailed(f"{user_input}: {text[:200]}")
+        return text
+    timer.run("ai", ai)
+
+def refresh_macro(tmp):
+    """MacroStore.refresh 는 실패한 시리즈를 로그만 남기므로, 모두 채워졌는지 확인"""
+    from macro_store import MacroStore
+    store = MacroStore(tmp)
+    store.refresh()
+    missing = [n for n in store.names() if store.load_cached(n) is None]
+    if missing: raise SampleFailed(f"매크로 갱신 실패: {', '.join(missing)}")
+
+def bench(label, tickers, repeat, asof=None):
+    """실패한 종목/단계는 표본에서 빼고 알림. 재지 못한 단계는 결과에 없음"""
+    # 모듈 임포트/색인 빌드 같은 1회성 비용은 제외 (워밍업 결과는 버림)
+    ok = []
+    for t in tickers:
+        try:
+            run_pipeline(t, Timer(), asof)
+            ok.append(t)
+        except (recorder.FixtureMissing, SampleFailed) as e: print(f"  ⚠️ {t} 제외: {e}")
+
+    timer = Timer()
+    for _ in range(repeat if ok else 0):
+        t0 = time.perf_counter()
+        for t in ok: run_pipeline(t, timer, asof)
+        timer.samples.setdefault("end_to_end", []).append((time.perf_counter() - t0) * 1000)
+
+    for _ in range(repeat):
+        tmp = tempfile.mkdtemp(prefix="bench_macro_")
+        try: timer.run("macro", refresh_macro, tmp)
+        except (recorder.FixtureMissing, SampleFailed) as e:
+            print(f"  ⚠️ 매크로 제외: {e}")
+            break
+        finally: shutil.rmtree(tmp, ignore_errors=True)
+    return {f"{label}.{k}": v for k, v in timer.medians().items()}
+
+# -----------------------------------------------------------
+# 합성 녹화본 (네트워크 없이 재현 가능한 입력)
+# -----------------------------------------------------------
+def write_synthetic_fixtures(fixture_dir, tickers, asof=SYNTHETIC_ASOF, seed=0):
+    """저장소의 합성 FnGuide 페이지 + 고정 시드의 Yahoo 추정치/FRED/OECD 시리즈 + 가짜 LLM 응답"""
+    import pickle
+    import numpy as np
+    import pandas as pd
+    import ai_analyst
+    from data_loader import find_ticker
+    from macro_store import FRED_SERIES, CLI_SERIES
+
+    recorder.set_mode("replay", fixture_dir)
+    rng = np.random.default_rng(seed)
+    end = pd.Timestamp(asof)
+
+    def put(namespace, key, text):
+        recorder._write(recorder._path(namespace, key, "json"),
+                        json.dumps({'url': "synthetic", 'status_code': 200, 'text': text}, ensure_ascii=False))
+
+    put("krx", "krx_list", "Symbol,Market,Name,Sector\n005930,KOSPI,삼성전자,전기전자\n000660,KOSPI,SK하이닉스,전기전자\n")
+    with open(os.path.join("fixtures", "fnguide", "A005930_synthetic.html"), encoding="utf-8") as f:
+        put("fnguide", "A005930", f.read())
+
+    days = pd.bdate_range(end - pd.Timedelta(days=1500), end)
+    for sid in FRED_SERIES.values():
+        level = 1.0 if sid == 'T10Y2Y' else 4.0
+        vals = level + np.cumsum(rng.normal(0, 0.03, len(days)))
+        put("macro", f"fred_{sid}", "observation_date," + sid + "\n" +
+            "".join(f"{d:%Y-%m-%d},{v:.2f}\n" for d, v in zip(days, vals)))
+    months = pd.period_range(end - pd.DateOffset(years=10), end, freq='M')
+    rows = ["REF_AREA,TIME_PERIOD,OBS_VALUE"]
+    for code in CLI_SERIES.values():
+        vals = 100 + np.cumsum(rng.normal(0, 0.15, len(months)))
+        rows += [f"{code},{m},{v:.4f}" for m, v in zip(months, vals)]
+    put("macro", "oecd_cli", "\n".join(rows) + "\n")
+
+    for t in tickers:
+        ticker, _, country = find_ticker(t)
+        if country == "KR": continue
+        past = {(y, q): round(float(rng.uniform(0.5, 1.5)), 2) for y in (end.year - 1, end.year) for q in range(1, 5)
+                if (y, q) < (end.year, (end.month - 1) // 3 + 1)}
+        est_a = {end.year: round(sum(past.values()) / 2 * 1.1, 2), end.year + 1: round(sum(past.values()) / 2 * 1.25, 2)}
+        recorder._write(recorder._path("yahoo", ticker, "pkl"),
+                        pickle.dumps((past, est_a, {}), protocol=pickle.HIGHEST_PROTOCOL), binary=True)
+
+    # LLM: 가짜 모델 응답을 실제 녹화와 같은 경로(프롬프트 해시)로 저장
+    real_get_llm = ai_analyst.get_llm
+    ai_analyst.get_llm = lambda api_key: recorder.RecordingLLM(ai_analyst.FakeLLM())
+    try:
+        for t in tickers: run_pipeline(t, Timer(), asof)
+    finally:
+        ai_analyst.get_llm = real_get_llm
+    with open(os.path.join(fixture_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({'asof': asof, 'synthetic': True}, f, indent=2)
+
+def load_baseline(path):
+    """보정 배율 기준선만 사용 (예전 절대 ms 기준선은 다른 기계 값이라 무시)"""
+    if not os.path.exists(path): return {}
+    with open(path, encoding="utf-8") as f: data = json.load(f)
+    if 'ratios' not in data:
+        print(f"  ⚠️ {path}: 보정 배율이 없는 예전 기준선이라 비교하지 않음 (--save-baseline 으로 다시 저장)")
+        return {}
+    return data['ratios']
+
+def compare(results, baseline, tolerance, calib_ms):
+    """단계 시간 / 보정 시간 을 기준선 배율과 비교 (잡음 허용치도 같은 단위로 환산)"""
+    regressions = []
+    slack = ABS_SLACK_MS / calib_ms
+    for key, ms in sorted(results.items()):
+        ratio, base = ms / calib_ms, baseline.get(key)
+        flag = ""
+        if base is not None and ratio > base * tolerance + slack:
+            flag = "  <-- REGRESSION"
+            regressions.append(key)
+        base_str = f"{base:8.3f}" if base is not None else "       -"
+        print(f"{key:<28} {ms:9.2f} ms  x{ratio:8.3f}   baseline x{base_str}{flag}")
+    return regressions
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.make_synthetic:
+        write_synthetic_fixtures(args.fixtures, args.tickers)
+        print(f"합성 녹화본 생성: {args.fixtures}")
+        sys.exit(0)
+    recorder.set_mode("record" if args.record else "live" if args.live else "replay", args.fixtures)
+    if recorder.MODE == "replay":
+        os.environ.setdefault("EPS_OFFLINE", "1")
+    asof = fixture_asof(args.fixtures) if recorder.MODE == "replay" else None
+
+    calib_before = calibrate()
+    results = {}
+    results.update(bench("single", args.tickers[:1], args.repeat, asof))
+    results.update(bench("batch", args.tickers, args.repeat, asof))
+    if not results: sys.exit("측정된 단계가 없습니다 (녹화본 확인: --record 또는 --make-synthetic)")
+
+    calib_ms = min(calib_before, calibrate())  # 측정 전후 둘 다 재서 그 사이의 속도 변화도 반영
+    print(f"보정 루프: {calib_ms:.2f} ms (아래 x 는 이 값 대비 배율)")
+    regressions = compare(results, load_baseline(args.baseline), args.tolerance, calib_ms)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        ratios = {k: round(ms / calib_ms, 4) for k, ms in results.items()}
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({'unit': "calibrate() 대비 배율", 'ratios': ratios}, f, indent=2, ensure_ascii=False)
+        print(f"기준선 저장: {args.baseline}")
+    if regressions:
+        sys.exit(f"{len(regressions)}개 단계가 기준선 대비 느려졌습니다: {', '.join(regressions)}")
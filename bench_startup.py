@@ -0,0 +1,84 @@
+"""콜드 스타트 측정: 앱 모듈 임포트 시간 + 첫 화면(첫 실행) + 첫 종목 조회
+
+사용법: python bench_startup.py [--repeat 3] [--idle 5] [--cold]
+  1) 새 프로세스에서 main.py 가 임포트하는 모듈을 불러오는 시간과, 그때 같이 로드된 무거운 의존성
+  2) 새 프로세스에서 AppTest 로 main.py 첫 실행(첫 화면)까지 시간, --idle 초 뒤 첫 종목 조회 시간
+     (WARMUP=0 / WARMUP=1 비교. 네트워크 없이 재면 PIPELINE_MODE=replay 와 함께 실행)
+  --cold: 실행마다 빈 임시 디렉터리에 캐시/저장소를 둬 새로 배포한 서버처럼 측정
+"""
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+APP_MODULES = ['data_loader', 'signals', 'logic', 'batch', 'ai_analyst', 'telemetry', 'screener',
+               'monitor', 'sensitivity', 'warmup']
+HEAVY_MODULES = ['yfinance', 'matplotlib', 'langchain_google_genai', 'langchain_core', 'FinanceDataReader']
+
+IMPORT_PROBE = """
+import sys, time, json
+import streamlit, pandas, numpy   # 공통 기반은 따로 잰다
+t0 = time.perf_counter()
+for m in {modules!r}: __import__(m)
+ms = (time.perf_counter() - t0) * 1000
+print(json.dumps({{'ms': ms, 'heavy': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+PAINT_PROBE = """
+import time, json
+t0 = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file('main.py', default_timeout=120).run()
+first = (time.perf_counter() - t0) * 1000
+time.sleep({idle})
+t1 = time.perf_counter()
+at.sidebar.button[0].click().run()
+lookup = (time.perf_counter() - t1) * 1000
+print(json.dumps({{'first_paint_ms': first, 'first_lookup_ms': lookup, 'ok': not at.exception}}))
+"""
+
+def cold_env(tmp):
+    return {'CACHE_DB_PATH': os.path.join(tmp, "cache.sqlite"), 'MACRO_CACHE_DIR': os.path.join(tmp, "macro"),
+            'TICKER_INDEX_PATH': os.path.join(tmp, "ticker_index.pkl"), 'PRICE_STORE_DIR': os.path.join(tmp, "prices"),
+            'YAHOO_SEARCH_CACHE_PATH': os.path.join(tmp, "yahoo_search_cache.json"),
+            'EPS_STORE_PATH': os.path.join(tmp, "eps_store.sqlite")}
+
+def run_probe(code, env=None, cold=False):
+    tmp = tempfile.mkdtemp(prefix="bench_startup_") if cold else None
+    try:
+        return _run_probe(code, {**(env or {}), **(cold_env(tmp) if cold else {})})
+    finally:
+        if tmp: shutil.rmtree(tmp, ignore_errors=True)
+
+def _run_probe(code, env):
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                         env={**os.environ, **env}, cwd=os.path.dirname(os.path.abspath(__file__)))
+    lines = [l for l in out.stdout.splitlines() if l.startswith("{")]
+    if not lines: raise RuntimeError(out.stderr[-2000:])
+    return json.loads(lines[-1])
+
+def median_of(results, key):
+    return statistics.median(r[key] for r in results)
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description="임포트 시간 / 첫 화면 측정")
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--idle", type=float, default=5.0, help="첫 화면 뒤 첫 조회까지 기다리는 시간(초)")
+    p.add_argument("--skip-paint", action="store_true")
+    p.add_argument("--cold", action="store_true", help="실행마다 빈 캐시/저장소로 측정")
+    args = p.parse_args()
+
+    imports = [run_probe(IMPORT_PROBE.format(modules=APP_MODULES, heavy=HEAVY_MODULES)) for _ in range(args.repeat)]
+    print(f"앱 모듈 임포트: {median_of(imports, 'ms'):.0f}ms (중앙값, {args.repeat}회)")
+    print(f"  함께 로드된 무거운 의존성: {', '.join(imports[0]['heavy']) or '없음'}")
+    if args.skip_paint: raise SystemExit(0)
+
+    for warm in ("0", "1"):
+        runs = [run_probe(PAINT_PROBE.format(idle=args.idle), {'WARMUP': warm}, args.cold) for _ in range(args.repeat)]
+        print(f"WARMUP={warm}: 첫 화면 {median_of(runs, 'first_paint_ms'):.0f}ms · "
+              f"{args.idle:g}초 뒤 첫 조회 {median_of(runs, 'first_lookup_ms'):.0f}ms"
+              + ("" if all(r['ok'] for r in runs) else " (실행 중 예외)"))
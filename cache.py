@@ -0,0 +1,279 @@
+"""프레임워크 독립 캐시: LRU + TTL + 바이트 예산, SQLite 공유 저장소(선택), stale-while-revalidate
+
+  @cached("get_fnguide_data", ttl=3600, stale_ttl=6 * 3600, persist=True)
+  def get_fnguide_data(code): ...
+
+메모리(L1)는 프로세스마다 따로, SQLite(L2, CACHE_DB_PATH)는 앱/배치/워커가 함께 쓴다.
+TTL 이 지난 값은 stale_ttl 동안 그대로 돌려주면서 백그라운드에서 다시 계산한다.
+hook(name, event, key, size) 로 적중률 등을 집계한다 (event: call/hit/stale/miss/store/evict).
+실패를 None 등으로 돌려주는 함수는 should_cache 가 거짓인 결과를 저장하지 않으므로,
+백그라운드 갱신이 실패하면 기존 값이 그대로 남는다.
+"""
+import os
+import time
+import pickle
+import sqlite3
+import hashlib
+import functools
+import threading
+from collections import OrderedDict
+
+CACHE_DB_PATH = os.getenv("CACHE_DB_PATH", os.path.join("data", "cache.sqlite"))
+MAX_ENTRIES = 512
+MAX_BYTES = 64 * 1024 * 1024        # 함수별 메모리 예산
+MAX_DISK_BYTES = 256 * 1024 * 1024  # 함수별 SQLite 예산
+
+def is_cacheable(value):
+    """기본 저장 조건: None 이나 빈 표는 실패로 보고 저장하지 않음"""
+    if value is None: return False
+    return not (hasattr(value, "empty") and value.empty)
+
+def approx_size(obj):
+    if hasattr(obj, "memory_usage"):
+        usage = obj.memory_usage(deep=True)
+        return int(usage.sum() if hasattr(usage, "sum") else usage)
+    if isinstance(obj, (tuple, list)): return sum(approx_size(o) for o in obj)
+    try: return len(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception: return 0
+
+# -----------------------------------------------------------
+# 1. 저장소 (메모리 LRU / SQLite)
+# -----------------------------------------------------------
+class MemoryLRU:
+    """key -> (stored_at, size, value). 항목 수나 바이트가 넘치면 가장 오래 안 쓴 것부터 제거"""
+    def __init__(self, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.max_entries, self.max_bytes = max_entries, max_bytes
+        self.data = OrderedDict()
+        self.bytes = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            item = self.data.get(key)
+            if item is not None: self.data.move_to_end(key)
+            return item
+
+    def put(self, key, stored_at, value, size):
+        """반환값: 밀려난 [(key, size)]"""
+        evicted = []
+        with self.lock:
+            old = self.data.pop(key, None)
+            if old is not None: self.bytes -= old[1]
+            self.data[key] = (stored_at, size, value)
+            self.bytes += size
+            while len(self.data) > 1 and (len(self.data) > self.max_entries or self.bytes > self.max_bytes):
+                k, (_, s, _) = self.data.popitem(last=False)
+                self.bytes -= s
+                evicted.append((k, s))
+        return evicted
+
+    def clear(self):
+        with self.lock:
+            self.data.clear()
+            self.bytes = 0
+
+    def __len__(self):
+        return len(self.data)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    name        TEXT    NOT NULL,
+    key         TEXT    NOT NULL,
+    stored_at   REAL    NOT NULL,
+    accessed_at REAL    NOT NULL,
+    size        INTEGER NOT NULL,
+    value       BLOB    NOT NULL,
+    PRIMARY KEY (name, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_cache_lru ON cache (name, accessed_at);
+"""
+
+class SqliteStore:
+    """여러 프로세스가 같은 파일을 공유 (WAL). 값은 pickle"""
+    def __init__(self, path=CACHE_DB_PATH):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self.lock = threading.Lock()
+        with self.lock:
+            if path != ":memory:": self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.executescript(SCHEMA)
+
+    def get(self, name, key):
+        with self.lock:
+            row = self.conn.execute("SELECT stored_at, size, value FROM cache WHERE name = ? AND key = ?",
+                                    (name, key)).fetchone()
+            if row is not None:
+                with self.conn:
+                    self.conn.execute("UPDATE cache SET accessed_at = ? WHERE name = ? AND key = ?",
+                                      (time.time(), name, key))
+        return row
+
+    def put(self, name, key, stored_at, blob, max_bytes=MAX_DISK_BYTES):
+        with self.lock, self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO cache VALUES (?,?,?,?,?,?)",
+                              (name, key, stored_at, time.time(), len(blob), blob))
+            # 최근 사용 순으로 누적 크기가 예산을 넘는 항목 제거
+            self.conn.execute("""
+                DELETE FROM cache WHERE name = ? AND key IN (
+                    SELECT key FROM (
+                        SELECT key, SUM(size) OVER (ORDER BY accessed_at DESC, key) AS running
+                        FROM cache WHERE name = ?)
+                    WHERE running > ?)
+            """, (name, name, max_bytes))
+
+    def delete(self, name, key):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM cache WHERE name = ? AND key = ?", (name, key))
+
+    def clear(self, name):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM cache WHERE name = ?", (name,))
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+def get_sqlite_store(path=None):
+    path = path or CACHE_DB_PATH
+    with _stores_lock:
+        if path not in _stores: _stores[path] = SqliteStore(path)
+        return _stores[path]
+
+# -----------------------------------------------------------
+# 2. 캐시
+# -----------------------------------------------------------
+class Cache:
+    def __init__(self, name, ttl=None, stale_ttl=0, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES,
+                 persist=False, db_path=None, max_disk_bytes=MAX_DISK_BYTES, hook=None, should_cache=is_cacheable):
+        self.name, self.ttl, self.stale_ttl = name, ttl, stale_ttl
+        self.should_cache = should_cache
+        self.mem = MemoryLRU(max_entries, max_bytes)
+        self.persist, self.db_path, self.max_disk_bytes = persist, db_path, max_disk_bytes
+        self.hook = hook
+        self._lock = threading.Lock()
+        self._computing = {}     # key -> Lock (같은 키 동시 미스는 한 번만 계산)
+        self._refreshing = set()
+
+    @property
+    def disk(self):
+        return get_sqlite_store(self.db_path) if self.persist else None
+
+    def _emit(self, event, key=None, size=0):
+        if self.hook is not None: self.hook(self.name, event, key, size)
+
+    def _age_state(self, stored_at):
+        age = time.time() - stored_at
+        if self.ttl is None or age < self.ttl: return 'fresh'
+        if age < self.ttl + self.stale_ttl: return 'stale'
+        return 'expired'
+
+    def _lookup(self, key):
+        item = self.mem.get(key)
+        if item is not None or not self.persist: return item
+        row = self.disk.get(self.name, self._disk_key(key))
+        if row is None: return None
+        stored_at, size, blob = row
+        try: value = pickle.loads(blob)
+        except Exception: return None  # 다른 버전이 쓴 항목 등
+        for k, s in self.mem.put(key, stored_at, value, size): self._emit('evict', k, s)
+        self._emit('store', key, size)
+        return stored_at, size, value
+
+    @staticmethod
+    def _disk_key(key):
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    def _store(self, key, value):
+        """저장했으면 True (should_cache 가 거짓이거나 예산을 넘으면 False)"""
+        if not self.should_cache(value): return False
+        now = time.time()
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL) if self.persist else None
+        size = len(blob) if blob is not None else approx_size(value)
+        if size > self.mem.max_bytes: return False  # 예산보다 큰 값은 캐시하지 않음
+        for k, s in self.mem.put(key, now, value, size): self._emit('evict', k, s)
+        if self.persist:
+            try: self.disk.put(self.name, self._disk_key(key), now, blob, self.max_disk_bytes)
+            except sqlite3.Error as e: print(f"⚠️ 캐시 저장 실패 ({self.name}): {e}")
+        self._emit('store', key, size)
+        return True
+
+    def _compute(self, key, compute):
+        with self._lock: lock = self._computing.setdefault(key, threading.Lock())
+        try:
+            with lock:
+                item = self._lookup(key)  # 기다리는 동안 다른 스레드가 채웠을 수 있음
+                if item is not None and self._age_state(item[0]) == 'fresh':
+                    self._emit('hit', key)
+                    return item[2]
+                self._emit('miss', key)
+                value = compute()
+                self._store(key, value)
+                return value
+        finally:
+            with self._lock: self._computing.pop(key, None)
+
+    def _revalidate(self, key, compute):
+        with self._lock:
+            if key in self._refreshing: return
+            self._refreshing.add(key)
+        def run():
+            # 예외든 실패 결과(should_cache 거짓)든 기존 값을 유지
+            try:
+                value = compute()
+                if not self.should_cache(value): print(f"⚠️ 캐시 갱신 실패 ({self.name}): 빈 결과")
+                else: self._store(key, value)
+            except Exception as e: print(f"⚠️ 캐시 갱신 실패 ({self.name}): {e}")
+            finally:
+                with self._lock: self._refreshing.discard(key)
+        threading.Thread(target=run, name=f"cache-{self.name}", daemon=True).start()
+
+    def get(self, key):
+        """신선한 값이 있으면 반환, 없으면 None (call/hit/miss 집계).
+        스트리밍처럼 get_or_compute 로 감쌀 수 없는 호출은 get -> 계산 -> put 으로 쓴다"""
+        self._emit('call', key)
+        item = self._lookup(key)
+        if item is not None and self._age_state(item[0]) == 'fresh':
+            self._emit('hit', key)
+            return item[2]
+        self._emit('miss', key)
+        return None
+
+    def put(self, key, value):
+        return self._store(key, value)
+
+    def get_or_compute(self, key, compute):
+        self._emit('call', key)
+        item = self._lookup(key)
+        if item is not None:
+            state = self._age_state(item[0])
+            if state == 'fresh':
+                self._emit('hit', key)
+                return item[2]
+            if state == 'stale':
+                self._emit('stale', key)
+                self._revalidate(key, compute)
+                return item[2]
+        return self._compute(key, compute)
+
+    def clear(self):
+        with self.mem.lock: evicted = [(k, item[1]) for k, item in self.mem.data.items()]
+        self.mem.clear()
+        for k, s in evicted: self._emit('evict', k, s)
+        if self.persist: self.disk.clear(self.name)
+
+def cached(name, ttl=None, stale_ttl=0, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES, persist=False,
+           db_path=None, max_disk_bytes=MAX_DISK_BYTES, hook=None, should_cache=is_cacheable):
+    """함수 데코레이터. 인자의 repr 이 키. wrapper.__wrapped__ 는 캐시 없는 원본"""
+    def deco(fn):
+        cache = Cache(name, ttl, stale_ttl, max_entries, max_bytes, persist, db_path, max_disk_bytes, hook,
+                      should_cache)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = repr((args, sorted(kwargs.items())))
+            return cache.get_or_compute(key, lambda: fn(*args, **kwargs))
+        wrapper.cache = cache
+        wrapper.clear = cache.clear
+        wrapper.__wrapped__ = fn
+        return wrapper
+    return deco
@@ -0,0 +1,232 @@
+"""재개 가능한 대량 수집기 + 압축 원본 보관소 (수집과 파싱 분리)
+
+  python crawler.py crawl --universe krx --run 2026-10-18     # 중단돼도 같은 --run 으로 이어서
+  python crawler.py reparse --source fnguide --out data/fwd_eps.csv   # 네트워크 없이 전체 재파싱
+
+원본(FnGuide HTML / yfinance 표 JSON)은 sha256 주소의 gzip 파일로 한 번만 저장하고,
+어떤 (source, key) 가 언제 어떤 원본을 받았는지는 SQLite 색인에 남긴다.
+"""
+import os
+import gzip
+import json
+import time
+import sqlite3
+import hashlib
+import argparse
+import datetime
+import threading
+from io import StringIO
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+ARCHIVE_DIR = os.getenv("RAW_ARCHIVE_DIR", os.path.join("data", "raw"))
+SOURCES = ('fnguide', 'yahoo')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    source     TEXT NOT NULL,
+    key        TEXT NOT NULL,
+    fetched_at TEXT NOT NULL,
+    sha        TEXT NOT NULL,
+    PRIMARY KEY (source, key, fetched_at)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS checkpoints (
+    run        TEXT NOT NULL,
+    source     TEXT NOT NULL,
+    key        TEXT NOT NULL,
+    status     TEXT NOT NULL,   -- 'done' / 'error'
+    attempts   INTEGER NOT NULL,
+    error      TEXT,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (run, source, key)
+) WITHOUT ROWID;
+"""
+
+# -----------------------------------------------------------
+# 1. 내용 주소 기반 원본 보관소
+# -----------------------------------------------------------
+class RawArchive:
+    def __init__(self, root=ARCHIVE_DIR):
+        self.root = root
+        os.makedirs(os.path.join(root, "objects"), exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(root, "index.sqlite"), check_same_thread=False)
+        self.lock = threading.Lock()
+        with self.lock:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.executescript(SCHEMA)
+
+    def object_path(self, sha):
+        return os.path.join(self.root, "objects", sha[:2], f"{sha[2:]}.gz")
+
+    def put(self, source, key, data, fetched_at=None):
+        """원본 bytes 저장 -> sha. 같은 내용은 파일을 다시 쓰지 않음"""
+        sha = hashlib.sha256(data).hexdigest()
+        path = self.object_path(sha)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f: f.write(gzip.compress(data, compresslevel=6))
+            os.replace(tmp, path)
+        fetched_at = fetched_at or datetime.datetime.now().isoformat(timespec='seconds')
+        with self.lock, self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO responses VALUES (?,?,?,?)", (source, key, fetched_at, sha))
+        return sha
+
+    def get(self, sha):
+        with open(self.object_path(sha), "rb") as f: return gzip.decompress(f.read())
+
+    def latest(self, source=None):
+        """(source, key) 마다 가장 최근 원본 -> [(source, key, fetched_at, sha)]"""
+        sql = """
+            SELECT source, key, MAX(fetched_at), sha FROM responses
+            WHERE (? IS NULL OR source = ?) GROUP BY source, key ORDER BY source, key
+        """
+        with self.lock:
+            return self.conn.execute(sql, (source, source)).fetchall()
+
+    # ---------- 체크포인트 ----------
+    def done_keys(self, run, source):
+        with self.lock:
+            rows = self.conn.execute("SELECT key FROM checkpoints WHERE run = ? AND source = ? AND status = 'done'",
+                                     (run, source)).fetchall()
+        return {r[0] for r in rows}
+
+    def checkpoint(self, run, source, key, error=None):
+        now = datetime.datetime.now().isoformat(timespec='seconds')
+        with self.lock, self.conn:
+            self.conn.execute("""
+                INSERT INTO checkpoints VALUES (?,?,?,?,1,?,?)
+                ON CONFLICT (run, source, key) DO UPDATE SET
+                    status = excluded.status, attempts = attempts + 1, error = excluded.error,
+                    updated_at = excluded.updated_at
+            """, (run, source, key, 'error' if error else 'done', error, now))
+
+    def run_summary(self, run):
+        with self.lock:
+            return dict(self.conn.execute("SELECT status, COUNT(*) FROM checkpoints WHERE run = ? GROUP BY status",
+                                          (run,)).fetchall())
+
+# -----------------------------------------------------------
+# 2. 원본 직렬화 (yfinance 표는 JSON 으로)
+# -----------------------------------------------------------
+def yahoo_raw_to_bytes(raw):
+    doc = {name: (None if df is None else df.to_json(orient='split', date_format='iso'))
+           for name, df in raw.items()}
+    return json.dumps(doc, ensure_ascii=False, sort_keys=True).encode("utf-8")
+
+def yahoo_raw_from_bytes(data):
+    doc = json.loads(data.decode("utf-8"))
+    return {name: (None if s is None else
+                   pd.read_json(StringIO(s), orient='split', convert_axes=False, convert_dates=False))
+            for name, s in doc.items()}
+
+def source_of(country):
+    return 'fnguide' if country == "KR" else 'yahoo'
+
+def fetch_raw(source, ticker):
+    from data_loader import fetch_fnguide_html, fetch_yahoo_raw
+    if source == 'fnguide': return fetch_fnguide_html(ticker).encode("utf-8")
+    return yahoo_raw_to_bytes(fetch_yahoo_raw(ticker, strict=True))  # 실패는 'error' 체크포인트로 남겨 재시도
+
+def parse_raw(source, data, fetched_at=None):
+    """원본 -> 추정치 레이어 {(source, year, quarter): value}"""
+    from fnguide_parser import parse_fnguide_eps
+    from estimate_store import layers_from_fnguide_eps, layers_from_yahoo
+    if source == 'fnguide': return layers_from_fnguide_eps(parse_fnguide_eps(data.decode("utf-8")))
+    from data_loader import parse_yahoo_estimates
+    today = datetime.date.fromisoformat(fetched_at[:10]) if fetched_at else None
+    return layers_from_yahoo(*parse_yahoo_estimates(yahoo_raw_from_bytes(data), today))
+
+# -----------------------------------------------------------
+# 3. 수집 (종목마다 체크포인트, 같은 run 재실행 시 완료분 건너뜀)
+# -----------------------------------------------------------
+def crawl(targets, archive, run, workers=8, progress_every=100):
+    """targets: [(ticker, name, country)] -> {'done': n, 'error': n, 'skipped': n}"""
+    jobs = [(source_of(country), ticker) for ticker, _, country in targets]
+    done = {s: archive.done_keys(run, s) for s in SOURCES}
+    todo = [(s, t) for s, t in jobs if t not in done[s]]
+    counts = {'done': 0, 'error': 0, 'skipped': len(jobs) - len(todo)}
+
+    def work(source, ticker):
+        try:
+            archive.put(source, ticker, fetch_raw(source, ticker))
+            archive.checkpoint(run, source, ticker)
+            return 'done'
+        except Exception as e:
+            archive.checkpoint(run, source, ticker, error=str(e)[:500])
+            return 'error'
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="crawler") as pool:
+        futures = [pool.submit(work, s, t) for s, t in todo]
+        for i, fut in enumerate(as_completed(futures), 1):
+            counts[fut.result()] += 1
+            if progress_every and i % progress_every == 0:
+                print(f"  {i}/{len(todo)} ({time.perf_counter() - t0:.0f}s)", flush=True)
+    return counts
+
+# -----------------------------------------------------------
+# 4. 오프라인 재파싱 (프로세스 풀)
+# -----------------------------------------------------------
+def _parse_chunk(args):
+    root, entries = args
+    out = {}
+    for source, key, fetched_at, sha in entries:
+        path = os.path.join(root, "objects", sha[:2], f"{sha[2:]}.gz")
+        try:
+            with open(path, "rb") as f: out[key] = parse_raw(source, gzip.decompress(f.read()), fetched_at)
+        except Exception as e:
+            print(f"⚠️ {source}/{key} 파싱 실패: {e}")
+    return out
+
+def reparse(archive, source=None, processes=None, chunk_size=200):
+    """보관된 최신 원본 전체를 다시 파싱 -> {key: layers}. 원격 호출 없음"""
+    entries = archive.latest(source)
+    chunks = [(archive.root, entries[i:i + chunk_size]) for i in range(0, len(entries), chunk_size)]
+    layers = {}
+    if not chunks: return layers
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        for part in pool.map(_parse_chunk, chunks): layers.update(part)
+    return layers
+
+def reparse_fwd(archive, source=None, processes=None):
+    """재파싱 -> EpsPanel -> 종목별 최신 12M Fwd EPS / Growth / Accel"""
+    from eps_panel import EpsPanel
+    layers = reparse(archive, source, processes)
+    batch = EpsPanel.from_layers(layers).fwd_batch()
+    return pd.DataFrame({name: df.iloc[:, -1] for name, df in batch.items()}).rename_axis('Ticker')
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description="재개 가능한 추정치 원본 수집기")
+    sub = p.add_subparsers(dest="cmd", required=True)
+    c = sub.add_parser("crawl", help="원본 수집 (같은 --run 으로 재실행하면 이어서)")
+    c.add_argument("--universe", choices=["krx"], help="KRX 전 종목")
+    c.add_argument("--tickers", help="쉼표로 구분한 종목명/티커")
+    c.add_argument("--run", default=str(datetime.date.today()), help="체크포인트 이름 (기본: 오늘 날짜)")
+    c.add_argument("--workers", type=int, default=8)
+    r = sub.add_parser("reparse", help="보관된 원본 전체를 오프라인 재파싱")
+    r.add_argument("--source", choices=SOURCES)
+    r.add_argument("--processes", type=int)
+    r.add_argument("--out", help="결과 CSV 경로")
+    for sp in (c, r): sp.add_argument("--archive", default=ARCHIVE_DIR)
+    args = p.parse_args()
+
+    archive = RawArchive(args.archive)
+    if args.cmd == "crawl":
+        from screener import krx_universe, parse_watchlist
+        from data_loader import find_ticker
+        if args.universe == "krx": targets = krx_universe()
+        elif args.tickers: targets = [find_ticker(t) for t in parse_watchlist(args.tickers)]
+        else: c.print_help(); raise SystemExit(1)
+        targets = [t for t in targets if t[2] is not None]
+        print(f"{len(targets)}종목 수집 (run={args.run}, workers={args.workers})")
+        print(crawl(targets, archive, args.run, args.workers), archive.run_summary(args.run))
+    else:
+        t0 = time.perf_counter()
+        df = reparse_fwd(archive, args.source, args.processes)
+        print(f"{len(df)}종목 재파싱 + 12M Fwd EPS: {time.perf_counter() - t0:.2f}s")
+        if args.out:
+            os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+            df.to_csv(args.out, encoding="utf-8-sig")
+        else: print(df.head(20))
@@ -1,163 +1,228 @@
-import streamlit as st
 import pandas as pd
-import pandas_datareader.data as web
-import yfinance as yf
-import requests
 import re
+import os
 import datetime
+import time
+import threading
 from io import StringIO
 
-# logic.py에서 함수들 가져오기 (기존 프로젝트 구조 유지)
-from logic import build_priority_map_kr, build_priority_map_us, calculate_12m_fwd_series
+from telemetry import span, instrumented_cache
+from recorder import http_get, recorded_call
+from fnguide_parser import parse_fnguide_eps
+from ticker_index import TickerIndex, SearchCache, INDEX_PATH, SEARCH_MISS_TTL
+from macro_store import get_macro_store
+from price_store import get_price_store
+from estimate_store import get_store, layers_from_fnguide, layers_from_yahoo, split_layers
+from eps_panel import EpsPanel
+
+# EPS_OFFLINE=1 이면 FnGuide/Yahoo 를 호출하지 않고 로컬 추정치 저장소만 사용
+OFFLINE = os.getenv("EPS_OFFLINE") == "1"
+MIN_REVISION_MONTHS = 3
+INDEX_MAX_AGE = 86400
+INDEX_RETRY_AFTER = 300   # KRX 목록을 못 받아 임시 색인을 썼으면 이만큼 뒤에 다시 빌드
 
 # -----------------------------------------------------------
 # 1. 거시경제(Macro) 데이터 수집
 # -----------------------------------------------------------
-@st.cache_data(ttl=3600)
+@instrumented_cache("get_macro_data", ttl=300, max_entries=1)  # 로컬 캐시가 빠르므로 짧게 두고 백그라운드 갱신 결과를 자주 반영
 def get_macro_data():
-    start_date = datetime.datetime.now() - datetime.timedelta(days=1000)
-    
-    # 1) FRED 데이터 (금리)
-    try:
-        y = web.DataReader('T10Y2Y', 'fred', start_date).dropna()
-        h = web.DataReader('BAMLH0A0HYM2', 'fred', start_date).dropna()
-    except: 
-        y, h = pd.DataFrame(), pd.DataFrame()
-    
-    # 2) OECD CLI 데이터 (미국 & 한국)
-    cli = pd.DataFrame()
-    targets = {'USA': '미국_CLI', 'KOR': '한국_CLI'}
-    
-    for code, name in targets.items():
-        try:
-            url = f"https://sdmx.oecd.org/public/rest/data/OECD.SDD.STES,DSD_STES@DF_CLI/{code}.M.LI...AA...H?dimensionAtObservation=AllDimensions&format=csvfilewithlabels"
-            r = requests.get(url, timeout=10)
-            if r.status_code == 200:
-                df = pd.read_csv(StringIO(r.text))
-                df['TIME_PERIOD'] = pd.to_datetime(df['TIME_PERIOD'])
-                df = df.set_index('TIME_PERIOD').sort_index()
-                cli[name] = df['OBS_VALUE']
-        except Exception as e:
-            print(f"{name} 로딩 실패: {e}")
-            
-    return y, h, cli
+    # FRED 2건 + OECD CLI(미국/한국)를 동시에, 마지막 관측치 이후만 받아옴
+    return get_macro_store().load()
 
 # -----------------------------------------------------------
 # 2. 개별 주식 재무 데이터 수집 (한국: FnGuide, 미국: Yahoo)
 # -----------------------------------------------------------
-@st.cache_data(ttl=3600)
-def get_fnguide_data(ticker_code):
+def fnguide_url(ticker_code):
     code = re.sub(r'[^0-9]', '', ticker_code)
-    url = f"https://comp.fnguide.com/SVO2/ASP/SVD_Main.asp?pGB=1&gicode=A{code}"
-    headers = {'User-Agent': 'Mozilla/5.0'}
+    return code, f"https://comp.fnguide.com/SVO2/ASP/SVD_Main.asp?pGB=1&gicode=A{code}"
+
+def fetch_fnguide_html(ticker_code):
+    code, url = fnguide_url(ticker_code)
+    with span("fnguide.fetch"):
+        r = http_get(url, timeout=10, namespace="fnguide", key=f"A{code}")
+    r.raise_for_status()
+    return r.text
+
+def parse_fnguide_frame(html):
+    # 하이라이트 표의 EPS 행/기간 헤더만 직접 파싱 (pd.read_html 전체 파싱 대비 10배 이상 빠름)
+    with span("fnguide.parse"):
+        merged = parse_fnguide_eps(html)
+    return pd.DataFrame([merged], index=['EPS']) if merged else None
+
+@instrumented_cache("get_fnguide_data", ttl=3600, stale_ttl=6 * 3600, max_entries=2048, max_bytes=32 << 20, persist=True)
+def get_fnguide_data(ticker_code):
     try:
-        r = requests.get(url, headers=headers, timeout=10)
-        tables = pd.read_html(StringIO(r.text))
-        merged = {}
-        for df in tables:
-            if any(df.iloc[:, 0].astype(str).str.contains("EPS|주당순이익")):
-                row = df[df.iloc[:, 0].astype(str).str.contains("EPS|주당순이익")].iloc[0]
-                for i, col in enumerate(df.columns):
-                    if i == 0: continue
-                    date_match = re.search(r"(\d{4}/\d{2})", str(col))
-                    if date_match:
-                        is_quarter = "분기" in str(df.columns) or "Quarter" in str(df.columns)
-                        tag = "Q|" if is_quarter else "A|"
-                        val = str(row.iloc[i]).replace(',', '').split('(')[0]
-                        if val.strip() not in ['-', '', 'nan', 'N/A']:
-                            merged[f"{tag}{date_match.group(1)}"] = int(float(val))
-        return pd.DataFrame([merged], index=['EPS']) if merged else None
+        return parse_fnguide_frame(fetch_fnguide_html(ticker_code))
     except: return None
 
-@st.cache_data(ttl=3600)  # 성공 로직이므로 캐시를 정상적으로 켭니다!
+# 실패하면 ({}, {}, {}) 이므로 하나라도 채워진 결과만 캐시
+@instrumented_cache("get_yahoo_data", ttl=3600, stale_ttl=6 * 3600, max_entries=2048, max_bytes=32 << 20, persist=True,
+                    should_cache=any)
 def get_yahoo_data(ticker_code):
-    import datetime
-    import pandas as pd
+    # yfinance 는 자체 세션을 쓰므로 HTTP 대신 결과 단위로 녹화/재생
+    with span("yahoo.fetch"):
+        return recorded_call("yahoo", ticker_code, fetch_yahoo_estimates, ticker_code)
+
+YAHOO_RAW_FIELDS = ['quarterly_income_stmt', 'earnings_history', 'earnings_estimate']
+
+def fetch_yahoo_raw(ticker_code, strict=False):
+    """파싱 전 yfinance 표 원본 {필드: DataFrame 또는 None} (crawler 가 그대로 보관)
+    모든 필드가 비면 RuntimeError. strict=True 면 한 필드라도 실패할 때 RuntimeError (부분 원본을 보관하지 않도록)"""
     import yfinance as yf
-    
-    try:
-        # 🚨 [핵심] 세션 위장 코드를 지우고, 똑똑해진 yfinance 자체 우회 엔진에 전적으로 맡깁니다!
-        stock = yf.Ticker(ticker_code)
-        past_map, est_annual, est_quarter = {}, {}, {}
-        
-        # 🛡️ 1단계: 재무제표 원본(quarterly_income_stmt)에서 과거 EPS 직접 추출 (가장 강력한 우회로)
-        try:
-            q_stmt = stock.quarterly_income_stmt
-            if q_stmt is not None and not q_stmt.empty:
-                for eps_name in ['Diluted EPS', 'Basic EPS', 'EPS']:
-                    if eps_name in q_stmt.index:
-                        eps_row = q_stmt.loc[eps_name].dropna()
-                        for date_col, val in eps_row.items():
-                            year = date_col.year
-                            quarter = (date_col.month - 1) // 3 + 1
-                            past_map[(year, quarter)] = float(val)
-                        break
+    stock = yf.Ticker(ticker_code)
+    raw, errors = {}, []
+    for name in YAHOO_RAW_FIELDS:
+        if name == 'earnings_history' and parse_yahoo_estimates(raw)[0]:
+            raw[name] = None  # 재무제표에서 과거 EPS 를 얻었으면 백업 표는 요청하지 않음
+            continue
+        try: raw[name] = getattr(stock, name)
         except Exception as e:
-            print(f"재무제표 원본 추출 실패: {e}")
-
-        # 🛡️ 2단계: 기존 earnings_history 백업 (야후가 기분 좋아서 열어줄 때를 대비)
-        if not past_map:
-            try:
-                hist = stock.earnings_history
-                if hist is not None and not hist.empty:
-                    for idx, row in hist.iterrows():
-                        if pd.notna(row.get('epsActual')):
-                            past_map[(idx.year, (idx.month-1)//3+1)] = float(row['epsActual'])
-            except: pass
-
-        # 🛡️ 3단계: 미래 추정치 추출 (earnings_estimate)
+            print(f"{name} 추출 실패: {e}")
+            raw[name] = None
+            errors.append(f"{name}: {e}")
+    if strict and errors: raise RuntimeError("; ".join(errors))
+    if all(df is None or df.empty for df in raw.values()):
+        raise RuntimeError(f"{ticker_code}: yfinance 응답이 모두 비어 있음" + (f" ({'; '.join(errors)})" if errors else ""))
+    return raw
+
+def parse_yahoo_estimates(raw, today=None):
+    """yfinance 표 원본 -> (past_map, est_annual, est_quarter). today: 추정치 기간(0q, +1y ...)의 기준일"""
+    today = today or datetime.date.today()
+    past_map, est_annual, est_quarter = {}, {}, {}
+
+    # 🛡️ 1단계: 재무제표 원본(quarterly_income_stmt)에서 과거 EPS 직접 추출 (가장 강력한 우회로)
+    try:
+        q_stmt = raw.get('quarterly_income_stmt')
+        if q_stmt is not None and not q_stmt.empty:
+            for eps_name in ['Diluted EPS', 'Basic EPS', 'EPS']:
+                if eps_name in q_stmt.index:
+                    eps_row = q_stmt.loc[eps_name].dropna()
+                    for date_col, val in eps_row.items():
+                        date_col = pd.Timestamp(date_col)
+                        year = date_col.year
+                        quarter = (date_col.month - 1) // 3 + 1
+                        past_map[(year, quarter)] = float(val)
+                    break
+    except Exception as e:
+        print(f"재무제표 원본 추출 실패: {e}")
+
+    # 🛡️ 2단계: 기존 earnings_history 백업 (야후가 기분 좋아서 열어줄 때를 대비)
+    if not past_map:
         try:
-            est = stock.earnings_estimate
-            if est is not None and not est.empty:
-                est.index = est.index.astype(str).str.strip()
-                curr_y = datetime.date.today().year
-                for term, offset in [('0y',0), ('+1y',1), ('+5y',5)]:
-                    if term in est.index:
-                        val = est.loc[term, 'avg']
-                        if pd.notna(val): est_annual[curr_y+offset] = float(val)
-                
-                if '0q' in est.index:
-                    val = est.loc['0q', 'avg']
-                    if pd.notna(val): est_quarter[(curr_y, (datetime.date.today().month-1)//3+1)] = float(val)
-                if '+1q' in est.index:
-                    val = est.loc['+1q', 'avg']
-                    if pd.notna(val):
-                        nm = datetime.date.today().month + 3
-                        ny = curr_y + (1 if nm > 12 else 0)
-                        nq = ((nm-1)//3+1) if nm <= 12 else 1
-                        est_quarter[(ny, nq)] = float(val)
+            hist = raw.get('earnings_history')
+            if hist is not None and not hist.empty:
+                for idx, row in hist.iterrows():
+                    idx = pd.Timestamp(idx)
+                    if pd.notna(row.get('epsActual')):
+                        past_map[(idx.year, (idx.month-1)//3+1)] = float(row['epsActual'])
         except: pass
 
-        # 🛡️ 4단계: 비상 대책 (앱 중단 방지)
-        # 야후가 미래 추정치를 안 줄 때, 과거 4분기 데이터를 복사해 가상의 TTM(Trailing Twelve Months) 유지
-        if not est_annual and past_map:
-            curr_y = datetime.date.today().year
-            recent_eps_list = list(past_map.values())[:4]
-            if recent_eps_list:
-                ttm_eps = sum(recent_eps_list)
-                est_annual[curr_y] = ttm_eps
-                est_annual[curr_y+1] = ttm_eps
+    # 🛡️ 3단계: 미래 추정치 추출 (earnings_estimate)
+    try:
+        est = raw.get('earnings_estimate')
+        if est is not None and not est.empty:
+            est = est.copy()
+            est.index = est.index.astype(str).str.strip()
+            curr_y = today.year
+            for term, offset in [('0y',0), ('+1y',1), ('+5y',5)]:
+                if term in est.index:
+                    val = est.loc[term, 'avg']
+                    if pd.notna(val): est_annual[curr_y+offset] = float(val)
+            
+            if '0q' in est.index:
+                val = est.loc['0q', 'avg']
+                if pd.notna(val): est_quarter[(curr_y, (today.month-1)//3+1)] = float(val)
+            if '+1q' in est.index:
+                val = est.loc['+1q', 'avg']
+                if pd.notna(val):
+                    nm = today.month + 3
+                    ny = curr_y + (1 if nm > 12 else 0)
+                    nq = ((nm-1)//3+1) if nm <= 12 else 1
+                    est_quarter[(ny, nq)] = float(val)
+    except: pass
 
-        return past_map, est_annual, est_quarter
+    # 🛡️ 4단계: 비상 대책 (앱 중단 방지)
+    # 야후가 미래 추정치를 안 줄 때, 과거 4분기 데이터를 복사해 가상의 TTM(Trailing Twelve Months) 유지
+    if not est_annual and past_map:
+        curr_y = today.year
+        recent_eps_list = list(past_map.values())[:4]
+        if recent_eps_list:
+            ttm_eps = sum(recent_eps_list)
+            est_annual[curr_y] = ttm_eps
+            est_annual[curr_y+1] = ttm_eps
+
+    return past_map, est_annual, est_quarter
+
+def fetch_yahoo_estimates(ticker_code):
+    try:
+        # 🚨 [핵심] 세션 위장 코드를 지우고, 똑똑해진 yfinance 자체 우회 엔진에 전적으로 맡깁니다!
+        return parse_yahoo_estimates(fetch_yahoo_raw(ticker_code))
     except Exception as e:
         print(f"🚨 Yahoo Data Fetch Error: {e}")
         return {}, {}, {}
 
-@st.cache_data(ttl=3600)
+def _record_snapshot(ticker, layers):
+    """추정치 스냅샷을 저장소에 남기고 저장된 리비전 이력을 돌려줌 (실패해도 분석은 계속)"""
+    try:
+        store = get_store()
+        if layers: store.append_snapshot(ticker, layers)
+        return store.layers_asof(ticker), store.revision_trend(ticker)
+    except Exception as e:
+        print(f"⚠️ EPS 저장소 기록 실패: {e}")
+        return {}, pd.DataFrame()
+
+def _pick_trend(ticker, layers, revision_df):
+    # 실제 리비전 이력이 충분하면 그것을, 아니면 오늘 스냅샷을 굴린 추세를 사용
+    # attrs['source'] 는 민감도 계산이 이전 시점을 고정할지, attrs['layers'] 는 어떤 추정치에 충격을 줄지 정하는 데 사용
+    if revision_df is not None and len(revision_df) >= MIN_REVISION_MONTHS:
+        trend = revision_df
+        trend.attrs['source'] = 'revision'
+    else:
+        trend = EpsPanel.from_layers({ticker: layers}).fwd_series(ticker)
+        trend.attrs['source'] = 'snapshot'
+    trend.attrs['layers'] = dict(layers)
+    return trend
+
+def fetch_estimate_layers(ticker, country_code):
+    """캐시를 거치지 않은 최신 추정치 레이어 (모니터의 변경 감지용). 실패하면 빈 사전"""
+    if OFFLINE: return get_store().layers_asof(ticker)
+    if country_code == "KR": return layers_from_fnguide(get_fnguide_data.__wrapped__(ticker))
+    return layers_from_yahoo(*get_yahoo_data.__wrapped__(ticker))
+
+def trend_from_layers(ticker, layers):
+    """스냅샷 기록 후 12M Fwd EPS 추세 (get_unified_data 와 같은 선택 규칙)"""
+    stored, revision_df = _record_snapshot(ticker, layers)
+    layers = layers or stored
+    return _pick_trend(ticker, layers, revision_df) if layers else pd.DataFrame()
+
+# 추정치를 못 받으면 (빈 표, 빈 추세) 이므로 추세가 있는 결과만 캐시 (갱신 실패 시 기존 값 유지)
+@instrumented_cache("get_unified_data", ttl=3600, stale_ttl=6 * 3600, max_entries=1024, max_bytes=64 << 20, persist=True,
+                    should_cache=lambda r: r is not None and not r[1].empty)
 def get_unified_data(ticker, country_code):
     merged_ui = {}
     trend_df = pd.DataFrame()
     
     if country_code == "KR":
-        df_raw = get_fnguide_data(ticker)
+        df_raw = None if OFFLINE else get_fnguide_data(ticker)
+        layers = layers_from_fnguide(df_raw)
+        stored, revision_df = _record_snapshot(ticker, layers)
         if df_raw is not None:
-            q_map = build_priority_map_kr(df_raw)
-            trend_df = calculate_12m_fwd_series(q_map)
             merged_ui = df_raw.iloc[0].to_dict()
+        else:
+            # 원격 소스 없이 저장된 최신 추정치로 시작
+            layers = stored
+            _, est_a, est_q = split_layers(stored)
+            merged_ui = {f"A|{y}": v for y, v in sorted(est_a.items())}
+            merged_ui.update({f"Q|{y}.{q}Q": v for (y, q), v in sorted(est_q.items())})
+        if layers: trend_df = _pick_trend(ticker, layers, revision_df)
     else:
-        past, est_a, est_q = get_yahoo_data(ticker)
-        q_map = build_priority_map_us(past, est_a, est_q)
-        trend_df = calculate_12m_fwd_series(q_map)
+        past, est_a, est_q = ({}, {}, {}) if OFFLINE else get_yahoo_data(ticker)
+        layers = layers_from_yahoo(past, est_a, est_q)
+        stored, revision_df = _record_snapshot(ticker, layers)
+        if not layers:
+            layers = stored
+            past, est_a, est_q = split_layers(stored)
+        if layers: trend_df = _pick_trend(ticker, layers, revision_df)
         
         if est_a:
             curr_y = datetime.date.today().year
@@ -168,68 +233,94 @@ def get_unified_data(ticker, country_code):
     df_ui = pd.DataFrame([merged_ui], index=['EPS']) if merged_ui else pd.DataFrame()
     return df_ui, trend_df
 
+def get_last_price(ticker):
+    """최근 종가 (로컬 저장소에서 즉시, 오래됐으면 백그라운드 갱신. 실패 시 0)"""
+    try:
+        with span("price.latest"): latest = get_price_store().latest(ticker)
+        return latest[1] if latest else 0
+    except Exception: return 0
+
 # -----------------------------------------------------------
 # 3. 🛡️ 3중 방어 티커 검색 시스템 (핵심 개선 사항)
 # -----------------------------------------------------------
-@st.cache_data(ttl=86400) # 하루(86400초) 동안 CSV 데이터 캐싱
+@instrumented_cache("get_krx_csv_cache", ttl=86400, stale_ttl=6 * 86400, max_entries=1, persist=True) # 하루(86400초) 동안 CSV 데이터 캐싱
 def get_krx_csv_cache():
     try:
         # fdr 대신 안정적인 KRX 전체 목록 CSV 파일을 읽어옵니다.
         url = "https://raw.githubusercontent.com/corazzon/finance-data-analysis/main/krx.csv"
-        df = pd.read_csv(url, dtype={'Symbol': str}) 
+        r = http_get(url, timeout=30, namespace="krx", key="krx_list")
+        r.raise_for_status()
+        df = pd.read_csv(StringIO(r.text), dtype={'Symbol': str}) 
         df['CleanName'] = df['Name'].astype(str).str.replace(" ", "").str.upper()
         return df
     except Exception as e:
         print(f"⚠️ CSV 백업 로딩 실패: {e}")
         return None
 
-def find_ticker(user_input):
-    original_input = user_input.strip()
-    clean_input = original_input.replace(" ", "").upper()
-    
-    # [1단계] 하드코딩 사전
-    mapping = {
-        "테슬라": "TSLA", "애플": "AAPL", "마이크로소프트": "MSFT", "엔비디아": "NVDA", "팔란티어":"PLTR",
-        "구글": "GOOGL", "아마존": "AMZN", "메타": "META", "브로드컴": "AVGO",
-        "티에스엠": "TSM", "AMD": "AMD", "인텔": "INTC", "마이크론": "MU",
-        "스타벅스": "SBUX", "코카콜라": "KO", "나이키": "NKE", "리얼티인컴": "O",
-        "삼성전자": "005930.KS", "SK하이닉스": "000660.KS", "카카오": "035720.KS", "네이버": "035420.KS",
-        "현대차": "005380.KS", "기아": "000270.KS"
-    }
-    
-    for key, val in mapping.items():
-        if key.replace(" ", "").upper() == clean_input:
-            country = "KR" if (".KS" in val or ".KQ" in val) else "US"
-            return val, original_input, country
-
-    # [2단계] 안정적인 CSV 백업본 직접 호출 (한국 주식 찾기)
-    krx_df = get_krx_csv_cache()
-    if krx_df is not None:
-        match = krx_df[krx_df['CleanName'] == clean_input]
-        if not match.empty:
-            code = str(match.iloc[0]['Symbol']).zfill(6)
-            mkt = str(match.iloc[0].get('Market', 'KOSPI')).upper()
-            suffix = ".KQ" if 'KOSDAQ' in mkt else ".KS"
-            return f"{code}{suffix}", original_input, "KR"
-
-    # [3단계] 최후의 보루 야후 파이낸스 자체 검색 API
+def krx_ticker(symbol, market):
+    code = str(symbol).zfill(6)
+    suffix = ".KQ" if 'KOSDAQ' in str(market).upper() else ".KS"
+    return f"{code}{suffix}"
+
+_index_lock = threading.Lock()
+_ticker_index = None
+_search_cache = None
+
+def get_ticker_index():
+    """디스크에 저장된 색인을 바로 쓰고, 없거나 하루가 지났으면 KRX 목록으로 다시 빌드"""
+    global _ticker_index
+    with _index_lock:
+        if _ticker_index is None or time.time() - _ticker_index.built_at > INDEX_MAX_AGE:
+            idx = TickerIndex.load(INDEX_PATH, max_age=INDEX_MAX_AGE)
+            if idx is None:
+                krx_df = get_krx_csv_cache()
+                idx = TickerIndex.build(krx_df, krx_ticker)
+                if krx_df is not None: idx.save(INDEX_PATH)
+                else: idx.built_at = time.time() - INDEX_MAX_AGE + INDEX_RETRY_AFTER  # KRX 목록 없이 만든 색인은 잠시 뒤 재시도
+            _ticker_index = idx
+        return _ticker_index
+
+def suggest_tickers(query, limit=5):
+    return get_ticker_index().suggest(query, limit)
+
+def _search_yahoo(original_input):
+    global _search_cache
+    if _search_cache is None: _search_cache = SearchCache()
+    cached = _search_cache.get(original_input)
+    if cached: return cached
+
     try:
         url = f"https://query2.finance.yahoo.com/v1/finance/search?q={original_input}"
-        headers = {'User-Agent': 'Mozilla/5.0'}
-        res = requests.get(url, headers=headers, timeout=5)
+        with span("yahoo.search"):
+            res = http_get(url, timeout=5, namespace="yahoo_search")
         
         if res.status_code == 200:
             quotes = res.json().get('quotes', [])
-            if quotes:
-                for q in quotes:
-                    sym = q.get('symbol', '')
-                    if sym.endswith('.KS') or sym.endswith('.KQ'):
-                        return sym, original_input, "KR"
-                
-                first_sym = quotes[0].get('symbol', '')
-                return first_sym, original_input, "US"
+            if not quotes:
+                result = (original_input.upper(), "US")
+                _search_cache.put(original_input, *result, ttl=SEARCH_MISS_TTL)  # 못 찾은 결과는 만료 후 재검색
+                return result
+            kr = [q.get('symbol', '') for q in quotes if q.get('symbol', '').endswith(('.KS', '.KQ'))]
+            result = (kr[0], "KR") if kr else (quotes[0].get('symbol', ''), "US")
+            _search_cache.put(original_input, *result)
+            return result
     except Exception as e:
         print(f"🚨 야후 검색 API 실패: {e}")
+    return None
+
+@span("find_ticker")
+def find_ticker(user_input):
+    original_input = user_input.strip()
+    
+    # [1~2단계] 하드코딩 사전 + KRX 목록 + 심볼 색인 (해시 조회)
+    hit = get_ticker_index().lookup(original_input)
+    if hit:
+        return hit[0], original_input, hit[1]
+
+    # [3단계] 최후의 보루 야후 파이낸스 자체 검색 API (결과 캐시)
+    found = _search_yahoo(original_input)
+    if found:
+        return found[0], original_input, found[1]
 
     # 다 실패하면 사용자가 직접 입력한 값 그대로 리턴
     return original_input.upper(), original_input, "US"
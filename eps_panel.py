@@ -0,0 +1,140 @@
+"""분기 EPS 패널: 종목 x 분기 서수 float 배열 + 출처 코드 배열
+
+  panel = EpsPanel.from_layers({"AAPL": layers, "005930": layers2})
+  trend = panel.fwd_series("AAPL")         # 분기 우선순위 병합 + 12M Fwd EPS 추세
+  panel.provenance("AAPL")                 # 분기별 값이 어느 레이어에서 왔는지
+
+우선순위: 확정 실적 > 분기 추정치 > 연간 추정치/4 (출처 코드가 클수록 우선)
+"""
+import numpy as np
+import pandas as pd
+
+from logic import (quarter_ordinal, fwd_dates, calculate_12m_fwd_matrix, calculate_12m_fwd_rows,
+                   calculate_growth_accel, FWD_COLUMNS)
+
+SOURCE_NONE, SOURCE_ANNUAL, SOURCE_QUARTER, SOURCE_ACTUAL = 0, 1, 2, 3
+SOURCE_CODES = {'annual': SOURCE_ANNUAL, 'quarter': SOURCE_QUARTER, 'actual': SOURCE_ACTUAL}
+SOURCE_NAMES = {code: name for name, code in SOURCE_CODES.items()}
+
+class EpsPanel:
+    def __init__(self, rows, base=0, values=None, source=None):
+        self.rows = list(rows)
+        self.index = {r: i for i, r in enumerate(self.rows)}
+        self.base = base
+        self.values = np.zeros((len(self.rows), 0)) if values is None else values
+        self.source = np.zeros(self.values.shape, dtype=np.int8) if source is None else source
+
+    @property
+    def mask(self):
+        return self.source != SOURCE_NONE
+
+    @property
+    def width(self):
+        return self.values.shape[1]
+
+    def _cover(self, lo, hi):
+        """분기 서수 [lo, hi] 가 들어가도록 배열을 넓힘"""
+        if self.width and lo >= self.base and hi < self.base + self.width: return
+        base = min(lo, self.base) if self.width else lo
+        end = max(hi + 1, self.base + self.width) if self.width else hi + 1
+        values = np.zeros((len(self.rows), end - base))
+        source = np.zeros(values.shape, dtype=np.int8)
+        off = self.base - base
+        values[:, off:off + self.width] = self.values
+        source[:, off:off + self.width] = self.source
+        self.values, self.source, self.base = values, source, base
+
+    def merge(self, code, rows, ords, vals):
+        """(행 번호, 분기 서수, 값) 배열을 한 번에 병합. 기존 값보다 출처가 같거나 높을 때만 덮어씀
+        (같은 출처 안에서는 나중 값이 이김 - 사전 덮어쓰기와 같음)"""
+        rows, ords = np.asarray(rows, dtype=np.int64), np.asarray(ords, dtype=np.int64)
+        vals = np.asarray(vals, dtype=float)
+        if not len(rows): return self
+        self._cover(int(ords.min()), int(ords.max()))
+        cols = ords - self.base
+        take = self.source[rows, cols] <= code
+        rows, cols = rows[take], cols[take]
+        self.values[rows, cols] = vals[take]
+        self.source[rows, cols] = code
+        return self
+
+    def merge_annual(self, rows, years, vals):
+        """연간 추정치 -> 네 분기에 1/4 씩"""
+        years, vals = np.asarray(years, dtype=np.int64), np.asarray(vals, dtype=float)
+        ords = quarter_ordinal(years, 1)[:, None] + np.arange(4)
+        return self.merge(SOURCE_ANNUAL, np.repeat(np.asarray(rows, dtype=np.int64), 4),
+                          ords.ravel(), np.repeat(vals / 4, 4))
+
+    @classmethod
+    def from_layers(cls, layers_by_row):
+        """{행 키: {(source, year, quarter): value}} -> EpsPanel (레이어별로 모아 한 번씩 병합)"""
+        panel = cls(layers_by_row)
+        flat = {name: ([], [], [], []) for name in SOURCE_CODES}
+        for i, layers in enumerate(layers_by_row.values()):
+            for (source, yr, q), v in layers.items():
+                r, y, qq, vals = flat[source]
+                r.append(i); y.append(yr); qq.append(q); vals.append(v)
+        r, y, _, vals = flat['annual']
+        panel.merge_annual(r, y, vals)
+        for name in ('quarter', 'actual'):
+            r, y, q, vals = flat[name]
+            panel.merge(SOURCE_CODES[name], r, quarter_ordinal(np.asarray(y, dtype=np.int64), np.asarray(q, dtype=np.int64)), vals)
+        return panel
+
+    @classmethod
+    def from_records(cls, rows, row_idx, sources, years, quarters, values):
+        """평평한 (행 번호, source, year, quarter, value) 배열 -> EpsPanel. from_layers 와 같은 순서로 병합
+        (이미 표 형태로 가진 레코드를 사전으로 바꾸지 않고 바로 적재)"""
+        panel = cls(rows)
+        row_idx, years = np.asarray(row_idx, dtype=np.int64), np.asarray(years, dtype=np.int64)
+        quarters, values = np.asarray(quarters, dtype=np.int64), np.asarray(values, dtype=float)
+        sources = np.asarray(sources)
+        take = sources == 'annual'
+        panel.merge_annual(row_idx[take], years[take], values[take])
+        for name in ('quarter', 'actual'):
+            take = sources == name
+            panel.merge(SOURCE_CODES[name], row_idx[take], quarter_ordinal(years[take], quarters[take]), values[take])
+        return panel
+
+    # -------------------------------------------------------
+    # 조회 / 감사
+    # -------------------------------------------------------
+    def q_map(self, row):
+        """기존 {(year, q): eps} 형태 (호환용)"""
+        i = self.index[row]
+        cols = np.flatnonzero(self.source[i])
+        return {(int(o // 4), int(o % 4) + 1): float(v) for o, v in zip(self.base + cols, self.values[i, cols])}
+
+    def provenance(self, row):
+        """분기별 값과 출처 레이어 -> DataFrame(year, quarter, value, source)"""
+        i = self.index[row]
+        cols = np.flatnonzero(self.source[i])
+        ords = self.base + cols
+        return pd.DataFrame({'year': ords // 4, 'quarter': ords % 4 + 1, 'value': self.values[i, cols],
+                             'source': [SOURCE_NAMES[c] for c in self.source[i, cols]]})
+
+    # -------------------------------------------------------
+    # 12M Fwd EPS (사전 변환 없이 배열 그대로)
+    # -------------------------------------------------------
+    def fwd_matrix(self, dates):
+        return calculate_12m_fwd_matrix(self.values, self.mask, self.base, dates)
+
+    def fwd_rows(self, month_ords):
+        """행마다 다른 기준 월 (시점별 스냅샷 패널)"""
+        return calculate_12m_fwd_rows(self.values, self.mask, self.base, month_ords)
+
+    def fwd_batch(self, periods=13, end=None):
+        """{'12M Fwd EPS' | 'Growth' | 'Accel': DataFrame(행 x 날짜)}"""
+        dates = fwd_dates(periods, end)
+        fwd = self.fwd_matrix(dates)
+        growth, accel = calculate_growth_accel(fwd)
+        return {name: pd.DataFrame(arr, index=self.rows, columns=dates)
+                for name, arr in zip(FWD_COLUMNS, (fwd, growth, accel))}
+
+    def fwd_series(self, row, periods=13, end=None):
+        i = self.index[row]
+        if not self.source[i].any(): return pd.DataFrame()
+        dates = fwd_dates(periods, end)
+        fwd = calculate_12m_fwd_matrix(self.values[i:i+1], self.source[i:i+1] != SOURCE_NONE, self.base, dates)
+        growth, accel = calculate_growth_accel(fwd)
+        return pd.DataFrame({'12M Fwd EPS': fwd[0], 'Growth': growth[0], 'Accel': accel[0]}, index=dates)
@@ -0,0 +1,162 @@
+import os
+import sqlite3
+import datetime
+import threading
+
+import numpy as np
+import pandas as pd
+
+from logic import calculate_growth_accel, FWD_COLUMNS
+from eps_panel import EpsPanel
+
+STORE_PATH = os.getenv("EPS_STORE_PATH", os.path.join("data", "eps_store.sqlite"))
+
+# source: 'actual' (확정 실적) / 'quarter' (분기 추정치) / 'annual' (연간 추정치, quarter=0)
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS estimates (
+    ticker        TEXT    NOT NULL,
+    snapshot_date TEXT    NOT NULL,
+    year          INTEGER NOT NULL,
+    quarter       INTEGER NOT NULL,
+    source        TEXT    NOT NULL,
+    value         REAL,
+    PRIMARY KEY (ticker, snapshot_date, year, quarter, source)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_estimates_key
+    ON estimates (ticker, source, year, quarter, snapshot_date);
+"""
+
+# -----------------------------------------------------------
+# 1. 원천 데이터 -> 레이어 {(source, year, quarter): value}
+# -----------------------------------------------------------
+def layers_from_fnguide(df_raw):
+    if df_raw is None or df_raw.empty: return {}
+    return layers_from_fnguide_eps(df_raw.iloc[0].to_dict())
+
+def layers_from_fnguide_eps(merged):
+    """parse_fnguide_eps 결과 {'A|YYYY/MM' | 'Q|YYYY/MM': EPS} -> 레이어 (DataFrame 을 거치지 않음)"""
+    layers = {}
+    for k, v in merged.items():
+        k = str(k)
+        try:
+            if k.startswith("A|") and "Blended" not in k:
+                layers[('annual', int(k[2:].split('/')[0]), 0)] = float(v)
+            elif k.startswith("Q|"):
+                yr, mo = k[2:].split('/')[:2]
+                layers[('quarter', int(yr), (int(mo) - 1) // 3 + 1)] = float(v)
+        except (ValueError, TypeError): pass
+    return layers
+
+def layers_from_yahoo(past_map, est_annual, est_quarter):
+    layers = {('annual', yr, 0): float(v) for yr, v in est_annual.items()}
+    layers.update({('quarter', yr, q): float(v) for (yr, q), v in est_quarter.items()})
+    layers.update({('actual', yr, q): float(v) for (yr, q), v in past_map.items()})
+    return layers
+
+def split_layers(layers):
+    """레이어 -> (past_map, est_annual, est_quarter) 원천별 사전 (화면 표시용)"""
+    past, annual, quarter = {}, {}, {}
+    for (source, yr, q), v in layers.items():
+        if source == 'annual': annual[yr] = v
+        elif source == 'quarter': quarter[(yr, q)] = v
+        else: past[(yr, q)] = v
+    return past, annual, quarter
+
+def q_map_from_layers(layers):
+    """레이어 -> {(year, q): eps} (우선순위 병합은 EpsPanel 한 곳에서)"""
+    return EpsPanel.from_layers({0: layers}).q_map(0)
+
+# -----------------------------------------------------------
+# 2. 시점별(point-in-time) 추정치 저장소
+# -----------------------------------------------------------
+class EstimateStore:
+    def __init__(self, path=STORE_PATH):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        with self.lock:
+            if path != ":memory:": self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.executescript(SCHEMA)
+
+    def _latest_rows(self, ticker, asof=None):
+        sql = """
+            SELECT source, year, quarter, value FROM estimates e
+            WHERE ticker = ? AND snapshot_date = (
+                SELECT MAX(snapshot_date) FROM estimates
+                WHERE ticker = e.ticker AND source = e.source AND year = e.year
+                  AND quarter = e.quarter AND snapshot_date <= ?)
+        """
+        return self.conn.execute(sql, (ticker, asof or "9999-12-31")).fetchall()
+
+    def append_snapshot(self, ticker, layers, snapshot_date=None):
+        """오늘자 추정치를 추가. 직전 값과 같은 행은 건너뛰고, 사라진 항목은 NULL 로 기록.
+        반환값: 새로 기록한 행 수"""
+        snap = str(snapshot_date or datetime.date.today())
+        with self.lock:
+            prev = {(s, y, q): v for s, y, q, v in self._latest_rows(ticker, snap)}
+            rows = [(ticker, snap, y, q, s, v) for (s, y, q), v in layers.items()
+                    if prev.get((s, y, q)) != v]
+            rows += [(ticker, snap, y, q, s, None) for (s, y, q), v in prev.items()
+                     if v is not None and (s, y, q) not in layers]
+            if rows:
+                with self.conn:
+                    self.conn.executemany("INSERT OR REPLACE INTO estimates VALUES (?,?,?,?,?,?)", rows)
+        return len(rows)
+
+    def read_range(self, ticker, start=None, end=None):
+        sql = """
+            SELECT snapshot_date, year, quarter, source, value FROM estimates
+            WHERE ticker = ? AND snapshot_date BETWEEN ? AND ?
+            ORDER BY snapshot_date
+        """
+        with self.lock:
+            rows = self.conn.execute(sql, (ticker, str(start or "0000-01-01"), str(end or "9999-12-31"))).fetchall()
+        df = pd.DataFrame(rows, columns=['snapshot_date', 'year', 'quarter', 'source', 'value'])
+        df['snapshot_date'] = pd.to_datetime(df['snapshot_date'])
+        return df
+
+    def layers_asof(self, ticker, asof=None):
+        with self.lock:
+            rows = self._latest_rows(ticker, str(asof) if asof else None)
+        return {(s, y, q): v for s, y, q, v in rows if v is not None}
+
+    def q_map_asof(self, ticker, asof=None):
+        return q_map_from_layers(self.layers_asof(ticker, asof))
+
+    def tickers(self):
+        with self.lock:
+            return [r[0] for r in self.conn.execute("SELECT DISTINCT ticker FROM estimates")]
+
+    def revision_trend(self, ticker, start=None, end=None):
+        """월말마다 그 시점에 알려져 있던 추정치로 12M Fwd EPS 를 계산한 실제 리비전 추세"""
+        hist = self.read_range(ticker, None, end)
+        if hist.empty: return pd.DataFrame()
+
+        months = pd.period_range(hist['snapshot_date'].min(), hist['snapshot_date'].max(), freq='M')
+        hist['month'] = hist['snapshot_date'].dt.to_period('M')
+        keys = ['source', 'year', 'quarter']
+        # 월마다 항목별 마지막 기록 -> 월 x 항목 표. 삭제(NULL)는 inf 로 두어 ffill 이 이전 값을 되살리지 않게 함
+        last = hist.drop_duplicates(['month'] + keys, keep='last')
+        wide = (last.assign(value=last['value'].astype(float).fillna(np.inf))
+                .pivot(index='month', columns=keys, values='value')
+                .reindex(months).ffill().replace(np.inf, np.nan))
+        known = wide.reset_index(drop=True).stack(keys, future_stack=True).dropna()
+        rows, sources, years, quarters = (known.index.get_level_values(i) for i in range(4))
+        panel = EpsPanel.from_records(months, rows, sources, years, quarters, known.to_numpy())
+
+        dates = months.to_timestamp(how='end').normalize()
+        # 각 월말 행은 자기 시점의 추정치만 사용
+        fwd = panel.fwd_rows((dates.year * 12 + dates.month - 1).to_numpy())
+        growth, accel = calculate_growth_accel(fwd[None, :])
+        trend = pd.DataFrame(dict(zip(FWD_COLUMNS, (fwd, growth[0], accel[0]))), index=dates)
+        return trend[trend.index >= pd.Timestamp(start)] if start else trend
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_store():
+    global _store
+    with _store_lock:
+        if _store is None: _store = EstimateStore()
+        return _store
@@ -0,0 +1,71 @@
+import re
+import threading
+
+from lxml import etree
+
+# SVD_Main 의 Financial Highlight 블록: highlight_{D|B}_{Y|Q} (연결/별도 x 연간/분기)
+HIGHLIGHT_XPATH = "//div[starts-with(@id, 'highlight_')]//table"
+EPS_PATTERN = re.compile(r"EPS|주당순이익")
+DATE_PATTERN = re.compile(r"(\d{4}/\d{2})")
+HIGHLIGHT_ID = re.compile(r"""id=["']highlight_""")
+# lxml.html 의 요소 클래스 조회를 건너뛰는 기본 etree HTML 파서 (수천 페이지 재파싱 시 차이가 큼)
+# 파서 객체는 스레드 간에 공유할 수 없으므로 스레드마다 하나
+_local = threading.local()
+
+def _parser():
+    if not hasattr(_local, "parser"): _local.parser = etree.HTMLParser(remove_comments=True)
+    return _local.parser
+
+def _text(el):
+    return " ".join("".join(el.itertext()).split())
+
+def _cells(tr):
+    return [c for c in tr if c.tag in ("th", "td")]
+
+def _eps_row(table):
+    for tr in table.iterfind(".//tbody/tr"):
+        cells = _cells(tr)
+        if cells and EPS_PATTERN.search(_text(cells[0])):
+            return cells
+    return None
+
+def _highlight_section(html):
+    """첫 하이라이트 블록부터 마지막 하이라이트 표 끝까지만 잘라 냄 (페이지의 나머지를 DOM 으로 만들지 않음)"""
+    ids = [m.start() for m in HIGHLIGHT_ID.finditer(html)]
+    if not ids: return html
+    start = html.rfind("<div", 0, ids[0])
+    end = html.find("</table>", ids[-1])
+    if start < 0 or end < 0: return html
+    return html[start:end + len("</table>")]
+
+def parse_fnguide_eps(html):
+    """SVD_Main HTML -> {'A|YYYY/MM' | 'Q|YYYY/MM': EPS}
+    pd.read_html 로 모든 표를 만드는 대신 하이라이트 표의 EPS 행과 기간 헤더만 읽는다.
+    앞 표의 값은 뒤 표(별도 재무제표)가 덮어쓰며, 숫자가 아닌 값은 ValueError (기존 동작과 동일)"""
+    section = _highlight_section(html)
+    doc = etree.fromstring(section, _parser())
+    tables = doc.xpath(HIGHLIGHT_XPATH) if doc is not None else []
+    if not tables:
+        if section is not html: doc = etree.fromstring(html, _parser())
+        tables = doc.xpath("//table") if doc is not None else []
+    merged = {}
+    for table in tables:
+        cells = _eps_row(table)
+        if cells is None: continue
+
+        head_rows = table.xpath("./thead/tr")
+        if not head_rows: continue
+        header_text = _text(table.xpath("./thead")[0])
+        tag = "Q|" if ("분기" in header_text or "Quarter" in header_text) else "A|"
+        # 마지막 헤더 행이 기간 헤더, 데이터 셀과 1:1 대응
+        periods = [_text(th) for th in _cells(head_rows[-1])]
+        values = cells[1:]
+        if len(periods) > len(values): periods = periods[-len(values):]
+
+        for period, cell in zip(periods, values):
+            date_match = DATE_PATTERN.search(period)
+            if not date_match: continue
+            val = _text(cell).replace(',', '').split('(')[0]
+            if val.strip() not in ['-', '', 'nan', 'N/A']:
+                merged[f"{tag}{date_match.group(1)}"] = int(float(val))
+    return merged
@@ -0,0 +1,119 @@
+"""공용 HTTP 클라이언트: keep-alive 풀, 호스트별 동시성/속도 제한, 지터 지수 백오프, 요청 병합
+
+  r = get_client().get(url, params=..., headers=..., timeout=10)
+"""
+import time
+import random
+import threading
+from urllib.parse import urlsplit
+from concurrent.futures import Future
+
+import requests
+from requests.adapters import HTTPAdapter
+
+USER_AGENT = 'Mozilla/5.0'
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+class HostPolicy:
+    def __init__(self, max_concurrency=8, rate=10.0, burst=None):
+        self.max_concurrency = max_concurrency
+        self.rate = rate                 # 초당 요청 수
+        self.burst = burst or max(1, int(rate))
+
+# FnGuide 는 짧은 시간에 몰리면 차단되므로 보수적으로, Yahoo 검색은 비교적 관대
+HOST_POLICIES = {
+    'comp.fnguide.com': HostPolicy(max_concurrency=4, rate=2.0, burst=4),
+    'query2.finance.yahoo.com': HostPolicy(max_concurrency=4, rate=5.0),
+    'fred.stlouisfed.org': HostPolicy(max_concurrency=4, rate=5.0),
+    'sdmx.oecd.org': HostPolicy(max_concurrency=2, rate=1.0, burst=3),
+}
+DEFAULT_POLICY = HostPolicy()
+
+class TokenBucket:
+    def __init__(self, rate, capacity):
+        self.rate, self.capacity = rate, capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+class HttpClient:
+    def __init__(self, policies=None, retries=3, backoff_base=0.5, backoff_cap=8.0, pool_size=32):
+        self.policies = dict(HOST_POLICIES if policies is None else policies)
+        self.retries, self.backoff_base, self.backoff_cap = retries, backoff_base, backoff_cap
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers['User-Agent'] = USER_AGENT
+        self._lock = threading.Lock()
+        self._hosts = {}     # host -> (Semaphore, TokenBucket)
+        self._inflight = {}  # 요청 키 -> Future (같은 URL 동시 요청은 한 번만 보냄)
+
+    def _limits(self, host):
+        with self._lock:
+            if host not in self._hosts:
+                p = self.policies.get(host, DEFAULT_POLICY)
+                self._hosts[host] = (threading.BoundedSemaphore(p.max_concurrency), TokenBucket(p.rate, p.burst))
+            return self._hosts[host]
+
+    def _backoff(self, attempt, retry_after=None):
+        if retry_after:
+            try: return min(self.backoff_cap, float(retry_after))
+            except ValueError: pass
+        # full jitter: 0 ~ min(cap, base * 2^attempt)
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+
+    def _fetch(self, url, params, headers, timeout):
+        sem, bucket = self._limits(urlsplit(url).netloc)
+        for attempt in range(self.retries + 1):
+            try:
+                with sem:
+                    bucket.acquire()
+                    r = self.session.get(url, params=params, headers=headers, timeout=timeout)
+                if r.status_code not in RETRY_STATUS or attempt == self.retries:
+                    return r
+                delay = self._backoff(attempt, r.headers.get('Retry-After'))
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.retries: raise
+                delay = self._backoff(attempt)
+            time.sleep(delay)  # 대기 중에는 동시성 슬롯을 놓아 둔다
+
+    def get(self, url, params=None, headers=None, timeout=10):
+        key = (url, tuple(sorted((params or {}).items())), tuple(sorted((headers or {}).items())))
+        with self._lock:
+            fut = self._inflight.get(key)
+            owner = fut is None
+            if owner:
+                fut = Future()
+                self._inflight[key] = fut
+        if not owner:
+            return fut.result()
+
+        try:
+            fut.set_result(self._fetch(url, params, headers, timeout))
+        except BaseException as e:
+            fut.set_exception(e)
+        finally:
+            with self._lock: self._inflight.pop(key, None)
+        return fut.result()
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_client():
+    global _client
+    with _client_lock:
+        if _client is None: _client = HttpClient()
+        return _client
@@ -1,32 +1,81 @@
 import pandas as pd
+import numpy as np
 import datetime
 
+FWD_COLUMNS = ['12M Fwd EPS', 'Growth', 'Accel']
+
 # [핵심 1] 12M Fwd EPS 계산 (월별 가중치 Rolling)
-def calculate_12m_fwd_series(q_map):
-    if not q_map: return pd.DataFrame()
-    
-    dates = pd.date_range(end=datetime.date.today(), periods=13, freq='ME')
-    trend_data = []
-
-    for d in dates:
-        fwd_eps_sum = 0
-        valid_months = 0
-        for i in range(12):
-            target_date = d + pd.DateOffset(months=i+1)
-            y = target_date.year
-            m = target_date.month
-            q = (m - 1) // 3 + 1
-            q_eps = q_map.get((y, q))
-            if q_eps is not None:
-                fwd_eps_sum += (q_eps / 3)
-                valid_months += 1
-        
-        if valid_months >= 6:
-            trend_data.append(fwd_eps_sum * (12 / valid_months))
-        else:
-            trend_data.append(0)
+def quarter_ordinal(year, q):
+    return year * 4 + (q - 1)
+
+def build_quarter_matrix(q_maps):
+    """여러 종목의 {(year, q): eps} 사전을 (N, Q) 밀집 배열로 한 번에 변환"""
+    ords = [quarter_ordinal(y, q) for m in q_maps for (y, q) in m]
+    if not ords:
+        return np.zeros((len(q_maps), 0)), np.zeros((len(q_maps), 0), dtype=bool), 0
+    base = min(ords)
+    width = max(ords) - base + 1
+    values = np.zeros((len(q_maps), width))
+    mask = np.zeros((len(q_maps), width), dtype=bool)
+    for row, m in enumerate(q_maps):
+        for (y, q), v in m.items():
+            col = quarter_ordinal(y, q) - base
+            values[row, col] = v
+            mask[row, col] = True
+    return values, mask, base
+
+def fwd_dates(periods=13, end=None):
+    return pd.date_range(end=end or datetime.date.today(), periods=periods, freq='ME')
+
+def _rolling_fwd(take, month_ords, base, width, shape):
+    """기준 월마다 다음 12개월이 속한 분기 값을 1/3 씩 누적. take(col) -> (값, 유효 여부)"""
+    fwd_sum = np.zeros(shape)
+    valid = np.zeros(shape, dtype=np.int64)
+    for i in range(12):
+        col = (month_ords + i + 1) // 3 - base
+        inside = (col >= 0) & (col < width)
+        vals, hit = take(np.clip(col, 0, width - 1))
+        hit = hit & inside
+        # 원래 루프와 같은 순서로 누적해야 결과가 비트 단위로 일치
+        fwd_sum = np.where(hit, fwd_sum + vals / 3, fwd_sum)
+        valid += hit
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scaled = fwd_sum * (12 / valid)
+    return np.where(valid >= 6, scaled, 0.0)
+
+def calculate_12m_fwd_matrix(values, mask, base, dates):
+    """(N, Q) 분기 배열 -> (N, T) 12M Fwd EPS. 유효 월이 6개 미만이면 0"""
+    n, width = values.shape
+    if width == 0: return np.zeros((n, len(dates)))
+    month_ord = (dates.year * 12 + dates.month - 1).to_numpy()
+    return _rolling_fwd(lambda col: (values[:, col], mask[:, col]), month_ord, base, width, (n, len(dates)))
+
+def calculate_12m_fwd_rows(values, mask, base, month_ords):
+    """행마다 기준 월이 다른 경우: values[r] 은 month_ords[r] 시점에 알려진 분기 배열 -> (N,) 12M Fwd EPS"""
+    n, width = values.shape
+    if width == 0: return np.zeros(n)
+    rows = np.arange(n)
+    return _rolling_fwd(lambda col: (values[rows, col], mask[rows, col]), np.asarray(month_ords), base, width, n)
 
-    return pd.DataFrame({'12M Fwd EPS': trend_data}, index=dates)
+def calculate_growth_accel(fwd):
+    """전월 대비 성장률(%)과 가속도(%p). 첫 구간은 0으로 채움"""
+    prev, curr = fwd[:, :-1], fwd[:, 1:]
+    growth = np.zeros_like(fwd)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        growth[:, 1:] = np.where(prev != 0, ((curr - prev) / np.abs(prev)) * 100, 0)
+    accel = np.zeros_like(fwd)
+    accel[:, 1:] = growth[:, 1:] - growth[:, :-1]
+    return growth, accel
+
+def calculate_12m_fwd_batch(q_maps, periods=13, end=None):
+    """{ticker: q_map} -> {'12M Fwd EPS' | 'Growth' | 'Accel': DataFrame(ticker x date)}"""
+    tickers = list(q_maps)
+    dates = fwd_dates(periods, end)
+    values, mask, base = build_quarter_matrix([q_maps[t] for t in tickers])
+    fwd = calculate_12m_fwd_matrix(values, mask, base, dates)
+    growth, accel = calculate_growth_accel(fwd)
+    return {name: pd.DataFrame(arr, index=tickers, columns=dates)
+            for name, arr in zip(FWD_COLUMNS, (fwd, growth, accel))}
 
 # [핵심 2] CLI 추세 정밀 분석 (3개월치 비교)
 def analyze_cli_trend(curr, prev, pprev):
@@ -72,30 +121,63 @@ def analyze_cli_trend(curr, prev, pprev):
                 
     return status_msg, color
 
-# [핵심 3] 데이터 우선순위 병합 (Adapter)
-def build_priority_map_kr(df_raw):
-    q_map = {}
-    if df_raw is None or df_raw.empty: return q_map
-    data_dict = df_raw.iloc[0].to_dict()
-    for k, v in data_dict.items():
-        if "A|" in str(k) and "Blended" not in str(k):
-            try:
-                yr = int(k.replace("A|", "").split('/')[0])
-                for q in range(1, 5): q_map[(yr, q)] = float(v) / 4
-            except: pass
-    for k, v in data_dict.items():
-        if "Q|" in str(k):
-            try:
-                parts = k.replace("Q|", "").split('/')
-                yr, mo = int(parts[0]), int(parts[1])
-                q_map[(yr, (mo-1)//3+1)] = float(v)
-            except: pass
-    return q_map
-
-def build_priority_map_us(past_map, est_annual, est_quarter):
-    q_map = {}
-    for yr, val in est_annual.items():
-        for q in range(1, 5): q_map[(yr, q)] = val / 4
-    for (yr, q), val in est_quarter.items(): q_map[(yr, q)] = val
-    for (yr, q), val in past_map.items(): q_map[(yr, q)] = val
-    return q_map
\ No newline at end of file
+# analyze_cli_trend 의 8개 국면 (코드 순서 = 아래 벡터 분류 코드)
+CLI_REGIMES = [
+    ("🚀 회복 가속 (바닥 탈출 강력)", "green"),
+    ("📈 회복 중 (속도 둔화)", "blue"),
+    ("📉 하락폭 축소 (바닥 근접)", "orange"),
+    ("❄️ 침체 심화 (하락 가속)", "red"),
+    ("🔥 호황 가속 (과열 주의)", "red"),
+    ("☁️ 확장 중 (탄력 둔화)", "orange"),
+    ("☔️ 둔화 가속 (본격 하락)", "blue"),
+    ("📉 완만한 조정", "gray"),
+]
+
+def classify_cli_array(cli):
+    """CLI 배열 (..., T) 전체 이력을 한 번에 국면 코드(0~7)로 분류.
+    앞의 두 시점과 최근 3개월 중 결측(NaN)이 있는 시점은 -1 (NaN 은 모든 비교에서 거짓이라 7 로 떨어지지 않게)"""
+    cli = np.asarray(cli, dtype=float)
+    codes = np.full(cli.shape, -1, dtype=np.int8)
+    if cli.shape[-1] < 3: return codes
+
+    curr, prev, pprev = cli[..., 2:], cli[..., 1:-1], cli[..., :-2]
+    diff_now, diff_prev = curr - prev, prev - pprev
+    rising = diff_now > 0
+    low = np.where(rising, np.where(diff_now > diff_prev, 0, 1), np.where(diff_now > diff_prev, 2, 3))
+    high = np.where(rising, np.where(diff_now > diff_prev, 4, 5), np.where(diff_now < diff_prev, 6, 7))
+    known = ~(np.isnan(curr) | np.isnan(prev) | np.isnan(pprev))
+    codes[..., 2:] = np.where(known, np.where(curr <= 100, low, high), -1)
+    return codes
+
+def classify_cli_history(cli_df):
+    """월 x 국가 CLI DataFrame -> 같은 모양의 국면 코드 DataFrame (국가별 결측은 건너뛰고 분류)"""
+    codes = pd.DataFrame(-1, index=cli_df.index, columns=cli_df.columns, dtype=np.int8)
+    values = cli_df.to_numpy(dtype=float)
+    valid = ~np.isnan(values)
+    if valid.all():  # 보통은 결측이 없으므로 한 번의 배열 연산
+        codes[:] = classify_cli_array(values.T).T
+        return codes
+    for j, col in enumerate(cli_df.columns):
+        rows = np.flatnonzero(valid[:, j])
+        codes.iloc[rows, j] = classify_cli_array(values[rows, j])
+    return codes
+
+def cli_regime_share(codes):
+    """국가별 국면 체류 비율(%) -> 국가 x 국면 메시지 DataFrame"""
+    counts = np.stack([(codes.to_numpy() == k).sum(axis=0) for k in range(len(CLI_REGIMES))], axis=1)
+    total = counts.sum(axis=1, keepdims=True)
+    share = np.divide(counts * 100.0, total, out=np.zeros(counts.shape), where=total > 0)
+    return pd.DataFrame(share, index=codes.columns, columns=[msg for msg, _ in CLI_REGIMES])
+
+# [핵심 3] 매매 신호 판정 (Fwd EPS 방향 + 가속도 부호)
+TRADE_SIGNALS = ["적극 매수 (성장 가속)", "소극 대응 (탄력 둔화)", "매도/관망 (역성장)"]
+
+def classify_trade_signal(fwd_val, eps_prev, accel_val):
+    if fwd_val > eps_prev:
+        if accel_val > 0: return TRADE_SIGNALS[0]
+        return TRADE_SIGNALS[1]
+    return TRADE_SIGNALS[2]
+
+def classify_trade_signal_codes(fwd, prev, accel):
+    """classify_trade_signal 의 배열 버전 -> TRADE_SIGNALS 인덱스 배열"""
+    return np.where(fwd > prev, np.where(accel > 0, 0, 1), 2)
@@ -0,0 +1,160 @@
+import os
+import time
+import datetime
+import threading
+from io import StringIO
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from recorder import http_get
+
+MACRO_DIR = os.getenv("MACRO_CACHE_DIR", os.path.join("data", "macro"))
+REFRESH_AFTER = 3600
+FRED_LOOKBACK_DAYS = 1000
+# 원천이 최근 값을 수정하므로 갱신할 때마다 마지막 관측치 이전 구간도 다시 받아 덮어씀
+CLI_REVISION_MONTHS = 6       # OECD CLI 는 최근 몇 달을 매달 다시 추정
+FRED_REVISION_DAYS = 14
+
+FRED_URL = "https://fred.stlouisfed.org/graph/fredgraph.csv"
+# 국가 코드를 '+' 로 이어 붙이면 한 번의 SDMX 요청으로 여러 나라를 받는다
+OECD_CLI_URL = ("https://sdmx.oecd.org/public/rest/data/OECD.SDD.STES,DSD_STES@DF_CLI/"
+                "{codes}.M.LI...AA...H")
+
+# 캐시 이름 -> 원천 시리즈 코드
+FRED_SERIES = {'T10Y2Y': 'T10Y2Y', 'BAMLH0A0HYM2': 'BAMLH0A0HYM2'}
+CLI_SERIES = {'미국_CLI': 'USA', '한국_CLI': 'KOR', '일본_CLI': 'JPN', '중국_CLI': 'CHN',
+              '독일_CLI': 'DEU', '영국_CLI': 'GBR', '프랑스_CLI': 'FRA', '인도_CLI': 'IND'}
+CLI_CACHE = 'CLI'
+
+# -----------------------------------------------------------
+# 1. 원격 호출 (recorder 로 녹화/재생)
+# -----------------------------------------------------------
+def http_get_text(key, url, params=None, timeout=10):
+    """key: 녹화 파일 이름. 증분 요청이어도 같은 녹화본을 재생하고 날짜는 아래에서 거른다"""
+    r = http_get(url, params=params, timeout=timeout, namespace="macro", key=key)
+    r.raise_for_status()
+    return r.text
+
+def fetch_fred(series_id, start):
+    text = http_get_text(f"fred_{series_id}", FRED_URL,
+                         {'id': series_id, 'cosd': start.strftime('%Y-%m-%d')})
+    df = pd.read_csv(StringIO(text), na_values='.')
+    s = pd.Series(df.iloc[:, 1].to_numpy(dtype=float), index=pd.to_datetime(df.iloc[:, 0]), name=series_id)
+    return s[s.index >= pd.Timestamp(start)].dropna().to_frame()
+
+def fetch_oecd_cli(series, start=None):
+    """series: {컬럼 이름: 국가 코드} -> 월 x 국가 DataFrame (SDMX 요청 1회)"""
+    params = {'dimensionAtObservation': 'AllDimensions', 'format': 'csvfilewithlabels'}
+    if start is not None: params['startPeriod'] = start.strftime('%Y-%m')
+    codes = "+".join(series.values())
+    text = http_get_text("oecd_cli", OECD_CLI_URL.format(codes=codes), params)
+    df = pd.read_csv(StringIO(text))
+    df['TIME_PERIOD'] = pd.to_datetime(df['TIME_PERIOD'])
+    wide = df.pivot_table(index='TIME_PERIOD', columns='REF_AREA', values='OBS_VALUE', aggfunc='last')
+    wide = wide.rename(columns={code: name for name, code in series.items()})
+    wide = wide.reindex(columns=[n for n in series if n in wide.columns]).sort_index().astype(float)
+    wide.columns.name = None
+    return wide[wide.index >= pd.Timestamp(start)] if start is not None else wide
+
+# -----------------------------------------------------------
+# 2. 로컬 파일 캐시 (마지막 관측치 이후만 추가 요청)
+# -----------------------------------------------------------
+class MacroStore:
+    def __init__(self, cache_dir=MACRO_DIR, refresh_after=REFRESH_AFTER, cli_series=None):
+        self.cache_dir = cache_dir
+        self.refresh_after = refresh_after
+        self.cli_series = dict(cli_series or CLI_SERIES)
+        self._refreshing = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def names(self):
+        return list(FRED_SERIES) + [CLI_CACHE]
+
+    def _path(self, name):
+        return os.path.join(self.cache_dir, f"{name}.csv")
+
+    def load_cached(self, name):
+        path = self._path(name)
+        if not os.path.exists(path): return None
+        return pd.read_csv(path, index_col=0, parse_dates=True)
+
+    def is_stale(self, name):
+        path = self._path(name)
+        return not os.path.exists(path) or time.time() - os.path.getmtime(path) > self.refresh_after
+
+    def _update_cli(self, cached):
+        """국가별로 완결 여부를 따짐: 이력이 있는 나라는 수정 구간만, 없는 나라(신규 추가,
+        또는 지난 응답에서 빠진 나라)만 전체 이력을 받음. 응답에서 또 빠지면 다음 갱신 때 그 나라만 재시도"""
+        have = {} if cached is None else {n: c for n, c in self.cli_series.items()
+                                         if n in cached.columns and cached[n].notna().any()}
+        missing = {n: c for n, c in self.cli_series.items() if n not in have}
+        parts = []
+        if have:
+            parts.append(fetch_oecd_cli(have, cached.index[-1] - pd.DateOffset(months=CLI_REVISION_MONTHS)))
+        if missing:
+            parts.append(fetch_oecd_cli(missing))
+        new = pd.concat(parts, axis=1, sort=True) if parts else pd.DataFrame()
+        merged = new if cached is None else new.combine_first(cached)  # 다시 받은 구간은 새 값이 우선
+        order = [n for n in self.cli_series if n in merged.columns]
+        return merged[order + [c for c in merged.columns if c not in order]].sort_index()
+
+    def update_series(self, name):
+        cached = self.load_cached(name)
+        if cached is not None and cached.empty: cached = None
+        if name == CLI_CACHE:
+            merged = self._update_cli(cached)
+        else:
+            start = (cached.index[-1] - pd.Timedelta(days=FRED_REVISION_DAYS) if cached is not None else
+                     datetime.datetime.now() - datetime.timedelta(days=FRED_LOOKBACK_DAYS))
+            new = fetch_fred(FRED_SERIES[name], start)
+            merged = new if cached is None else pd.concat([cached, new])
+            merged = merged[~merged.index.duplicated(keep='last')].sort_index()  # 다시 받은 구간은 새 값이 우선
+
+        tmp = self._path(name) + ".tmp"
+        merged.to_csv(tmp)
+        os.replace(tmp, self._path(name))  # 변경이 없어도 mtime 갱신 -> 다음 갱신 시점 계산
+        return merged
+
+    def refresh(self, names=None):
+        """여러 시리즈를 동시에 갱신. 실패한 시리즈는 기존 캐시 유지"""
+        names = list(names or self.names())
+        with ThreadPoolExecutor(max_workers=len(names), thread_name_prefix="macro") as pool:
+            futures = {name: pool.submit(self.update_series, name) for name in names}
+        for name, fut in futures.items():
+            if fut.exception() is not None:
+                print(f"{name} 로딩 실패: {fut.exception()}")
+
+    def refresh_in_background(self):
+        if not self._refreshing.acquire(blocking=False): return  # 이미 갱신 중
+        def run():
+            try: self.refresh()
+            finally: self._refreshing.release()
+        threading.Thread(target=run, name="macro-refresh", daemon=True).start()
+
+    def load(self):
+        """(금리차, 하이일드, CLI) 반환. 캐시가 없으면 동시에 받아오고,
+        오래된 캐시는 즉시 돌려준 뒤 백그라운드에서 갱신(stale-while-revalidate)"""
+        missing = [n for n in self.names() if self.load_cached(n) is None]
+        if missing:
+            with self._refreshing: self.refresh(missing)
+        if any(self.is_stale(n) for n in self.names()):
+            self.refresh_in_background()
+
+        cutoff = pd.Timestamp(datetime.datetime.now() - datetime.timedelta(days=FRED_LOOKBACK_DAYS))
+        fred = {}
+        for name in FRED_SERIES:
+            df = self.load_cached(name)
+            fred[name] = df[df.index >= cutoff] if df is not None else pd.DataFrame()
+
+        cli = self.load_cached(CLI_CACHE)
+        return fred['T10Y2Y'], fred['BAMLH0A0HYM2'], cli if cli is not None else pd.DataFrame()
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_macro_store():
+    global _store
+    with _store_lock:
+        if _store is None: _store = MacroStore()
+        return _store
@@ -1,36 +1,77 @@
 import streamlit as st
-import matplotlib.pyplot as plt
-import os
-import yfinance as yf
+import json
+import time
+import uuid
+import pandas as pd
 
 # 커스텀 모듈 임포트
-from data_loader import get_macro_data, get_unified_data, find_ticker
-from logic import analyze_cli_trend
-from ai_analyst import ask_ai
+from data_loader import get_macro_data, get_unified_data, find_ticker, suggest_tickers, get_last_price
+from signals import evaluate_macro, evaluate_ticker
+from logic import CLI_REGIMES, classify_cli_history, cli_regime_share
+from batch import load_results, RESULTS_PATH
+from ai_analyst import start_ai
+from telemetry import span_stats, cache_stats, prometheus_text, snapshot, start_metrics_server
+from screener import screen_universe, rank_results, parse_watchlist, krx_universe
+from monitor import get_monitor, stop_monitor
+from sensitivity import ticker_sensitivity, SIGMA
+from warmup import start_warmup
+from peer_rank import get_peer_ranks, market_sector, MIN_PEERS
+
+SCREEN_REFRESH_ROWS = 50     # 스크리너 표는 이만큼 종목이 끝나거나
+SCREEN_REFRESH_SECS = 1.0    # 이 시간이 지났을 때만 다시 그림 (마지막에 한 번 더)
 
 # 페이지 설정
 st.set_page_config(page_title="Global EPS Trader", page_icon="📈", layout="wide")
+start_metrics_server()  # TELEMETRY_PORT 가 설정된 경우에만 /metrics 제공
+start_warmup()          # 프로세스당 한 번, 매크로/KRX 색인/인기 종목 캐시를 백그라운드로 미리 채움
+st.session_state.setdefault('monitor_owner', uuid.uuid4().hex)  # 세션별 모니터 소유자 (다른 세션의 모니터를 멈추지 않도록)
 
-if os.name == 'posix': plt.rcParams['font.family'] = 'AppleGothic'
-else: plt.rcParams['font.family'] = 'Malgun Gothic'
-plt.rcParams['axes.unicode_minus'] = False
-plt.style.use('ggplot')
 
 # Sidebar
 with st.sidebar:
     st.image("https://cdn-icons-png.flaticon.com/512/2910/2910312.png", width=50)
     st.header("Global EPS Trader")
     st.info("AI 기반 퀀트 분석 포트폴리오")
-    user_input = st.text_input("종목명 또는 티커", "삼성전자")
-    run = st.button("🚀 분석 실행", type="primary")
+    mode = st.radio("모드", ["단일 종목", "스크리너"], horizontal=True)
+    run, screen_run, show_batch, watch_on = False, False, False, False
+    if mode == "단일 종목":
+        user_input = st.text_input("종목명 또는 티커", "삼성전자")
+        run = st.button("🚀 분석 실행", type="primary")
+    else:
+        watchlist = st.text_area("관심 종목 (줄바꿈/쉼표 구분)", "삼성전자\nSK하이닉스\n현대차\nNVDA\nAAPL")
+        use_krx = st.checkbox("KRX 전체 종목 스크리닝")
+        workers = st.slider("동시 요청 수", 1, 32, 8)
+        per_timeout = st.number_input("종목별 제한 시간(초)", 5, 120, 20)
+        screen_run = st.button("🔎 스크리닝 실행", type="primary")
+        show_batch = st.button("📦 야간 배치 결과 보기")
+        watch_on = st.toggle("👀 관심 종목 모니터 (백그라운드 폴링 + 신호 알림)")
     st.markdown("---")
+    show_diag = st.checkbox("🩺 진단 패널 (구간 시간/캐시 적중)")
+    diag_box = st.container()
     with st.expander("📊 로직 가이드"):
         st.markdown("""
         **1. 12M Fwd EPS**: Rolling Sum 방식
         **2. 가속도(2차 미분)**: 성장 속도의 변화
-        **3. 매크로**: 국가별(KR/US) CLI 국면 분석
+        **3. 매크로**: 국가별 CLI 국면 분석 (KR/US 신호 + 주요국 이력)
         """)
 
+# 진단 패널 (스크립트 끝, 또는 stop_run() 의 조기 종료 직전에 이번 실행까지 반영해 그림)
+def render_diagnostics():
+    with diag_box:
+        spans = pd.DataFrame.from_dict(span_stats(), orient='index')
+        caches = pd.DataFrame.from_dict(cache_stats(), orient='index')
+        st.caption("구간 시간 (ms)")
+        if not spans.empty: st.dataframe(spans.round(1))
+        st.caption("캐시 적중")
+        if not caches.empty: st.dataframe(caches.round(3))
+        st.download_button("JSON 내보내기", json.dumps(snapshot(), ensure_ascii=False), "telemetry.json")
+        st.download_button("Prometheus 텍스트", prometheus_text(), "metrics.txt")
+
+def stop_run():
+    """조기 종료 지점용 st.stop(): 진단 패널을 먼저 그려 빈 사이드바로 끝나지 않게 함"""
+    if show_diag: render_diagnostics()
+    st.stop()
+
 st.title("📈 AI Quantitative Analyst Portfolio")
 st.markdown("##### :gray[Macro-Driven & Earnings Acceleration Strategy]")
 
@@ -38,30 +79,11 @@ st.markdown("##### :gray[Macro-Driven & Earnings Acceleration Strategy]")
 # 1. Macro Dashboard (항상 표시됨)
 # -----------------------------------------------------------------------------
 y_c, h_s, cli = get_macro_data()
-y_val, h_val = 0, 0
-bond_risk_msg = "안정"
-
-if not y_c.empty: y_val = y_c.iloc[-1,0]
-if not h_s.empty: h_val = h_s.iloc[-1,0]
-
-if y_val < 0 and h_val >= 6.0: bond_risk_msg = "🚨 [심각] 금융 위기 (강력 매도)"
-elif y_val < 0: bond_risk_msg = "⚠️ [주의] 경기 침체 시그널"
-
-u_msg, u_col, u_val_str = "로딩 중", "gray", "-"
-k_msg, k_col, k_val_str = "로딩 중", "gray", "-"
-
-if not cli.empty:
-    if '미국_CLI' in cli.columns:
-        u = cli['미국_CLI'].dropna()
-        if len(u) >= 3:
-            u_msg, u_col = analyze_cli_trend(u.iloc[-1], u.iloc[-2], u.iloc[-3])
-            u_val_str = f"{u.iloc[-1]:.2f}"
-    
-    if '한국_CLI' in cli.columns:
-        k = cli['한국_CLI'].dropna()
-        if len(k) >= 3:
-            k_msg, k_col = analyze_cli_trend(k.iloc[-1], k.iloc[-2], k.iloc[-3])
-            k_val_str = f"{k.iloc[-1]:.2f}"
+macro = evaluate_macro(y_c, h_s, cli)
+y_val, h_val, bond_risk_msg = macro.y_val, macro.h_val, macro.bond_risk_msg
+us_cli, kr_cli = macro.cli_for("US"), macro.cli_for("KR")
+u_msg, u_col, u_val_str = us_cli.msg, us_cli.color, us_cli.value_str
+k_msg, k_col, k_val_str = kr_cli.msg, kr_cli.color, kr_cli.value_str
 
 m1, m2, m3, m4 = st.columns(4)
 m1.metric("장단기 금리차", f"{y_val:.2f}%p", delta="위험" if y_val<0 else "정상", delta_color="inverse")
@@ -71,6 +93,23 @@ m4.metric("🇰🇷 한국 CLI", k_val_str)
 
 st.caption(f"📊 매크로 진단: **미국 :{u_col}[{u_msg}]** / **한국 :{k_col}[{k_msg}]** / **채권 시장 {bond_risk_msg}**")
 
+if not cli.empty:
+    with st.expander("🌍 CLI 국면 이력 (전 국가)"):
+        cli_codes = classify_cli_history(cli)
+        regime_name = lambda c: CLI_REGIMES[c][0] if c >= 0 else "-"
+        latest = pd.DataFrame([
+            {'국가': col, 'CLI': round(cli[col].dropna().iloc[-1], 2),
+             '현재 국면': regime_name(cli_codes[col][cli[col].notna()].iloc[-1])}
+            for col in cli.columns if cli[col].notna().any()]).set_index('국가')
+        st.dataframe(latest)
+        st.line_chart(cli)
+        st.caption("국면 체류 비율 (%)")
+        st.dataframe(cli_regime_share(cli_codes).round(1))
+        st.caption("월별 국면 이력")
+        history = cli_codes.tail(24).apply(lambda col: col.map(regime_name))
+        history.index = history.index.strftime('%Y-%m')
+        st.dataframe(history.iloc[::-1])
+
 # -----------------------------------------------------------------------------
 # 2. Analysis Execution (종목 분석)
 # -----------------------------------------------------------------------------
@@ -91,41 +130,23 @@ if run:
         if trend_df is None or trend_df.empty or len(trend_df) < 2:
             st.error(f"❌ '{ticker}'에 대한 재무 데이터를 찾을 수 없습니다.")
             st.warning("티커(Ticker) 또는 정확한 종목명을 입력해주세요.")
-            st.stop()
-
-        # 4. 현재 주가 가져오기 (에러 방어 로직)
-        curr_p = 0
-        try: 
-            stock_data = yf.Ticker(ticker).history(period='1d')
-            if not stock_data.empty:
-                curr_p = stock_data['Close'].iloc[-1]
-        except: 
-            pass # 일시적 오류 시 앱이 멈추지 않고 넘어감
+            suggestions = suggest_tickers(user_input)
+            if suggestions:
+                st.info("혹시 찾으시는 종목: " + ", ".join(f"{n} ({t})" for n, t, _ in suggestions))
+            stop_run()
+
+        # 4. 현재 주가 가져오기 (에러 시 0)
+        curr_p = get_last_price(ticker)
             
         p_fmt = f"${curr_p:,.2f}" if country=="US" else f"{curr_p:,.0f}원"
         
-        # 변수 계산
-        fwd_val = trend_df.iloc[-1, 0]
-        eps_prev = trend_df.iloc[-2, 0]
-        eps_pprev = trend_df.iloc[-3, 0] if len(trend_df) >= 3 else eps_prev
-        
-        growth_now = ((fwd_val - eps_prev) / abs(eps_prev)) * 100 if eps_prev != 0 else 0
-        growth_prev = ((eps_prev - eps_pprev) / abs(eps_pprev)) * 100 if eps_pprev != 0 else 0
-        
-        growth_val = growth_now
-        accel_val = growth_now - growth_prev
+        # 신호 계산 (signals 라이브러리 - 배치/스크리너와 같은 로직)
+        result = evaluate_ticker(ticker, name, country, trend_df, macro, df_ui)
+        fwd_val, growth_val, accel_val = result.fwd_eps, result.growth, result.accel
+        trade_signal, target_cli_msg = result.trade_signal, result.cli_msg
         
-        # 신호 판정
-        if fwd_val > eps_prev:
-            if accel_val > 0: trade_signal = "적극 매수 (성장 가속)"
-            else: trade_signal = "소극 대응 (탄력 둔화)"
-        else:
-            trade_signal = "매도/관망 (역성장)"
-        
-        target_cli_msg = k_msg if country == "KR" else u_msg
-        
-        # AI Opinion
-        ai_res = ask_ai(ticker, name, fwd_val, growth_val, f"{accel_val:+.2f}%p", bond_risk_msg, target_cli_msg, trade_signal)
+        # AI Opinion (LLM 호출을 먼저 시작하고, 지표/차트를 그리는 동안 응답을 받음)
+        ai_job = start_ai(ticker, name, fwd_val, growth_val, f"{accel_val:+.2f}%p", bond_risk_msg, target_cli_msg, trade_signal)
         
         # 결과 출력
         st.subheader(f"{name} ({ticker}) 분석 결과")
@@ -135,12 +156,103 @@ if run:
         c3.metric("성장률 (Speed)", f"{growth_val:+.2f}%", delta="증가" if growth_val>0 else "감소")
         c4.metric("가속도 (Accel)", f"{accel_val:+.2f}%p", delta="가속" if accel_val>0 else "감속")
         
-        with st.chat_message("assistant"): st.write(ai_res)
+        # 신호 민감도 (추정치 ±충격 시나리오, 배열 한 번으로 계산)
+        sens = ticker_sensitivity(ticker, trend_df, seed=0)
+        if sens is not None:
+            st.caption(f"🎲 신호 유지 확률 **{sens.stability:.0%}** "
+                       f"(추정치 σ={SIGMA:.0%} 충격 {sens.n:,}개 시나리오, 기준: {sens.base_signal})")
+        
+        # 동종 비교 (야간 배치 전체 결과 기준 백분위, 이 종목 값만 바꾼 것처럼 조회 - 공유 목록은 그대로)
+        peer_ranks = get_peer_ranks()
+        if len(peer_ranks):
+            peers = peer_ranks.rank(ticker, *market_sector(ticker, country), growth_val, accel_val)
+            labels = {'Growth': "성장률", 'Accel': "가속도"}
+            parts = [f"{p.group} {p.n}종목 중 " + " · ".join(f"{labels[m]} 백분위 {p.pct[m]:.0f} (z {p.z[m]:+.1f})"
+                                                           for m in labels if m in p.pct)
+                     for p in peers.values() if p.n >= MIN_PEERS and p.pct]
+            if parts: st.caption("🏁 동종 비교: " + " / ".join(parts))
+        
+        ai_box = st.container()
         
         st.subheader("📊 12개월 선행 EPS 추세선")
-        chart_data = trend_df.copy()
+        chart_data = trend_df[['12M Fwd EPS']].copy()
         chart_data.index = chart_data.index.strftime('%Y.%m')
         st.line_chart(chart_data)
         
+        if sens is not None:
+            with st.expander("🎲 신호 민감도 (추정치 충격 시나리오)"):
+                s1, s2 = st.columns(2)
+                s1.caption("신호별 확률 (%)")
+                s1.dataframe(sens.to_frame().round(1))
+                s2.caption("마지막 시점 분포 (5% / 50% / 95%)")
+                s2.dataframe(pd.DataFrame({'12M Fwd EPS': sens.fwd, 'Growth': sens.growth, 'Accel': sens.accel}).T.round(2))
+                grid = ticker_sensitivity(ticker, trend_df, mode='grid')
+                st.caption("충격 격자: 근접 4분기(행) x 이후 분기(열)")
+                st.dataframe(grid.grid)
+
         with st.expander("📋 원본 데이터 확인"):
             if not df_ui.empty: st.dataframe(df_ui.T)
+
+        with ai_box:
+            with st.chat_message("assistant"): st.write_stream(ai_job.chunks())
+
+# -----------------------------------------------------------------------------
+# 3. Screener (batch.py 가 미리 계산해 둔 결과는 그대로 표시)
+# -----------------------------------------------------------------------------
+if show_batch:
+    st.divider()
+    batch_df = load_results()
+    if batch_df is None:
+        st.warning(f"배치 결과가 없습니다. `python batch.py --universe krx` 로 생성하세요. ({RESULTS_PATH})")
+    else:
+        st.subheader(f"📦 야간 배치 결과 ({batch_df['AsOf'].iloc[0] if len(batch_df) else '-'})")
+        st.dataframe(batch_df)
+
+# -----------------------------------------------------------------------------
+# 3-1. Screener (관심 종목 / KRX 전체 EPS 가속도 랭킹)
+# -----------------------------------------------------------------------------
+if screen_run:
+    st.divider()
+    targets = krx_universe() if use_krx else parse_watchlist(watchlist)
+    if not targets:
+        st.warning("스크리닝할 종목이 없습니다.")
+        stop_run()
+
+    st.subheader(f"🔎 EPS 가속도 스크리너 ({len(targets)}종목)")
+    progress = st.progress(0.0)
+    table = st.empty()
+    rows = []
+    shown_at, shown_rows = time.monotonic(), 0
+    for row in screen_universe(targets, max_workers=workers, timeout=per_timeout):
+        rows.append(row)
+        # 매 종목마다 전체를 정렬/렌더링하면 KRX 전체에서 O(n²) -> N 종목 또는 T 초마다만 갱신
+        if len(rows) - shown_rows >= SCREEN_REFRESH_ROWS or time.monotonic() - shown_at >= SCREEN_REFRESH_SECS:
+            progress.progress(len(rows) / len(targets), text=f"{len(rows)}/{len(targets)} 완료")
+            table.dataframe(rank_results(rows), use_container_width=True)
+            shown_at, shown_rows = time.monotonic(), len(rows)
+    progress.progress(1.0, text=f"{len(rows)}/{len(targets)} 완료")
+    table.dataframe(rank_results(rows), use_container_width=True)
+
+# -----------------------------------------------------------------------------
+# 3-2. Watchlist Monitor (입력이 바뀐 종목만 재계산, 신호/채권 위험 전환 시 토스트)
+# -----------------------------------------------------------------------------
+if watch_on:
+    st.divider()
+    st.subheader("👀 관심 종목 모니터")
+    watch_monitor = get_monitor(parse_watchlist(watchlist), owner=st.session_state['monitor_owner'])
+    if st.session_state.get('alert_monitor') is not watch_monitor:  # 다른 모니터로 바뀌면 알림 번호도 처음부터
+        st.session_state['alert_monitor'], st.session_state['alert_seq'] = watch_monitor, 0
+
+    @st.fragment(run_every=15)
+    def render_monitor():
+        alerts, st.session_state['alert_seq'] = watch_monitor.alerts_since(st.session_state.get('alert_seq', 0))
+        for alert in alerts: st.toast(alert.text())
+        st.caption(f"매크로: {watch_monitor.macro.bond_risk_msg} · 폴링/변경/재계산 "
+                   f"{watch_monitor.stats['estimate_polls']}/{watch_monitor.stats['estimate_changes']}/"
+                   f"{watch_monitor.stats['recomputed']}")
+        st.dataframe(watch_monitor.table())
+    render_monitor()
+elif mode == "스크리너":
+    stop_monitor(owner=st.session_state['monitor_owner'])
+
+if show_diag: render_diagnostics()
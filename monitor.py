@@ -0,0 +1,322 @@
+"""관심 종목 모니터 (asyncio): 매크로/추정치/가격을 각자 주기로 폴링하고,
+입력이 실제로 바뀐 종목만 다시 계산해 신호나 채권 위험이 뒤집히면 알림
+
+  python monitor.py --tickers "삼성전자,NVDA,AAPL" --webhook https://example.com/hook
+
+추정치는 종목마다 폴링 간격이 따로 있어, 변화가 없으면 두 배씩 늘리고 바뀌면 최소 간격으로 되돌린다.
+그래서 한가할 때의 요청 수는 관심 종목 수가 아니라 데이터가 바뀌는 빈도를 따라간다.
+"""
+import os
+import time
+import heapq
+import asyncio
+import hashlib
+import argparse
+import datetime
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
+from typing import Optional
+
+import pandas as pd
+
+import signals
+from screener import parse_watchlist
+from telemetry import span
+
+MACRO_INTERVAL = 600
+PRICE_INTERVAL = 300
+EST_MIN_INTERVAL = 900        # 추정치가 바뀐 직후 폴링 간격
+EST_MAX_INTERVAL = 6 * 3600   # 변화가 없으면 두 배씩 늘려 여기까지
+MAX_CONCURRENCY = 4
+WEBHOOK_URL = os.getenv("MONITOR_WEBHOOK_URL")
+
+def fingerprint(obj):
+    return hashlib.sha1(repr(obj).encode("utf-8")).hexdigest()
+
+@dataclass
+class Alert:
+    kind: str          # 'signal' | 'bond'
+    ticker: str
+    old: str
+    new: str
+    at: str = field(default_factory=lambda: datetime.datetime.now().isoformat(timespec='seconds'))
+
+    def text(self):
+        label = "채권 시장" if self.kind == 'bond' else self.ticker
+        return f"🔔 {label}: {self.old} → {self.new}"
+
+@dataclass
+class Watch:
+    ticker: str
+    name: str
+    country: str
+    layers: dict = field(default_factory=dict, repr=False)
+    layers_fp: Optional[str] = None
+    trend: Optional[pd.DataFrame] = field(default=None, repr=False)
+    signal: Optional[signals.TickerSignal] = field(default=None, repr=False)
+    close: Optional[float] = None
+    interval: float = EST_MIN_INTERVAL
+
+    def to_row(self):
+        row = {'Ticker': self.ticker, 'Name': self.name, 'Country': self.country, 'Close': self.close}
+        if self.signal is not None:
+            row.update({'12M Fwd EPS': self.signal.fwd_eps, 'Growth': self.signal.growth,
+                        'Accel': self.signal.accel, 'Signal': self.signal.trade_signal, 'CLI': self.signal.cli_msg})
+        row['Next Poll (s)'] = int(self.interval)
+        return row
+
+def normalize_targets(targets):
+    return [(t, t, None) if isinstance(t, str) else tuple(t) for t in targets]
+
+# -----------------------------------------------------------
+# 1. 알림 전달 (로그 / 웹훅 / UI 는 alerts_since 로 가져감)
+# -----------------------------------------------------------
+def log_sink(alert):
+    print(f"[{alert.at}] {alert.text()}", flush=True)
+
+def webhook_sink(url):
+    def send(alert):
+        from http_client import get_client
+        try:
+            get_client().session.post(url, json=asdict(alert), timeout=5)
+        except Exception as e:
+            print(f"⚠️ 웹훅 전송 실패: {e}")
+    return send
+
+# -----------------------------------------------------------
+# 2. 모니터
+# -----------------------------------------------------------
+class Monitor:
+    def __init__(self, targets, sinks=None, macro_interval=MACRO_INTERVAL, price_interval=PRICE_INTERVAL,
+                 est_min_interval=EST_MIN_INTERVAL, est_max_interval=EST_MAX_INTERVAL,
+                 concurrency=MAX_CONCURRENCY):
+        self.targets = normalize_targets(targets)
+        self.sinks = list(sinks if sinks is not None else [log_sink])
+        self.macro_interval, self.price_interval = macro_interval, price_interval
+        self.est_min_interval, self.est_max_interval = est_min_interval, est_max_interval
+        self.concurrency = concurrency
+        self.macro = signals.MacroState()
+        self.watches = {}            # ticker -> Watch
+        self.stats = {'estimate_polls': 0, 'estimate_changes': 0, 'recomputed': 0, 'macro_changes': 0}
+        self._macro_fp = None
+        self._dirty = {}             # ticker -> 추세까지 다시 계산해야 하면 True (매크로만 바뀌면 False)
+        self._due = []               # (다음 폴링 시각, ticker) 힙
+        self._wake, self._due_changed = asyncio.Event(), asyncio.Event()  # 재계산 필요 / 폴링 일정 변경
+        self._alerts = deque(maxlen=500)
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._loop = self._task = None
+        # 웹훅 등 느린 전달이 폴링 루프를 막지 않도록 별도 스레드 하나에서 순서대로 전달
+        self._sink_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="monitor-sink")
+
+    # ---------- 알림 ----------
+    def _alert(self, kind, ticker, old, new):
+        alert = Alert(kind, ticker, old, new)
+        with self._lock:
+            self._seq += 1
+            self._alerts.append((self._seq, alert))
+        self._sink_pool.submit(self._deliver, alert)
+
+    def _deliver(self, alert):
+        for sink in self.sinks:
+            try: sink(alert)
+            except Exception as e: print(f"⚠️ 알림 전달 실패: {e}")
+
+    def alerts_since(self, seq=0):
+        """seq 이후의 알림과 새 seq (UI 세션마다 따로 읽음)"""
+        with self._lock:
+            return [a for s, a in self._alerts if s > seq], self._seq
+
+    def table(self):
+        return pd.DataFrame([w.to_row() for w in self.watches.values()])
+
+    def _mark(self, ticker, retrend):
+        self._dirty[ticker] = self._dirty.get(ticker, False) or retrend
+        self._wake.set()
+
+    def _schedule(self, ticker, at):
+        heapq.heappush(self._due, (at, ticker))
+        self._due_changed.set()
+
+    # ---------- 폴링 루프 ----------
+    async def _resolve(self):
+        from data_loader import find_ticker
+        for ticker, name, country in self.targets:
+            if country is None:
+                try:
+                    ticker, name, country = await asyncio.to_thread(find_ticker, ticker)
+                except Exception as e:
+                    print(f"⚠️ {ticker} 종목 검색 실패: {e}")
+                    continue
+            if country is None or ticker in self.watches: continue
+            self.watches[ticker] = Watch(ticker, name, country, interval=self.est_min_interval)
+            self._schedule(ticker, 0.0)
+
+    async def macro_loop(self):
+        from macro_store import get_macro_store
+        while True:
+            try:
+                y_c, h_s, cli = await asyncio.to_thread(get_macro_store().load)
+                fp = fingerprint([df.tail(3).to_numpy().tolist() for df in (y_c, h_s, cli)])
+                if fp != self._macro_fp:
+                    with span("monitor.macro"):
+                        new = signals.evaluate_macro(y_c, h_s, cli)
+                    old, self.macro, first = self.macro, new, self._macro_fp is None
+                    self._macro_fp = fp
+                    self.stats['macro_changes'] += 1
+                    if not first and new.bond_risk_msg != old.bond_risk_msg:
+                        self._alert('bond', "-", old.bond_risk_msg, new.bond_risk_msg)
+                    # CLI 국면이 바뀐 나라의 종목만 다시 평가 (추정치는 그대로 재사용)
+                    changed = {c for c in signals.CLI_NAMES if new.cli_for(c) != old.cli_for(c)}
+                    for w in self.watches.values():
+                        if w.country in changed and w.trend is not None: self._mark(w.ticker, False)
+            except Exception as e:
+                print(f"⚠️ 매크로 폴링 실패: {e}")
+            await asyncio.sleep(self.macro_interval)
+
+    async def _poll_estimates(self, w, sem):
+        from data_loader import fetch_estimate_layers
+        async with sem:
+            try:
+                layers = await asyncio.to_thread(fetch_estimate_layers, w.ticker, w.country)
+            except Exception as e:
+                print(f"⚠️ {w.ticker} 추정치 폴링 실패: {e}")
+                layers = {}
+        self.stats['estimate_polls'] += 1
+        fp = fingerprint(sorted(layers.items())) if layers else None
+        if fp is not None and fp != w.layers_fp:
+            w.layers, w.layers_fp = layers, fp
+            w.interval = self.est_min_interval
+            self.stats['estimate_changes'] += 1
+            self._mark(w.ticker, True)
+        else:
+            w.interval = min(w.interval * 2, self.est_max_interval)
+        self._schedule(w.ticker, time.monotonic() + w.interval)
+
+    async def estimate_loop(self):
+        # 종목마다 따로 태스크로 폴링 (느린 종목이 뒤이어 때가 된 종목을 붙잡지 않도록)
+        sem = asyncio.Semaphore(self.concurrency)
+        polling = set()
+        while True:
+            now = time.monotonic()
+            while self._due and self._due[0][0] <= now:
+                task = asyncio.create_task(self._poll_estimates(self.watches[heapq.heappop(self._due)[1]], sem))
+                polling.add(task)
+                task.add_done_callback(polling.discard)
+            self._due_changed.clear()
+            timeout = self._due[0][0] - now if self._due else self.est_min_interval
+            try: await asyncio.wait_for(self._due_changed.wait(), timeout)
+            except asyncio.TimeoutError: pass
+
+    async def price_loop(self):
+        from price_store import get_price_store
+        store = get_price_store()
+        while True:
+            try:
+                # 전 종목을 묶어 한 번에, 마지막 저장일 이후 봉만 받음
+                await asyncio.to_thread(store.update, list(self.watches))
+                for w in self.watches.values():
+                    latest = store.latest_close(w.ticker)
+                    if latest: w.close = latest[1]
+            except Exception as e:
+                print(f"⚠️ 가격 폴링 실패: {e}")
+            await asyncio.sleep(self.price_interval)
+
+    async def recompute_loop(self):
+        from data_loader import trend_from_layers
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            dirty, self._dirty = self._dirty, {}
+            for ticker, retrend in dirty.items():
+                w = self.watches[ticker]
+                if retrend:
+                    try:
+                        w.trend = await asyncio.to_thread(trend_from_layers, ticker, w.layers)
+                    except Exception as e:
+                        print(f"⚠️ {ticker} 재계산 실패: {e}")
+                        continue
+                with span("monitor.recompute"):
+                    sig = signals.evaluate_ticker(ticker, w.name, w.country, w.trend, self.macro)
+                self.stats['recomputed'] += 1
+                if sig is None: continue
+                if w.signal is not None and sig.trade_signal != w.signal.trade_signal:
+                    self._alert('signal', f"{w.name}({ticker})", w.signal.trade_signal, sig.trade_signal)
+                w.signal = sig
+
+    async def run(self):
+        await self._resolve()
+        await asyncio.gather(self.macro_loop(), self.estimate_loop(), self.price_loop(), self.recompute_loop())
+
+    # ---------- 별도 스레드에서 실행 (Streamlit 등) ----------
+    def start_in_thread(self):
+        ready = threading.Event()
+        def target():
+            self._loop = asyncio.new_event_loop()
+            self._task = self._loop.create_task(self.run())
+            ready.set()
+            try: self._loop.run_until_complete(self._task)
+            except asyncio.CancelledError: pass
+            finally: self._loop.close()
+        threading.Thread(target=target, name="watchlist-monitor", daemon=True).start()
+        ready.wait()
+        return self
+
+    def stop(self):
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._task.cancel)
+        self._sink_pool.shutdown(wait=False, cancel_futures=True)
+
+_monitors = {}      # 정규화한 관심 종목 -> Monitor
+_owners = {}        # 세션 등 소유자 -> 쓰고 있는 관심 종목 키
+_monitor_lock = threading.Lock()
+
+def target_key(targets):
+    return tuple(sorted(set(normalize_targets(targets)), key=repr))
+
+def _release(owner):
+    key = _owners.pop(owner, None)
+    if key is not None and key not in _owners.values():
+        _monitors.pop(key).stop()
+
+def get_monitor(targets, owner=None):
+    """관심 종목 목록마다 하나 (순서/중복은 무시). 같은 목록을 보는 소유자는 모니터를 공유하고,
+    소유자의 목록이 바뀌면 이전 모니터는 아무도 쓰지 않을 때만 멈춘다"""
+    key = target_key(targets)
+    with _monitor_lock:
+        if _owners.get(owner) != key:
+            _release(owner)
+            _owners[owner] = key
+        if key not in _monitors:
+            _monitors[key] = Monitor(list(key), sinks=[log_sink] + ([webhook_sink(WEBHOOK_URL)] if WEBHOOK_URL else []))
+            _monitors[key].start_in_thread()
+        return _monitors[key]
+
+def stop_monitor(owner=None):
+    """이 소유자만 모니터에서 빠짐 (다른 소유자가 없으면 멈춤)"""
+    with _monitor_lock:
+        _release(owner)
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description="관심 종목 신호 모니터")
+    p.add_argument("--tickers", help="쉼표로 구분한 종목명/티커")
+    p.add_argument("--file", help="한 줄에 하나씩 종목명/티커가 적힌 파일")
+    p.add_argument("--webhook", default=WEBHOOK_URL, help="알림을 POST 할 URL")
+    p.add_argument("--macro-interval", type=float, default=MACRO_INTERVAL)
+    p.add_argument("--price-interval", type=float, default=PRICE_INTERVAL)
+    p.add_argument("--min-interval", type=float, default=EST_MIN_INTERVAL)
+    p.add_argument("--max-interval", type=float, default=EST_MAX_INTERVAL)
+    args = p.parse_args()
+
+    if args.file:
+        with open(args.file, encoding="utf-8") as f: targets = parse_watchlist(f.read())
+    else: targets = parse_watchlist(args.tickers)
+    if not targets: p.print_help(); raise SystemExit(1)
+
+    sinks = [log_sink] + ([webhook_sink(args.webhook)] if args.webhook else [])
+    monitor = Monitor(targets, sinks, args.macro_interval, args.price_interval, args.min_interval, args.max_interval)
+    print(f"{len(targets)}종목 모니터링 시작 (Ctrl+C 로 종료)")
+    try: asyncio.run(monitor.run())
+    except KeyboardInterrupt: print(monitor.stats)
@@ -0,0 +1,250 @@
+"""동종 비교: 시장 / 시장 x 섹터 안에서 성장률·가속도의 백분위와 z-점수
+
+  add_peer_ranks(df)                        # 배치 결과 전체에 한 번에 (groupby)
+  ranks = get_peer_ranks()                  # 배치 결과로 만든 정렬 목록 (파일이 바뀌면 다시 읽음)
+  ranks.update(ticker, market, sector, growth, accel)   # 한 종목만 갱신
+  ranks.lookup(ticker)                      # {'Market': PeerStat, 'Sector': PeerStat} - O(log n)
+  ranks.rank(ticker, market, sector, growth, accel)     # 갱신한 것처럼 조회만 (공유 목록은 그대로)
+
+백분위 = 그룹에서 값이 같거나 작은 종목 비율(%), z = (값 - 평균) / 표준편차(모집단).
+그룹마다 지표별로 정렬 목록(bisect)과 합/제곱합을 들고 있어 갱신은 한 종목 단위로 끝난다.
+시장은 KRX 목록의 Market(KOSPI/KOSDAQ/...), 미국 종목은 "US". 섹터는 KRX 목록의 Sector 열,
+SECTOR_MAP_PATH(CSV: Ticker,Sector)가 있으면 그 값이 우선한다.
+"""
+import os
+import math
+import bisect
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+SECTOR_MAP_PATH = os.getenv("SECTOR_MAP_PATH", os.path.join("data", "sectors.csv"))
+METRICS = ('Growth', 'Accel')
+LEVELS = ('Market', 'Sector')
+UNKNOWN_SECTOR = "미분류"
+MIN_PEERS = 5   # 이보다 작은 그룹은 화면에 표시하지 않음
+
+# -----------------------------------------------------------
+# 1. 시장 / 섹터 분류
+# -----------------------------------------------------------
+def load_sector_map(path=SECTOR_MAP_PATH):
+    if not path or not os.path.exists(path): return {}
+    df = pd.read_csv(path, dtype=str)
+    return dict(zip(df['Ticker'].str.upper(), df['Sector']))
+
+_class_lock = threading.Lock()
+_classes = None
+
+def classify_universe():
+    """{ticker: (market, sector)} - KRX 목록 + 섹터 매핑 (프로세스당 한 번)"""
+    global _classes
+    with _class_lock:
+        if _classes is None:
+            from data_loader import get_krx_csv_cache, krx_ticker
+            krx_df = get_krx_csv_cache()
+            classes = {}
+            if krx_df is not None:
+                markets = krx_df['Market'] if 'Market' in krx_df.columns else ['KOSPI'] * len(krx_df)
+                sectors = krx_df['Sector'] if 'Sector' in krx_df.columns else [None] * len(krx_df)
+                for sym, mkt, sec in zip(krx_df['Symbol'], markets, sectors):
+                    classes[krx_ticker(sym, mkt)] = (str(mkt), sec if isinstance(sec, str) and sec else UNKNOWN_SECTOR)
+            for ticker, sec in load_sector_map().items():
+                market = classes.get(ticker, ("US", None))[0]
+                classes[ticker] = (market, sec)
+            if krx_df is None: return classes  # 목록을 못 받았으면 다음 호출에서 재시도
+            _classes = classes
+        return _classes
+
+def market_sector(ticker, country, classes=None):
+    classes = classify_universe() if classes is None else classes
+    default = ("KOSPI" if country == "KR" else "US", UNKNOWN_SECTOR)
+    return classes.get(str(ticker).upper(), default)
+
+# -----------------------------------------------------------
+# 2. 전체 결과에 일괄 계산 (배치용)
+# -----------------------------------------------------------
+def add_peer_ranks(df, classes=None):
+    """Ticker/Country/Growth/Accel 표 -> Market, Sector 와 '{지표} Pct|Z ({Market|Sector})' 열을 붙인 표"""
+    df = df.copy()
+    if 'Market' not in df.columns or 'Sector' not in df.columns:
+        classes = classify_universe() if classes is None else classes
+        pairs = [market_sector(t, c, classes) for t, c in zip(df['Ticker'], df['Country'])]
+        df['Market'] = [p[0] for p in pairs]
+        df['Sector'] = [p[1] for p in pairs]
+    for level, keys in zip(LEVELS, (['Market'], ['Market', 'Sector'])):
+        for m in METRICS:
+            values = pd.to_numeric(df[m], errors='coerce')
+            g = values.groupby([df[k] for k in keys], dropna=False)
+            df[f"{m} Pct ({level})"] = g.rank(method='max', pct=True) * 100
+            mean, std = g.transform('mean'), g.transform('std', ddof=0)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                df[f"{m} Z ({level})"] = np.where(std > 0, (values - mean) / std, np.where(values.notna(), 0.0, np.nan))
+    return df
+
+# -----------------------------------------------------------
+# 3. 점진 갱신 + O(log n) 조회
+# -----------------------------------------------------------
+@dataclass
+class PeerStat:
+    group: str
+    n: int
+    pct: dict     # metric -> 백분위
+    z: dict       # metric -> z-점수
+
+class PeerGroup:
+    """지표별 정렬 목록 + (개수, 합, 제곱합)"""
+    def __init__(self):
+        self.sorted = {m: [] for m in METRICS}
+        self.sums = {m: [0, 0.0, 0.0] for m in METRICS}
+
+    def add(self, metric, value, keep_sorted=True):
+        """keep_sorted=False 는 일괄 적재용 (끝에 finish() 로 한 번 정렬)"""
+        if keep_sorted: bisect.insort(self.sorted[metric], value)
+        else: self.sorted[metric].append(value)
+        s = self.sums[metric]
+        s[0] += 1; s[1] += value; s[2] += value * value
+
+    def remove(self, metric, value):
+        values = self.sorted[metric]
+        i = bisect.bisect_left(values, value)
+        if i < len(values) and values[i] == value:
+            del values[i]
+            s = self.sums[metric]
+            s[0] -= 1; s[1] -= value; s[2] -= value * value
+
+    def finish(self):
+        for values in self.sorted.values(): values.sort()
+
+    def size(self, metric):
+        return len(self.sorted[metric])
+
+    def percentile(self, metric, value):
+        values = self.sorted[metric]
+        return bisect.bisect_right(values, value) / len(values) * 100 if values else None
+
+    def zscore(self, metric, value):
+        return _zscore(*self.sums[metric], value)
+
+    def rank_as_member(self, metric, value, drop=None):
+        """value 를 넣고 drop(이 종목의 기존 값)을 뺀 것처럼 (백분위, z) - 목록은 바꾸지 않음"""
+        n, total, sq = self.sums[metric]
+        le = bisect.bisect_right(self.sorted[metric], value)
+        if drop is not None:
+            n -= 1; total -= drop; sq -= drop * drop
+            le -= drop <= value
+        n += 1; total += value; sq += value * value
+        return (le + 1) / n * 100, _zscore(n, total, sq, value)
+
+def _zscore(n, total, sq, value):
+    if not n: return None
+    mean = total / n
+    var = sq / n - mean * mean
+    return (value - mean) / math.sqrt(var) if var > 1e-12 else 0.0
+
+def _valid(v):
+    return v is not None and not (isinstance(v, float) and math.isnan(v))
+
+class PeerRanks:
+    def __init__(self):
+        self.groups = {}      # ('Market', market) | ('Sector', market, sector) -> PeerGroup
+        self.members = {}     # ticker -> (market, sector, {metric: value})
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def _keys(market, sector):
+        return {'Market': ('Market', market), 'Sector': ('Sector', market, sector)}
+
+    def _apply(self, ticker, add, keep_sorted=True):
+        market, sector, values = self.members[ticker]
+        for key in self._keys(market, sector).values():
+            group = self.groups.setdefault(key, PeerGroup())
+            for m, v in values.items():
+                if not _valid(v): continue
+                if add: group.add(m, v, keep_sorted)
+                else: group.remove(m, v)
+
+    def update(self, ticker, market, sector, growth, accel):
+        with self.lock:
+            if ticker in self.members: self._apply(ticker, add=False)
+            self.members[ticker] = (market, sector, {'Growth': growth, 'Accel': accel})
+            self._apply(ticker, add=True)
+
+    def remove(self, ticker):
+        with self.lock:
+            if ticker in self.members:
+                self._apply(ticker, add=False)
+                del self.members[ticker]
+
+    def lookup(self, ticker):
+        """{'Market' | 'Sector': PeerStat} (모르는 종목이면 None)"""
+        with self.lock:
+            member = self.members.get(ticker)
+            if member is None: return None
+            market, sector, values = member
+            out = {}
+            for level, key in self._keys(market, sector).items():
+                group = self.groups[key]
+                ok = [m for m in METRICS if _valid(values[m])]
+                out[level] = PeerStat(" / ".join(key[1:]), max((group.size(m) for m in METRICS), default=0),
+                                      {m: group.percentile(m, values[m]) for m in ok},
+                                      {m: group.zscore(m, values[m]) for m in ok})
+            return out
+
+    def rank(self, ticker, market, sector, growth, accel):
+        """update + lookup 과 같은 결과를 공유 목록을 바꾸지 않고 계산 (세션 간에 섞이지 않도록)"""
+        values = {'Growth': growth, 'Accel': accel}
+        with self.lock:
+            member = self.members.get(ticker)
+            out = {}
+            for level, key in self._keys(market, sector).items():
+                group = self.groups.get(key) or PeerGroup()
+                own = member is not None and self._keys(*member[:2])[level] == key
+                pct, z, sizes = {}, {}, []
+                for m in METRICS:
+                    drop = member[2][m] if own and _valid(member[2][m]) else None
+                    sizes.append(group.size(m) - (drop is not None) + _valid(values[m]))
+                    if _valid(values[m]): pct[m], z[m] = group.rank_as_member(m, values[m], drop)
+                n = max(sizes, default=0)
+                out[level] = PeerStat(" / ".join(key[1:]), n, pct, z)
+            return out
+
+    def __len__(self):
+        return len(self.members)
+
+    @classmethod
+    def from_frame(cls, df, classes=None):
+        """배치 결과 표 -> PeerRanks (Market/Sector 열이 없으면 분류해서 붙임)"""
+        ranks = cls()
+        if df is None or df.empty: return ranks
+        if 'Market' not in df.columns or 'Sector' not in df.columns:
+            classes = classify_universe() if classes is None else classes
+            pairs = [market_sector(t, c, classes) for t, c in zip(df['Ticker'], df['Country'])]
+        else:
+            pairs = list(zip(df['Market'], df['Sector']))
+        growth = pd.to_numeric(df['Growth'], errors='coerce')
+        accel = pd.to_numeric(df['Accel'], errors='coerce')
+        # 모두 넣은 뒤 그룹별로 한 번씩 정렬 (insort 반복보다 빠름)
+        for ticker, (market, sector), g, a in zip(df['Ticker'], pairs, growth, accel):
+            ranks.members[ticker] = (market, sector, {'Growth': float(g), 'Accel': float(a)})
+            ranks._apply(ticker, add=True, keep_sorted=False)
+        for group in ranks.groups.values(): group.finish()
+        return ranks
+
+_ranks = None
+_ranks_mtime = None
+_ranks_lock = threading.Lock()
+
+def get_peer_ranks(path=None):
+    """배치 결과 파일로 만든 PeerRanks (파일이 바뀌었을 때만 다시 만듦)"""
+    global _ranks, _ranks_mtime
+    from batch import load_results, results_path, RESULTS_PATH
+    path = results_path(path or RESULTS_PATH)  # .parquet 대신 저장된 CSV 도 찾음
+    mtime = (path, os.path.getmtime(path)) if path else None
+    with _ranks_lock:
+        if _ranks is None or mtime != _ranks_mtime:
+            df = load_results(path) if path else None
+            _ranks = PeerRanks.from_frame(df[df['Status'] == "OK"] if df is not None else None)
+            _ranks_mtime = mtime
+        return _ranks
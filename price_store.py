@@ -0,0 +1,201 @@
+"""일봉 OHLCV 로컬 저장소 (종목당 .npy 한 개, 메모리 맵으로 읽음)
+
+  store = get_price_store()
+  store.update(["005930.KS", "AAPL", ...])   # 여러 종목을 한 요청으로, 마지막 저장일 이후만
+  store.latest_close("AAPL")                  # -> (날짜, 종가) 또는 None, 네트워크 없음
+"""
+import os
+import time
+import datetime
+import threading
+
+import numpy as np
+import pandas as pd
+
+from recorder import recorded_call, request_key
+from telemetry import span
+
+PRICE_DIR = os.getenv("PRICE_STORE_DIR", os.path.join("data", "prices"))
+REFRESH_AFTER = 3600
+CHUNK_SIZE = 200          # yfinance 한 번의 download 에 넣을 종목 수
+HISTORY_YEARS = 5         # 처음 받는 종목의 과거 기간
+FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume']
+BAR_DTYPE = np.dtype([('date', 'i4')] + [(f.lower(), 'f8') for f in FIELDS])  # date: 1970-01-01 이후 일수
+
+def _days(index):
+    return pd.DatetimeIndex(index).tz_localize(None).to_numpy().astype('datetime64[D]').astype('i4')
+
+def _day(ts):
+    return int(_days([ts])[0])
+
+def _ts(day):
+    return pd.Timestamp(int(day), unit='D')
+
+# -----------------------------------------------------------
+# 1. 원격 호출 (여러 종목을 한 번에)
+# -----------------------------------------------------------
+def download_bars(tickers, start):
+    """tickers 의 start 이후 일봉 -> {ticker: OHLCV DataFrame}"""
+    import yfinance as yf
+    raw = yf.download(tickers, start=start.strftime('%Y-%m-%d'), group_by='ticker', auto_adjust=False,
+                      threads=True, progress=False)
+    if raw is None or raw.empty: return {}
+    if not isinstance(raw.columns, pd.MultiIndex):
+        raw = pd.concat({tickers[0]: raw}, axis=1)
+    bars = {}
+    for t in tickers:
+        if t not in raw.columns.get_level_values(0): continue
+        df = raw[t].reindex(columns=FIELDS).dropna(subset=['Close'])
+        if not df.empty: bars[t] = df
+    return bars
+
+def fetch_bars(tickers, start):
+    # 증분 요청이어도 같은 녹화본을 재생하고, 날짜는 저장 시 거른다
+    key = request_key("yf.download", {'tickers': ",".join(sorted(tickers))})
+    return recorded_call("prices", key, download_bars, tickers, start)
+
+# -----------------------------------------------------------
+# 2. 로컬 저장소
+# -----------------------------------------------------------
+class PriceStore:
+    def __init__(self, price_dir=PRICE_DIR, refresh_after=REFRESH_AFTER, chunk_size=CHUNK_SIZE):
+        self.price_dir = price_dir
+        self.refresh_after = refresh_after
+        self.chunk_size = chunk_size
+        self._write_lock = threading.Lock()
+        self._refreshing = threading.Lock()
+        self._pending = set()  # 백그라운드 갱신 대기 종목
+        self._missing = {}     # 받아 봤지만 봉이 없던 종목 -> 시각 (refresh_after 동안 다시 요청하지 않음)
+        os.makedirs(price_dir, exist_ok=True)
+
+    def _path(self, ticker):
+        safe = "".join(c if c.isalnum() or c in "._-" else "_" for c in ticker)
+        return os.path.join(self.price_dir, f"{safe}.npy")
+
+    def bars(self, ticker):
+        """메모리 맵 배열 (없으면 None). 실제로 읽는 부분만 페이지로 올라옴"""
+        path = self._path(ticker)
+        if not os.path.exists(path): return None
+        return np.load(path, mmap_mode='r')
+
+    def last_date(self, ticker):
+        arr = self.bars(ticker)
+        return _ts(arr['date'][-1]) if arr is not None and len(arr) else None
+
+    def latest_close(self, ticker):
+        arr = self.bars(ticker)
+        if arr is None or not len(arr): return None
+        return _ts(arr['date'][-1]), float(arr['close'][-1])
+
+    def history(self, ticker, start=None):
+        arr = self.bars(ticker)
+        if arr is None: return pd.DataFrame(columns=FIELDS)
+        if start is not None: arr = arr[np.searchsorted(arr['date'], _day(start)):]
+        # 복사해서 돌려줌: 메모리 맵이 남아 있으면 Windows 에서 append 의 파일 교체가 실패
+        return pd.DataFrame({f: np.array(arr[f.lower()]) for f in FIELDS},
+                            index=pd.to_datetime(np.array(arr['date']), unit='D'))
+
+    def is_stale(self, ticker):
+        path = self._path(ticker)
+        return not os.path.exists(path) or time.time() - os.path.getmtime(path) > self.refresh_after
+
+    def append(self, ticker, df):
+        """새 봉을 덧붙여 원자적으로 교체. 같은 날짜는 새 값으로 덮어씀 (당일 봉 갱신)"""
+        new = np.empty(len(df), dtype=BAR_DTYPE)
+        new['date'] = _days(df.index)
+        for f in FIELDS: new[f.lower()] = df[f].to_numpy(dtype=float)
+
+        with self._write_lock:
+            old = self.bars(ticker)
+            if old is not None and len(old):
+                keep = np.array(old[old['date'] < new['date'].min()]) if len(new) else np.array(old)
+                new = np.concatenate([keep, new])
+            del old  # 메모리 맵을 닫은 뒤 교체 (Windows 는 매핑된 파일을 바꿀 수 없음)
+            tmp = self._path(ticker) + ".tmp.npy"
+            np.save(tmp, new)
+            self._replace(tmp, self._path(ticker))  # 변경이 없어도 mtime 갱신 -> 다음 갱신 시점 계산
+            self._missing.pop(ticker, None)
+        return len(new)
+
+    @staticmethod
+    def _replace(src, dst, attempts=5):
+        """다른 스레드가 잠깐 매핑 중이면 (Windows PermissionError) 조금 기다렸다 재시도"""
+        for i in range(attempts):
+            try:
+                os.replace(src, dst)
+                return
+            except PermissionError:
+                if i == attempts - 1: raise
+                time.sleep(0.05 * (i + 1))
+
+    def update(self, tickers):
+        """마지막 저장일이 같은 종목끼리 묶어 CHUNK_SIZE 단위로 요청. 청크마다 바로 저장해 메모리 일정"""
+        default_start = pd.Timestamp(datetime.date.today()) - pd.DateOffset(years=HISTORY_YEARS)
+        groups = {}
+        for t in dict.fromkeys(tickers):
+            last = self.last_date(t)
+            groups.setdefault(last if last is not None else default_start, []).append(t)
+
+        failed = []
+        for start, group in groups.items():
+            for i in range(0, len(group), self.chunk_size):
+                chunk = group[i:i + self.chunk_size]
+                try:
+                    with span("prices.download"): bars = fetch_bars(chunk, start)
+                except Exception as e:
+                    print(f"가격 로딩 실패 ({len(chunk)}종목): {e}")
+                    failed.extend(chunk)
+                    self._mark_missing(t for t in chunk if not os.path.exists(self._path(t)))
+                    continue
+                for t in chunk:
+                    df = bars.get(t)
+                    if df is not None: df = df[df.index >= start]
+                    if df is None or df.empty:
+                        if os.path.exists(self._path(t)): os.utime(self._path(t))  # 휴장일 등 새 봉 없음
+                        else: self._mark_missing([t])
+                        continue
+                    self.append(t, df)
+                del bars
+        return failed
+
+    def _mark_missing(self, tickers):
+        now = time.time()
+        with self._write_lock:
+            for t in tickers: self._missing[t] = now
+
+    def recently_missing(self, ticker):
+        at = self._missing.get(ticker)
+        return at is not None and time.time() - at < self.refresh_after
+
+    def refresh_in_background(self, tickers):
+        """요청 종목을 모아 두었다가 한 스레드가 묶어서 갱신"""
+        with self._write_lock: self._pending.update(tickers)
+        if not self._refreshing.acquire(blocking=False): return  # 이미 갱신 중 -> 대기열에서 처리
+        def run():
+            try:
+                while True:
+                    with self._write_lock:
+                        batch, self._pending = sorted(self._pending), set()
+                    if not batch: break
+                    self.update(batch)
+            finally: self._refreshing.release()
+        threading.Thread(target=run, name="price-refresh", daemon=True).start()
+
+    def latest(self, ticker):
+        """저장된 종가를 즉시 반환하고 오래됐으면 백그라운드 갱신. 처음 보는 종목만 동기 요청
+        (봉이 없던 종목은 refresh_after 동안 다시 요청하지 않고 None)"""
+        if not os.path.exists(self._path(ticker)):
+            if self.recently_missing(ticker): return None
+            self.update([ticker])
+        elif self.is_stale(ticker):
+            self.refresh_in_background([ticker])
+        return self.latest_close(ticker)
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_price_store():
+    global _store
+    with _store_lock:
+        if _store is None: _store = PriceStore()
+        return _store
@@ -0,0 +1,114 @@
+"""원격 호출 녹화/재생 계층
+
+PIPELINE_MODE=live   (기본) 실제 호출
+PIPELINE_MODE=record 실제 호출 후 응답을 PIPELINE_FIXTURE_DIR 에 저장
+PIPELINE_MODE=replay 저장된 응답만 사용 (네트워크 없음, 없으면 FixtureMissing)
+"""
+import os
+import json
+import pickle
+import hashlib
+import threading
+
+import requests
+
+from http_client import get_client
+
+MODE = os.getenv("PIPELINE_MODE", "live")
+FIXTURE_DIR = os.getenv("PIPELINE_FIXTURE_DIR", os.path.join("fixtures", "pipeline"))
+
+class FixtureMissing(LookupError):
+    pass
+
+class RecordedResponse:
+    """requests.Response 중 이 프로젝트가 쓰는 부분만 흉내"""
+    def __init__(self, status_code, text, url=""):
+        self.status_code, self.text, self.url = status_code, text, url
+
+    def json(self):
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} for {self.url}")
+
+def set_mode(mode, fixture_dir=None):
+    global MODE, FIXTURE_DIR
+    MODE = mode
+    if fixture_dir: FIXTURE_DIR = fixture_dir
+
+def request_key(url, params=None):
+    raw = url + "?" + json.dumps(params or {}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+def _path(namespace, key, ext):
+    safe = "".join(c if c.isalnum() or c in "._-" else "_" for c in str(key))
+    return os.path.join(FIXTURE_DIR, namespace, f"{safe}.{ext}")
+
+_write_lock = threading.Lock()
+
+def _write(path, data, binary=False):
+    with _write_lock:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "wb" if binary else "w", **({} if binary else {"encoding": "utf-8"})) as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+# -----------------------------------------------------------
+# 1. HTTP (FnGuide / Yahoo 검색 / FRED / OECD)
+# -----------------------------------------------------------
+def http_get(url, params=None, headers=None, timeout=10, namespace="http", key=None):
+    """key 를 주면 쿼리 파라미터가 달라도(예: 증분 요청) 같은 녹화본을 재생"""
+    path = _path(namespace, key or request_key(url, params), "json")
+    if MODE == "replay":
+        if not os.path.exists(path): raise FixtureMissing(path)
+        with open(path, encoding="utf-8") as f: rec = json.load(f)
+        return RecordedResponse(rec['status_code'], rec['text'], rec['url'])
+
+    r = get_client().get(url, params=params, headers=headers, timeout=timeout)
+    if MODE == "record":
+        rec = {'url': r.url, 'status_code': r.status_code, 'text': r.text}
+        _write(path, json.dumps(rec, ensure_ascii=False))
+    return r
+
+# -----------------------------------------------------------
+# 2. 라이브러리 호출 결과 (yfinance 등 HTTP 를 직접 다루지 않는 경우)
+# -----------------------------------------------------------
+def recorded_call(namespace, key, fn, *args, **kwargs):
+    path = _path(namespace, key, "pkl")
+    if MODE == "replay":
+        if not os.path.exists(path): raise FixtureMissing(path)
+        with open(path, "rb") as f: return pickle.load(f)
+    result = fn(*args, **kwargs)
+    if MODE == "record":
+        _write(path, pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL), binary=True)
+    return result
+
+# -----------------------------------------------------------
+# 3. LLM (프롬프트 해시 기준으로 전체 응답 저장)
+# -----------------------------------------------------------
+class _Chunk:
+    def __init__(self, content): self.content = content
+
+class RecordingLLM:
+    def __init__(self, inner): self.inner = inner
+
+    def stream(self, prompt):
+        parts = []
+        for chunk in self.inner.stream(prompt):
+            parts.append(chunk.content if isinstance(chunk.content, str) else "".join(map(str, chunk.content)))
+            yield chunk
+        _write(_path("llm", request_key(prompt), "json"), json.dumps({'text': "".join(parts)}, ensure_ascii=False))
+
+class ReplayLLM:
+    def stream(self, prompt):
+        path = _path("llm", request_key(prompt), "json")
+        if not os.path.exists(path): raise FixtureMissing(path)
+        with open(path, encoding="utf-8") as f: text = json.load(f)['text']
+        for i in range(0, len(text), 32): yield _Chunk(text[i:i+32])
+
+def wrap_llm(llm_factory):
+    if MODE == "replay": return ReplayLLM()
+    llm = llm_factory()
+    return RecordingLLM(llm) if MODE == "record" else llm
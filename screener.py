@@ -0,0 +1,108 @@
+import re
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import pandas as pd
+
+import signals
+from data_loader import get_krx_csv_cache, find_ticker, krx_ticker
+
+SCREEN_COLUMNS = ['Ticker', 'Name', 'Country', '12M Fwd EPS', 'Growth', 'Accel', 'Signal', 'Status']
+
+# -----------------------------------------------------------
+# 1. 스크리닝 대상 목록 (관심 종목 / KRX 전체)
+# -----------------------------------------------------------
+def parse_watchlist(text):
+    return [s.strip() for s in re.split(r'[,\n]', text or "") if s.strip()]
+
+def krx_universe():
+    krx_df = get_krx_csv_cache()
+    if krx_df is None: return []
+    markets = krx_df['Market'] if 'Market' in krx_df.columns else ['KOSPI'] * len(krx_df)
+    return [(krx_ticker(sym, mkt), str(name), "KR")
+            for sym, mkt, name in zip(krx_df['Symbol'], markets, krx_df['Name'])]
+
+# -----------------------------------------------------------
+# 2. 종목 1개 분석 (워커 스레드에서 실행)
+# -----------------------------------------------------------
+def signal_row(sig):
+    return {'Ticker': sig.ticker, 'Name': sig.name, 'Country': sig.country, '12M Fwd EPS': sig.fwd_eps,
+            'Growth': sig.growth, 'Accel': sig.accel, 'Signal': sig.trade_signal, 'Status': "OK"}
+
+def analyze_ticker(ticker, name, country, macro=None):
+    if country is None:
+        ticker, name, country = find_ticker(ticker)
+    sig = signals.analyze_ticker(ticker, name, country, macro or signals.MacroState())
+    if sig is None:
+        return {'Ticker': ticker, 'Name': name, 'Country': country, 'Status': "데이터 없음"}
+    return signal_row(sig)
+
+# -----------------------------------------------------------
+# 3. 제한된 스레드 풀로 동시 수집 + 결과 스트리밍
+# -----------------------------------------------------------
+def screen_universe(targets, max_workers=8, timeout=20, analyze=analyze_ticker, spare_workers=None):
+    """targets: [(ticker, name, country)] 또는 종목명 문자열 목록.
+    완료되는 순서대로 결과 dict 를 yield 하며, 실행 시작 후 timeout 초가 지난 종목은
+    '시간 초과'로 넘기고 더 기다리지 않는다.
+
+    timeout 은 결과를 기다리는 소프트 마감일 뿐 스레드를 멈추지 못한다 (분석은 각 요청의
+    timeout 이 지나야 끝남). 그래서 동시 실행은 max_workers 개로 제한하되 풀에는
+    spare_workers 개(기본 max_workers)의 여분 스레드를 두어, 시간 초과로 넘긴 종목이 끝날 때까지
+    그 자리를 여분 스레드가 대신한다. 여분보다 많은 종목이 동시에 멈춰 있으면 남은 종목은 기다린다."""
+    jobs = [(t, t, None) if isinstance(t, str) else tuple(t) for t in targets]
+    spare = max_workers if spare_workers is None else spare_workers
+    slots = threading.Semaphore(max_workers)
+    started = {}
+    released = set()
+    lock = threading.Lock()
+
+    def release(i):
+        with lock:
+            if i in released: return
+            released.add(i)
+        slots.release()
+
+    def run(i):
+        slots.acquire()
+        with lock: started[i] = time.monotonic()
+        try:
+            return analyze(*jobs[i])
+        finally:
+            release(i)
+
+    def base_row(i):
+        ticker, name, country = jobs[i]
+        return {'Ticker': ticker, 'Name': name, 'Country': country or "-"}
+
+    pool = ThreadPoolExecutor(max_workers=max_workers + spare, thread_name_prefix="screener")
+    pending = {pool.submit(run, i): i for i in range(len(jobs))}
+    try:
+        while pending:
+            with lock:
+                deadlines = [started[i] + timeout for i in pending.values() if i in started]
+            wait_for = max(0.0, min(deadlines) - time.monotonic()) if deadlines else timeout
+            done, _ = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+
+            for fut in done:
+                i = pending.pop(fut)
+                try:
+                    yield fut.result()
+                except Exception as e:
+                    yield {**base_row(i), 'Status': f"에러: {e}"}
+
+            # 실행 중 제한 시간을 넘긴 종목은 포기하고 실행 자리를 넘김 (스레드는 계속 돌다가 스스로 끝남)
+            now = time.monotonic()
+            with lock:
+                expired = [f for f, i in pending.items() if i in started and now - started[i] >= timeout]
+            for fut in expired:
+                i = pending.pop(fut)
+                release(i)
+                yield {**base_row(i), 'Status': "시간 초과"}
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+def rank_results(rows):
+    """가속도 > 성장률 순으로 정렬한 결과 표"""
+    df = pd.DataFrame(rows, columns=SCREEN_COLUMNS)
+    return df.sort_values(['Accel', 'Growth'], ascending=False, na_position='last').reset_index(drop=True)
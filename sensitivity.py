@@ -0,0 +1,147 @@
+"""매매 신호 민감도: 분기 추정치에 충격을 준 시나리오 수천 개를 한 번의 배열 연산으로 다시 계산
+
+  s = signal_sensitivity(layers)                       # 무작위 충격 (기본 5,000개, σ=5%)
+  s.probs                                              # {신호: 확률}
+  s = signal_sensitivity(layers, mode='grid')          # 근접 4분기 x 그 이후 분기 충격 격자
+  s.grid                                               # DataFrame(근접 충격 x 원거리 충격) -> 신호
+
+충격은 추정치(연간/분기 추정) 칸에만 곱해지고 확정 실적은 그대로 둔다.
+시나리오를 행으로 쌓아 calculate_12m_fwd_matrix 에 넣으므로 원래 엔진과 같은 계산을 그대로 쓴다.
+"""
+import time
+import argparse
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from logic import (TRADE_SIGNALS, classify_trade_signal_codes, calculate_12m_fwd_matrix,
+                   calculate_growth_accel, fwd_dates)
+from eps_panel import EpsPanel, SOURCE_ANNUAL, SOURCE_QUARTER
+
+N_SCENARIOS = 5000
+SIGMA = 0.05                              # 분기 추정치 충격의 표준편차 (비율)
+RHO = 0.5                                 # 분기 간 공통 충격 비중 (0: 분기별 독립, 1: 모두 같은 충격)
+GRID_LEVELS = np.linspace(-0.10, 0.10, 21)
+NEAR_QUARTERS = 4
+
+@dataclass
+class Sensitivity:
+    base_signal: str
+    probs: dict                           # 신호 -> 확률 (TRADE_SIGNALS 순서)
+    n: int
+    fwd: dict = field(default_factory=dict)     # 'p5' | 'p50' | 'p95' -> 값
+    growth: dict = field(default_factory=dict)
+    accel: dict = field(default_factory=dict)
+    grid: Optional[pd.DataFrame] = field(default=None, repr=False)
+
+    @property
+    def stability(self):
+        """기준 신호가 유지될 확률"""
+        return self.probs.get(self.base_signal, 0.0)
+
+    def to_frame(self):
+        return pd.DataFrame({'확률 (%)': {k: v * 100 for k, v in self.probs.items()}})
+
+# -----------------------------------------------------------
+# 1. 충격 생성 ((S, W) 비율 배열)
+# -----------------------------------------------------------
+def random_shocks(n, width, sigma=SIGMA, rho=RHO, seed=None):
+    rng = np.random.default_rng(seed)
+    common = rng.standard_normal((n, 1))
+    idio = rng.standard_normal((n, width))
+    return sigma * (np.sqrt(rho) * common + np.sqrt(1 - rho) * idio)
+
+def grid_shocks(width, near_cols, levels=GRID_LEVELS):
+    """근접 분기(near_cols)에 a, 나머지에 b 를 주는 모든 (a, b) 조합 -> (len(levels)^2, W)"""
+    levels = np.asarray(levels, dtype=float)
+    near = np.zeros(width, dtype=bool)
+    near[near_cols[(near_cols >= 0) & (near_cols < width)]] = True
+    a, b = np.meshgrid(levels, levels, indexing='ij')
+    return np.where(near, a.reshape(-1, 1), b.reshape(-1, 1))
+
+# -----------------------------------------------------------
+# 2. 시나리오 일괄 계산
+# -----------------------------------------------------------
+def scenario_fwd(values, mask, base, estimated, shocks, dates, history=None):
+    """(W,) 분기 배열 + (S, W) 충격 -> 시나리오별 (fwd, growth, accel), 각 (S, 3)
+    history=(fwd[-3], fwd[-2]) 를 주면 앞의 두 시점은 고정하고 마지막 시점만 다시 계산 (리비전 추세)"""
+    scen = values * (1 + shocks * estimated)
+    scen_mask = np.broadcast_to(mask, scen.shape)
+    if history is None:
+        fwd = calculate_12m_fwd_matrix(scen, scen_mask, base, dates[-3:])
+    else:
+        last = calculate_12m_fwd_matrix(scen, scen_mask, base, dates[-1:])
+        fwd = np.column_stack([np.full(len(scen), history[0]), np.full(len(scen), history[1]), last[:, 0]])
+    growth, accel = calculate_growth_accel(fwd)
+    return fwd, growth, accel
+
+def _quantiles(arr):
+    p5, p50, p95 = np.percentile(arr, [5, 50, 95])
+    return {'p5': float(p5), 'p50': float(p50), 'p95': float(p95)}
+
+def signal_sensitivity(layers, mode='random', n=N_SCENARIOS, sigma=SIGMA, rho=RHO, levels=GRID_LEVELS,
+                       seed=None, end=None, history=None):
+    """추정치 레이어 {(source, year, quarter): value} -> Sensitivity (레이어가 비면 None)"""
+    panel = EpsPanel.from_layers({0: layers})
+    if not panel.width: return None
+    values, mask, base = panel.values[0], panel.mask[0], panel.base
+    estimated = np.isin(panel.source[0], (SOURCE_ANNUAL, SOURCE_QUARTER))
+    dates = fwd_dates(3, end)
+
+    if mode == 'grid':
+        today = dates[-1].year * 12 + dates[-1].month - 1
+        near_cols = (today + 1) // 3 + np.arange(NEAR_QUARTERS) - base
+        shocks = grid_shocks(panel.width, near_cols, levels)
+    else:
+        shocks = random_shocks(n, panel.width, sigma, rho, seed)
+    shocks = np.vstack([np.zeros(panel.width), shocks])  # 0번 행 = 충격 없는 기준
+
+    fwd, growth, accel = scenario_fwd(values, mask, base, estimated, shocks, dates, history)
+    codes = classify_trade_signal_codes(fwd[:, -1], fwd[:, -2], accel[:, -1])
+    base_code, codes = codes[0], codes[1:]
+    counts = np.bincount(codes, minlength=len(TRADE_SIGNALS))
+    result = Sensitivity(TRADE_SIGNALS[base_code], dict(zip(TRADE_SIGNALS, (counts / len(codes)).tolist())),
+                         len(codes), _quantiles(fwd[1:, -1]), _quantiles(growth[1:, -1]), _quantiles(accel[1:, -1]))
+    if mode == 'grid':
+        labels = [f"{x:+.0%}" for x in levels]
+        result.grid = pd.DataFrame(np.asarray(TRADE_SIGNALS)[codes.reshape(len(levels), len(levels))],
+                                   index=pd.Index(labels, name=f"근접 {NEAR_QUARTERS}분기"),
+                                   columns=pd.Index(labels, name="이후 분기"))
+    return result
+
+def ticker_sensitivity(ticker, trend=None, layers=None, **kwargs):
+    """화면의 추세를 만든 추정치(layers, 없으면 trend.attrs['layers'] -> 저장된 최신 추정치)로 민감도 계산.
+    추세가 리비전 이력이면 이전 두 시점은 이력 값으로 고정"""
+    history = None
+    if trend is not None and trend.attrs.get('source') == 'revision' and len(trend) >= 3:
+        history = tuple(trend['12M Fwd EPS'].iloc[-3:-1].astype(float))
+    if layers is None and trend is not None: layers = trend.attrs.get('layers')
+    if layers is None:
+        from estimate_store import get_store
+        layers = get_store().layers_asof(ticker)
+    return signal_sensitivity(layers, history=history, **kwargs)
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description="매매 신호 민감도 (추정치 충격 몬테카를로)")
+    p.add_argument("--tickers", required=True, help="쉼표로 구분한 종목명/티커")
+    p.add_argument("--mode", choices=["random", "grid"], default="random")
+    p.add_argument("-n", type=int, default=N_SCENARIOS)
+    p.add_argument("--sigma", type=float, default=SIGMA)
+    p.add_argument("--rho", type=float, default=RHO)
+    p.add_argument("--seed", type=int)
+    args = p.parse_args()
+
+    from screener import parse_watchlist
+    from data_loader import find_ticker, get_unified_data
+    for target in parse_watchlist(args.tickers):
+        ticker, name, country = find_ticker(target)
+        if country is None: continue
+        _, trend = get_unified_data(ticker, country)
+        t0 = time.perf_counter()
+        s = ticker_sensitivity(ticker, trend, mode=args.mode, n=args.n, sigma=args.sigma, rho=args.rho, seed=args.seed)
+        ms = (time.perf_counter() - t0) * 1000
+        if s is None: print(f"{name} ({ticker}): 추정치 없음"); continue
+        print(f"{name} ({ticker}) 기준 신호: {s.base_signal} · 유지 확률 {s.stability:.1%} ({s.n}개, {ms:.1f}ms)")
+        print(s.to_frame().round(1).to_string())
@@ -0,0 +1,97 @@
+"""UI 없이 쓰는 신호 계산 라이브러리 (streamlit 을 임포트하지 않음)
+
+  macro = evaluate_macro(*get_macro_data())
+  result = analyze_input("삼성전자", macro)      # -> TickerSignal
+"""
+from dataclasses import dataclass, field, asdict
+from typing import Optional
+
+import pandas as pd
+
+from logic import CLI_REGIMES, classify_cli_history, classify_trade_signal
+
+CLI_NAMES = {'US': '미국_CLI', 'KR': '한국_CLI'}
+
+@dataclass
+class CliState:
+    msg: str = "로딩 중"
+    color: str = "gray"
+    value_str: str = "-"
+
+@dataclass
+class MacroState:
+    y_val: float = 0.0
+    h_val: float = 0.0
+    bond_risk_msg: str = "안정"
+    cli: dict = field(default_factory=dict)  # country -> CliState
+
+    def cli_for(self, country):
+        return self.cli.get(country, CliState())
+
+@dataclass
+class TickerSignal:
+    ticker: str
+    name: str
+    country: str
+    fwd_eps: float
+    eps_prev: float
+    growth: float
+    accel: float
+    trade_signal: str
+    cli_msg: str
+    bond_risk_msg: str
+    trend: Optional[pd.DataFrame] = field(default=None, repr=False)
+    raw: Optional[pd.DataFrame] = field(default=None, repr=False)
+
+    def to_row(self):
+        row = asdict(self)
+        row.pop('trend'); row.pop('raw')
+        return row
+
+# -----------------------------------------------------------
+# 1. 매크로 (채권 위험 + 국가별 CLI 국면)
+# -----------------------------------------------------------
+def bond_risk(y_val, h_val):
+    if y_val < 0 and h_val >= 6.0: return "🚨 [심각] 금융 위기 (강력 매도)"
+    if y_val < 0: return "⚠️ [주의] 경기 침체 시그널"
+    return "안정"
+
+def evaluate_macro(y_c, h_s, cli):
+    y_val = y_c.iloc[-1, 0] if not y_c.empty else 0
+    h_val = h_s.iloc[-1, 0] if not h_s.empty else 0
+    state = MacroState(y_val, h_val, bond_risk(y_val, h_val))
+    columns = [c for c in CLI_NAMES.values() if c in cli.columns]
+    if cli.empty or not columns: return state
+    codes = classify_cli_history(cli[columns])
+    for country, column in CLI_NAMES.items():
+        if column not in columns: continue
+        s, c = cli[column].dropna(), codes[column][cli[column].notna()]
+        if len(s) >= 3:
+            msg, color = CLI_REGIMES[c.iloc[-1]]
+            state.cli[country] = CliState(msg, color, f"{s.iloc[-1]:.2f}")
+    return state
+
+# -----------------------------------------------------------
+# 2. 종목 신호
+# -----------------------------------------------------------
+def evaluate_ticker(ticker, name, country, trend_df, macro, raw=None):
+    """12M Fwd EPS 추세 -> TickerSignal (데이터가 부족하면 None)"""
+    if trend_df is None or trend_df.empty or len(trend_df) < 2: return None
+    fwd_val = float(trend_df['12M Fwd EPS'].iloc[-1])
+    eps_prev = float(trend_df['12M Fwd EPS'].iloc[-2])
+    accel_val = float(trend_df['Accel'].iloc[-1])
+    return TickerSignal(
+        ticker, name, country, fwd_val, eps_prev, float(trend_df['Growth'].iloc[-1]), accel_val,
+        classify_trade_signal(fwd_val, eps_prev, accel_val),
+        macro.cli_for(country).msg, macro.bond_risk_msg, trend_df, raw)
+
+def analyze_ticker(ticker, name, country, macro):
+    """확정된 티커 -> TickerSignal (데이터가 없으면 None)"""
+    from data_loader import get_unified_data
+    df_ui, trend_df = get_unified_data(ticker, country)
+    return evaluate_ticker(ticker, name, country, trend_df, macro, df_ui)
+
+def analyze_input(user_input, macro):
+    """종목명/티커 입력 -> TickerSignal"""
+    from data_loader import find_ticker
+    return analyze_ticker(*find_ticker(user_input), macro)
@@ -0,0 +1,172 @@
+"""경량 구간 계측 + 캐시 적중 카운터
+
+  with span("fnguide.fetch"): ...          # 구간 시간 기록 (p50/p95 용 최근 N개 보관)
+  @instrumented_cache("get_macro_data", ttl=3600)   # cache.cached + 적중/미스/크기 카운터
+
+TELEMETRY_JSONL=<경로> 이면 모든 구간 기록을 JSON lines 로 덧붙이고,
+TELEMETRY_PORT=<포트> 이면 /metrics 에서 Prometheus 텍스트 형식으로 노출한다.
+"""
+import os
+import json
+import time
+import functools
+import threading
+from collections import deque
+
+import numpy as np
+
+from cache import cached
+
+WINDOW = 1000
+JSONL_PATH = os.getenv("TELEMETRY_JSONL")
+METRICS_PORT = os.getenv("TELEMETRY_PORT")
+
+_lock = threading.Lock()
+_spans = {}   # name -> deque[ms]
+_counts = {}  # name -> 누적 호출 수
+_caches = {}  # name -> {'calls', 'misses', 'stale', 'evictions', 'keys', 'bytes'}
+
+# -----------------------------------------------------------
+# 1. 구간 계측
+# -----------------------------------------------------------
+def record_span(name, ms, **labels):
+    with _lock:
+        _spans.setdefault(name, deque(maxlen=WINDOW)).append(ms)
+        _counts[name] = _counts.get(name, 0) + 1
+    if JSONL_PATH:
+        line = json.dumps({'ts': time.time(), 'span': name, 'ms': round(ms, 3), **labels}, ensure_ascii=False)
+        with _lock, open(JSONL_PATH, "a", encoding="utf-8") as f: f.write(line + "\n")
+
+class span:
+    """with span("stage"): ...  (데코레이터로도 사용 가능)"""
+    def __init__(self, name, **labels):
+        self.name, self.labels = name, labels
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, *_):
+        labels = dict(self.labels, error=exc_type.__name__) if exc_type else self.labels
+        record_span(self.name, (time.perf_counter() - self.t0) * 1000, **labels)
+        return False
+
+    def __call__(self, fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(self.name, **self.labels): return fn(*args, **kwargs)
+        return wrapper
+
+def span_stats():
+    with _lock:
+        snap = {k: (np.array(v), _counts[k]) for k, v in _spans.items()}
+    return {k: {'count': n, 'p50_ms': float(np.percentile(a, 50)), 'p95_ms': float(np.percentile(a, 95)),
+                'last_ms': float(a[-1])} for k, (a, n) in sorted(snap.items())}
+
+# -----------------------------------------------------------
+# 2. 캐시 카운터 (cache.Cache 의 hook 이벤트를 집계)
+# -----------------------------------------------------------
+def _cache_entry(name):
+    return _caches.setdefault(name, {'calls': 0, 'hits': 0, 'misses': 0, 'stale': 0, 'evictions': 0,
+                                     'keys': {}, 'bytes': 0})
+
+def _set_cache_key(c, key, size):
+    c['bytes'] += size - c['keys'].get(key, 0)
+    c['keys'][key] = size
+
+def cache_hook(name, event, key, size):
+    """cache.Cache 의 hook: 호출/미스/stale 적중/저장/제거를 집계"""
+    with _lock:
+        c = _cache_entry(name)
+        if event == 'call': c['calls'] += 1
+        elif event == 'hit': c['hits'] += 1
+        elif event == 'miss': c['misses'] += 1
+        elif event == 'stale': c['stale'] += 1; c['hits'] += 1   # 기존 값으로 응답했으므로 적중
+        elif event == 'store': _set_cache_key(c, key, size)
+        elif event == 'evict' and key in c['keys']:
+            c['bytes'] -= c['keys'].pop(key)
+            c['evictions'] += 1
+
+def cache_stats():
+    with _lock:
+        out = {}
+        for name, c in sorted(_caches.items()):
+            hits = c['hits']
+            out[name] = {'calls': c['calls'], 'hits': hits, 'misses': c['misses'], 'stale': c['stale'],
+                         'hit_rate': hits / c['calls'] if c['calls'] else 0.0, 'evictions': c['evictions'],
+                         'entries': len(c['keys']), 'bytes': c['bytes']}
+        return out
+
+def instrumented_cache(name, **cache_kwargs):
+    """cache.cached 에 적중/미스/크기 집계와 구간 계측을 붙임. __wrapped__ 는 캐시 없는 원본 함수.
+    Streamlit 에 의존하지 않으므로 배치 CLI/워커에서도 같은 캐시(persist=True 면 SQLite 공유)를 씀"""
+    def deco(fn):
+        @functools.wraps(fn)
+        def on_miss(*args, **kwargs):
+            with span(f"{name}.miss"): return fn(*args, **kwargs)
+        cached_fn = cached(name, hook=cache_hook, **cache_kwargs)(on_miss)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name): return cached_fn(*args, **kwargs)
+        wrapper.cache = cached_fn.cache
+        wrapper.clear = cached_fn.clear
+        wrapper.__wrapped__ = fn
+        return wrapper
+    return deco
+
+# -----------------------------------------------------------
+# 3. 내보내기 (JSON / Prometheus 텍스트 / HTTP /metrics)
+# -----------------------------------------------------------
+def snapshot():
+    return {'ts': time.time(), 'spans': span_stats(), 'caches': cache_stats()}
+
+def _metric_name(name):
+    return "".join(c if c.isalnum() else "_" for c in name)
+
+def prometheus_text():
+    lines = ["# TYPE eps_trader_span_ms summary"]
+    for name, s in span_stats().items():
+        label = f'span="{_metric_name(name)}"'
+        lines.append(f'eps_trader_span_ms{{{label},quantile="0.5"}} {s["p50_ms"]:.3f}')
+        lines.append(f'eps_trader_span_ms{{{label},quantile="0.95"}} {s["p95_ms"]:.3f}')
+        lines.append(f'eps_trader_span_ms_count{{{label}}} {s["count"]}')
+    for metric in ('hits', 'misses', 'stale', 'evictions', 'entries', 'bytes'):
+        kind = "counter" if metric in ('hits', 'misses', 'stale', 'evictions') else "gauge"
+        lines.append(f"# TYPE eps_trader_cache_{metric} {kind}")
+        for name, c in cache_stats().items():
+            lines.append(f'eps_trader_cache_{metric}{{cache="{_metric_name(name)}"}} {c[metric]}')
+    return "\n".join(lines) + "\n"
+
+_server = None
+
+def start_metrics_server(port=None):
+    """프로세스당 한 번, 데몬 스레드로 /metrics 제공"""
+    global _server
+    port = port or METRICS_PORT
+    if _server is not None or not port: return _server
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.startswith("/metrics"):
+                body, ctype = prometheus_text().encode(), "text/plain; version=0.0.4"
+            elif self.path.startswith("/stats.json"):
+                body, ctype = json.dumps(snapshot(), ensure_ascii=False).encode(), "application/json"
+            else:
+                self.send_error(404); return
+            self.send_response(200)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args): pass
+
+    try:
+        _server = ThreadingHTTPServer(("0.0.0.0", int(port)), Handler)
+    except OSError as e:  # Streamlit 재실행 등으로 이미 포트를 쓰는 경우
+        print(f"⚠️ metrics 서버 시작 실패: {e}")
+        return None
+    threading.Thread(target=_server.serve_forever, name="metrics", daemon=True).start()
+    return _server
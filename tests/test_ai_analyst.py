@@ -0,0 +1,64 @@
+import pytest
+
+import cache
+import ai_analyst
+from ai_analyst import FakeLLM, AIJob, stream_ai, build_prompt, CACHE_TTL
+
+ARGS = ("NVDA", "엔비디아", 12.5, 3.2, "+1.10%p", "안정", "회복", "강력 매수")
+
+class Clock:
+    def __init__(self): self.now = 1_000_000.0
+    def __call__(self): return self.now
+
+class CountingLLM(FakeLLM):
+    def __init__(self, fail=False):
+        super().__init__()
+        self.calls, self.fail = 0, fail
+
+    def stream(self, prompt):
+        self.calls += 1
+        for i, chunk in enumerate(super().stream(prompt)):
+            if self.fail and i == 2: raise RuntimeError("quota")
+            yield chunk
+
+@pytest.fixture(autouse=True)
+def clock(monkeypatch):
+    c = Clock()
+    monkeypatch.setattr(cache.time, "time", c)
+    ai_analyst._cache.clear()
+    yield c
+    ai_analyst._cache.clear()
+
+def test_chunks_stream_in_order():
+    expected = [c.content for c in FakeLLM().stream(build_prompt(*ARGS))]
+    assert len(expected) > 3
+    assert list(stream_ai(*ARGS, llm=FakeLLM())) == expected
+
+def test_second_call_is_served_from_cache():
+    llm = CountingLLM()
+    first = "".join(stream_ai(*ARGS, llm=llm))
+    assert list(stream_ai(*ARGS, llm=llm)) == [first]
+    assert llm.calls == 1
+    assert "".join(stream_ai(*ARGS[:-1], "매도", llm=llm)) and llm.calls == 2   # 입력이 다르면 새로 호출
+
+def test_cache_expires_after_ttl(clock):
+    llm = CountingLLM()
+    "".join(stream_ai(*ARGS, llm=llm))
+    clock.now += CACHE_TTL + 1
+    "".join(stream_ai(*ARGS, llm=llm))
+    assert llm.calls == 2
+
+def test_errors_are_not_cached():
+    failing = CountingLLM(fail=True)
+    out = list(stream_ai(*ARGS, llm=failing))
+    assert out[-1].startswith("Error:") and len(out) == 3
+    llm = CountingLLM()
+    assert not "".join(stream_ai(*ARGS, llm=llm)).startswith("Error:")
+    assert llm.calls == 1
+
+def test_job_chunks_end():
+    job = AIJob(*ARGS, llm=FakeLLM(delay=0.001))
+    text = "".join(job.chunks())
+    job.thread.join(1)
+    assert not job.thread.is_alive()
+    assert text == "".join(c.content for c in FakeLLM().stream(build_prompt(*ARGS)))
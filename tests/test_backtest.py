@@ -0,0 +1,26 @@
+import numpy as np
+import pandas as pd
+
+import backtest
+from logic import classify_cli_array, classify_trade_signal, TRADE_SIGNALS
+
+def test_cli_nan_is_unknown():
+    codes = classify_cli_array([np.nan, 100.1, 100.3, 100.2, np.nan, 99.0, 99.5])
+    # 앞 두 시점, 그리고 최근 3개월 안에 결측이 있는 시점은 -1 (7 '완만한 조정' 이 아님)
+    assert codes.tolist() == [-1, -1, -1, 6, -1, -1, -1]
+
+def test_lagged_first_month_is_unknown():
+    snapshots, prices, cli = backtest.synthetic_inputs(n_tickers=4, years=2)
+    _, sig = backtest.run_backtest(snapshots, prices, cli, cli_lag=1)
+    # 첫 달은 시프트로 CLI 가 비어 있고, 그다음 두 달은 3개월 비교가 불가능
+    assert (sig['regime'][:, :3] == -1).all()
+    assert (sig['regime'][:, 3:] >= 0).all()
+
+def test_signal_codes_match_live_rule():
+    snapshots, prices, cli = backtest.synthetic_inputs(n_tickers=6, years=2)
+    _, sig = backtest.run_backtest(snapshots, prices, cli)
+    fwd, accel = sig['fwd'], sig['accel']
+    for i in range(fwd.shape[0]):
+        for t in range(1, fwd.shape[1]):
+            expected = classify_trade_signal(fwd[i, t], fwd[i, t - 1], accel[i, t])
+            assert TRADE_SIGNALS[sig['signal'][i, t]] == expected
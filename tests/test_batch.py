@@ -0,0 +1,18 @@
+import pandas as pd
+
+import peer_rank
+from batch import write_results, load_results
+
+def results(n=6):
+    return pd.DataFrame({'Ticker': [f"T{i}" for i in range(n)], 'Country': "KR", 'Status': "OK",
+                         'Market': "KOSPI", 'Sector': "A", 'Growth': range(n), 'Accel': range(n)})
+
+def test_parquet_fallback_is_found(tmp_path, monkeypatch):
+    def no_engine(*args, **kwargs): raise ImportError("no parquet engine")
+    monkeypatch.setattr(pd.DataFrame, "to_parquet", no_engine)
+    path = str(tmp_path / "signals.parquet")
+    written = write_results(results(), path)
+    assert written.endswith(".csv")
+    assert len(load_results(path)) == 6
+    monkeypatch.setattr(peer_rank, "_ranks", None)
+    assert len(peer_rank.get_peer_ranks(path)) == 6
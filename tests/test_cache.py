@@ -0,0 +1,97 @@
+import time
+import threading
+
+import pytest
+
+import cache
+from cache import Cache
+
+class Clock:
+    def __init__(self): self.now = 1_000_000.0
+    def __call__(self): return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    c = Clock()
+    monkeypatch.setattr(cache.time, "time", c)
+    return c
+
+def settle(c):
+    for _ in range(200):
+        if not c._refreshing: return
+        threading.Event().wait(0.01)
+    raise AssertionError("백그라운드 갱신이 끝나지 않음")
+
+def counter(values):
+    calls = []
+    def compute():
+        calls.append(1)
+        v = values[min(len(calls), len(values)) - 1]
+        if isinstance(v, Exception): raise v
+        return v
+    return compute, calls
+
+def test_fresh_stale_expired(clock):
+    c = Cache("t", ttl=10, stale_ttl=20)
+    compute, calls = counter(["v1", "v2", "v3"])
+    assert c.get_or_compute("k", compute) == "v1"
+    clock.now += 5
+    assert c.get_or_compute("k", compute) == "v1" and len(calls) == 1     # fresh
+    clock.now += 10
+    assert c.get_or_compute("k", compute) == "v1"                          # stale: 옛 값 + 백그라운드 갱신
+    settle(c)
+    assert len(calls) == 2 and c.get_or_compute("k", compute) == "v2"
+    clock.now += 31
+    assert c.get_or_compute("k", compute) == "v3" and len(calls) == 3     # expired: 동기 재계산
+
+@pytest.mark.parametrize("failure", [RuntimeError("down"), None])
+def test_failed_refresh_keeps_stale_value(clock, failure):
+    c = Cache("t", ttl=10, stale_ttl=100)
+    compute, calls = counter(["good", failure])
+    c.get_or_compute("k", compute)
+    clock.now += 15
+    assert c.get_or_compute("k", compute) == "good"
+    settle(c)
+    assert len(calls) == 2 and c.mem.get("k")[2] == "good"
+
+def test_failure_is_not_cached(clock):
+    c = Cache("t", ttl=10)
+    compute, calls = counter([None, "ok"])
+    assert c.get_or_compute("k", compute) is None
+    assert c.get_or_compute("k", compute) == "ok" and len(calls) == 2
+
+def test_lru_eviction_by_entries_and_bytes(clock):
+    events = []
+    c = Cache("t", max_entries=2, hook=lambda name, event, key, size: events.append((event, key)))
+    for k in "abc":
+        c.get_or_compute(k, lambda k=k: k)
+        if k == "b": c.get_or_compute("a", lambda: "x")   # a 를 최근 사용으로
+    assert set(c.mem.data) == {"a", "c"} and ("evict", "b") in events
+    big = Cache("t", max_bytes=1000)
+    big.get_or_compute("x", lambda: b"x" * 600)
+    big.get_or_compute("y", lambda: b"y" * 600)
+    assert list(big.mem.data) == ["y"]
+    big.get_or_compute("z", lambda: b"z" * 5000)                 # 예산보다 큰 값은 저장 안 함
+    assert list(big.mem.data) == ["y"]
+
+def test_concurrent_misses_compute_once(clock):
+    c = Cache("t", ttl=10)
+    gate = threading.Event()
+    calls = []
+    def compute():
+        calls.append(1)
+        gate.wait(2)
+        return "v"
+    threads = [threading.Thread(target=lambda: c.get_or_compute("k", compute)) for _ in range(8)]
+    for t in threads: t.start()
+    time.sleep(0.1)
+    gate.set()
+    for t in threads: t.join()
+    assert len(calls) == 1
+
+def test_persisted_value_survives_new_process(clock, tmp_path):
+    db = str(tmp_path / "cache.sqlite")
+    Cache("t", ttl=10, persist=True, db_path=db).get_or_compute("k", lambda: {"v": 1})
+    compute, calls = counter([{"v": 2}])
+    assert Cache("t", ttl=10, persist=True, db_path=db).get_or_compute("k", compute) == {"v": 1}
+    assert not calls
@@ -0,0 +1,39 @@
+import pandas as pd
+import pytest
+
+import crawler
+import data_loader
+
+class FailingTicker:
+    def __init__(self, ticker): pass
+
+    def __getattr__(self, name):
+        raise ConnectionError("429 Too Many Requests")
+
+class EmptyTicker:
+    def __init__(self, ticker): pass
+
+    def __getattr__(self, name):
+        return pd.DataFrame()
+
+@pytest.mark.parametrize("fake", [FailingTicker, EmptyTicker])
+def test_failed_yahoo_fetch_is_checkpointed_as_error(tmp_path, monkeypatch, fake):
+    import yfinance
+    monkeypatch.setattr(yfinance, "Ticker", fake)
+    archive = crawler.RawArchive(str(tmp_path))
+    counts = crawler.crawl([("AAPL", "AAPL", "US")], archive, run="r1", workers=1, progress_every=0)
+    assert counts['error'] == 1 and counts['done'] == 0
+    assert archive.done_keys("r1", "yahoo") == set()
+    assert archive.latest("yahoo") == []
+
+def test_partial_failure_is_strict_only(monkeypatch):
+    import yfinance
+    class Partial:
+        def __init__(self, ticker): pass
+        quarterly_income_stmt = pd.DataFrame({'2025-03-31': [1.0]}, index=['Diluted EPS'])
+        @property
+        def earnings_estimate(self): raise ConnectionError("timeout")
+    monkeypatch.setattr(yfinance, "Ticker", Partial)
+    assert data_loader.fetch_yahoo_raw("AAPL")['earnings_estimate'] is None
+    with pytest.raises(RuntimeError):
+        data_loader.fetch_yahoo_raw("AAPL", strict=True)
@@ -0,0 +1,55 @@
+import threading
+
+import pandas as pd
+import pytest
+
+import cache
+import data_loader
+
+class Clock:
+    def __init__(self): self.now = 1_000_000.0
+    def __call__(self): return self.now
+
+@pytest.fixture
+def unified(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache.time, "time", clock)
+    c = data_loader.get_unified_data.cache
+    monkeypatch.setattr(c, "persist", False)
+    c.mem.clear()
+    yahoo = []
+    monkeypatch.setattr(data_loader, "OFFLINE", False)
+    monkeypatch.setattr(data_loader, "get_yahoo_data", lambda t: yahoo.pop(0))
+    monkeypatch.setattr(data_loader, "_record_snapshot", lambda t, layers: ({}, pd.DataFrame()))
+    yield c, clock, yahoo
+    c.mem.clear()
+
+GOOD = ({(2025, q): 1.0 for q in range(1, 5)},
+        {2026: 6.0, 2027: 7.0, 2028: 8.0},
+        {(2026, q): 1.5 for q in range(1, 5)})
+FAILED = ({}, {}, {})
+
+def settle(c):
+    for _ in range(200):
+        if not c._refreshing: return
+        threading.Event().wait(0.01)
+    raise AssertionError("백그라운드 갱신이 끝나지 않음")
+
+def test_failed_lookup_is_not_cached(unified):
+    c, clock, yahoo = unified
+    yahoo += [FAILED, GOOD]
+    df_ui, trend = data_loader.get_unified_data("FAIL", "US")
+    assert df_ui.empty and trend.empty
+    assert not data_loader.get_unified_data("FAIL", "US")[1].empty   # 다시 계산됨
+    assert not yahoo
+
+def test_failed_refresh_keeps_stale_value(unified):
+    c, clock, yahoo = unified
+    yahoo += [GOOD, FAILED]
+    good = data_loader.get_unified_data("NVDA", "US")[1]
+    clock.now += c.ttl + 1
+    stale = data_loader.get_unified_data("NVDA", "US")[1]   # stale: 기존 값 + 백그라운드 갱신 (실패)
+    settle(c)
+    assert not yahoo
+    pd.testing.assert_frame_equal(stale, good)
+    pd.testing.assert_frame_equal(data_loader.get_unified_data("NVDA", "US")[1], good)
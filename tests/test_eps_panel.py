@@ -0,0 +1,24 @@
+import random
+
+import numpy as np
+
+from bench_fwd_eps import random_layers, legacy_q_map
+from logic import calculate_12m_fwd_batch
+from estimate_store import q_map_from_layers
+from eps_panel import EpsPanel
+
+def test_eps_panel_matches_dict_merge():
+    rng = random.Random(2)
+    layers = {f"T{i:03d}": random_layers(rng) for i in range(200)}
+    dict_fwd = calculate_12m_fwd_batch({t: legacy_q_map(l) for t, l in layers.items()})['12M Fwd EPS']
+    panel_fwd = EpsPanel.from_layers(layers).fwd_batch()['12M Fwd EPS']
+    np.testing.assert_array_equal(dict_fwd.to_numpy(), panel_fwd.to_numpy())
+    for t in ("T000", "T199"):
+        np.testing.assert_array_equal(EpsPanel.from_layers(layers).fwd_series(t)['12M Fwd EPS'].to_numpy(),
+                                      dict_fwd.loc[t].to_numpy())
+
+def test_q_map_matches_legacy_priority():
+    rng = random.Random(3)
+    for _ in range(50):
+        layers = random_layers(rng)
+        assert q_map_from_layers(layers) == legacy_q_map(layers)
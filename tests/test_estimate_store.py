@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from estimate_store import EstimateStore
+from eps_panel import EpsPanel
+
+JAN = {('annual', 2026, 0): 400.0, ('quarter', 2026, 1): 90.0, ('actual', 2025, 4): 80.0}
+
+@pytest.fixture
+def store():
+    return EstimateStore(":memory:")
+
+def test_unchanged_rows_are_skipped(store):
+    assert store.append_snapshot("T", JAN, "2026-01-10") == 3
+    assert store.append_snapshot("T", dict(JAN), "2026-01-20") == 0
+    assert store.append_snapshot("T", {**JAN, ('annual', 2026, 0): 420.0}, "2026-02-10") == 1
+    assert len(store.read_range("T")) == 4
+
+def test_disappeared_estimate_is_recorded_as_null(store):
+    store.append_snapshot("T", JAN, "2026-01-10")
+    gone = {k: v for k, v in JAN.items() if k[0] != 'quarter'}
+    assert store.append_snapshot("T", gone, "2026-02-10") == 1
+    rows = store.read_range("T", start="2026-02-01")
+    assert len(rows) == 1 and rows['source'].iloc[0] == 'quarter' and pd.isna(rows['value'].iloc[0])
+    assert store.layers_asof("T") == gone
+    assert store.append_snapshot("T", gone, "2026-03-10") == 0    # NULL 은 한 번만 기록
+
+def test_layers_asof_past_date(store):
+    store.append_snapshot("T", JAN, "2026-01-10")
+    store.append_snapshot("T", {**JAN, ('annual', 2026, 0): 420.0, ('annual', 2027, 0): 500.0}, "2026-02-10")
+    assert store.layers_asof("T", "2026-01-31") == JAN
+    assert store.layers_asof("T", "2026-02-10")[('annual', 2026, 0)] == 420.0
+    assert store.layers_asof("T", "2025-12-31") == {}
+
+def test_revision_trend_uses_estimates_known_each_month(store):
+    feb = {**JAN, ('annual', 2026, 0): 440.0, ('quarter', 2026, 2): 110.0}
+    apr = {k: v for k, v in feb.items() if k != ('quarter', 2026, 1)}
+    store.append_snapshot("T", JAN, "2026-01-10")
+    store.append_snapshot("T", {**JAN, ('annual', 2026, 0): 999.0}, "2026-02-03")   # 같은 달 안에서는 마지막 값
+    store.append_snapshot("T", feb, "2026-02-20")
+    store.append_snapshot("T", apr, "2026-04-15")                                    # 3월은 기록 없음
+    trend = store.revision_trend("T")
+    assert list(trend.index.strftime('%Y-%m')) == ['2026-01', '2026-02', '2026-03', '2026-04']
+    states = {'2026-01': JAN, '2026-02': feb, '2026-03': feb, '2026-04': apr}
+    panel = EpsPanel.from_layers(states)
+    month_ords = np.array([2026 * 12 + m - 1 for m in (1, 2, 3, 4)])
+    np.testing.assert_array_equal(trend['12M Fwd EPS'].to_numpy(), panel.fwd_rows(month_ords))
+    assert trend['12M Fwd EPS'].iloc[1] != trend['12M Fwd EPS'].iloc[0]
+    assert len(store.revision_trend("T", start="2026-03-01")) == 2
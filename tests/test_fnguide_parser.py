@@ -0,0 +1,16 @@
+import os
+
+from bench_fnguide_parser import legacy_parse
+from fnguide_parser import parse_fnguide_eps
+
+PAGE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                    "fixtures", "fnguide", "A005930_synthetic.html")
+
+def test_lxml_parser_matches_read_html():
+    with open(PAGE, encoding="utf-8") as f: html = f.read()
+    new = parse_fnguide_eps(html)
+    assert new and any(k.startswith("A|") for k in new) and any(k.startswith("Q|") for k in new)
+    assert new == legacy_parse(html)
+
+def test_page_without_eps_table():
+    assert parse_fnguide_eps("<html><body><table><tr><th>매출액</th><td>1</td></tr></table></body></html>") == {}
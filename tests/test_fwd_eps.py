@@ -0,0 +1,23 @@
+import random
+
+import numpy as np
+
+from bench_fwd_eps import legacy_12m_fwd_series, random_q_map, actual_layers
+from logic import calculate_12m_fwd_batch
+from eps_panel import EpsPanel
+
+def test_vectorized_matches_loop():
+    rng = random.Random(1)
+    q_maps = {f"T{i:03d}": random_q_map(rng) for i in range(200)}
+    q_maps["EMPTY"] = {}
+    batch = calculate_12m_fwd_batch(q_maps)['12M Fwd EPS']
+    panel = EpsPanel.from_layers({t: actual_layers(m) for t, m in q_maps.items()})
+    checked = 0
+    for t, q_map in q_maps.items():
+        legacy = legacy_12m_fwd_series(q_map)
+        if legacy.empty: continue
+        expected = legacy['12M Fwd EPS'].to_numpy(dtype=float)
+        np.testing.assert_array_equal(batch.loc[t].to_numpy(), expected)
+        np.testing.assert_array_equal(panel.fwd_series(t)['12M Fwd EPS'].to_numpy(), expected)
+        checked += 1
+    assert checked == 200
@@ -0,0 +1,5 @@
+import bench_http_client
+
+def test_http_client_behaviour():
+    # 병합 / 429 재시도 / 속도 제한 / 연결 재사용 (로컬 스텁 서버, 실패하면 AssertionError)
+    bench_http_client.main()
@@ -0,0 +1,73 @@
+import os
+
+import pandas as pd
+import pytest
+
+import recorder
+from macro_store import MacroStore, CLI_CACHE, CLI_SERIES
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "pipeline")
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(recorder, "MODE", "replay")
+    monkeypatch.setattr(recorder, "FIXTURE_DIR", FIXTURES)
+    return MacroStore(str(tmp_path))
+
+def test_load_from_recorded_fixtures(store):
+    y_c, h_s, cli = store.load()
+    assert not y_c.empty and not h_s.empty
+    assert list(cli.columns) == list(CLI_SERIES)
+    assert cli.index.is_monotonic_increasing and not cli.index.duplicated().any()
+
+def test_refresh_overwrites_revised_months(store):
+    fresh = store.update_series(CLI_CACHE)
+    stale = fresh.copy()
+    stale.iloc[-3:] += 1.0       # 이전 발표값 (이후 OECD 가 수정)
+    stale.iloc[-24] += 1.0       # 재요청 구간 밖은 캐시 값 유지
+    stale.to_csv(store._path(CLI_CACHE))
+    updated = store.update_series(CLI_CACHE)
+    pd.testing.assert_frame_equal(updated.iloc[-3:], fresh.iloc[-3:], check_freq=False)
+    assert (updated.iloc[-24] == fresh.iloc[-24] + 1.0).all()
+
+def test_refresh_overwrites_revised_fred_days(store):
+    fresh = store.update_series('T10Y2Y')
+    stale = fresh.copy()
+    stale.iloc[-2:] += 1.0
+    stale.to_csv(store._path('T10Y2Y'))
+    updated = store.update_series('T10Y2Y')
+    pd.testing.assert_frame_equal(updated.iloc[-2:], fresh.iloc[-2:], check_freq=False)
+
+@pytest.fixture
+def cli_calls(monkeypatch):
+    """fetch_oecd_cli 호출 기록: (요청한 국가 목록, 시작 시점)"""
+    import macro_store
+    calls, real = [], macro_store.fetch_oecd_cli
+    def spy(series, start=None):
+        calls.append((sorted(series), start))
+        return real(series, start)
+    monkeypatch.setattr(macro_store, "fetch_oecd_cli", spy)
+    return calls
+
+def test_missing_country_fetched_alone(store, cli_calls):
+    fresh = store.update_series(CLI_CACHE)
+    fresh.drop(columns=['인도_CLI']).to_csv(store._path(CLI_CACHE))  # 지난 응답에서 인도가 빠졌던 캐시
+    cli_calls.clear()
+    updated = store.update_series(CLI_CACHE)
+    full = [names for names, start in cli_calls if start is None]
+    incremental = [names for names, start in cli_calls if start is not None]
+    assert full == [['인도_CLI']]
+    assert incremental == [sorted(n for n in CLI_SERIES if n != '인도_CLI')]
+    assert list(updated.columns) == list(CLI_SERIES)
+    pd.testing.assert_frame_equal(updated, fresh, check_freq=False)
+
+def test_omitted_country_does_not_refetch_others(store, cli_calls, monkeypatch):
+    import macro_store
+    spy = macro_store.fetch_oecd_cli
+    monkeypatch.setattr(macro_store, "fetch_oecd_cli",  # 응답에서 인도가 계속 빠짐
+                        lambda series, start=None: spy(series, start).drop(columns=['인도_CLI'], errors='ignore'))
+    store.update_series(CLI_CACHE)
+    cli_calls.clear()
+    updated = store.update_series(CLI_CACHE)
+    assert '인도_CLI' not in updated.columns
+    assert [names for names, start in cli_calls if start is None] == [['인도_CLI']]
@@ -0,0 +1,74 @@
+import time
+import asyncio
+
+import monitor
+from monitor import Monitor, get_monitor, stop_monitor
+
+class FakeMonitor:
+    def __init__(self, targets, sinks=None):
+        self.targets, self.stopped = targets, False
+    def start_in_thread(self):
+        return self
+    def stop(self):
+        self.stopped = True
+
+def test_sessions_share_and_keep_their_monitor(monkeypatch):
+    monkeypatch.setattr(monitor, "Monitor", FakeMonitor)
+    monkeypatch.setattr(monitor, "_monitors", {})
+    monkeypatch.setattr(monitor, "_owners", {})
+    a = get_monitor(["NVDA", "AAPL"], owner="a")
+    assert get_monitor(["AAPL", "NVDA", "AAPL"], owner="b") is a   # 순서/중복 무시하고 공유
+    c = get_monitor(["TSLA"], owner="c")
+    stop_monitor(owner="c")
+    assert c.stopped and not a.stopped
+    get_monitor(["MSFT"], owner="a")                               # a 가 목록을 바꿔도 b 가 쓰는 중
+    assert not a.stopped
+    stop_monitor(owner="b")
+    assert a.stopped
+
+def test_resolve_skips_failing_ticker(monkeypatch):
+    import data_loader
+    def find(t):
+        if t == "BAD": raise RuntimeError("boom")
+        return t, t, "US"
+    monkeypatch.setattr(data_loader, "find_ticker", find)
+    m = Monitor(["BAD", "NVDA"], sinks=[])
+    asyncio.run(m._resolve())
+    assert list(m.watches) == ["NVDA"]
+
+def test_slow_sink_does_not_block_loop():
+    delivered = []
+    def slow_sink(alert):
+        time.sleep(0.5)
+        delivered.append(alert.new)
+    m = Monitor(["NVDA"], sinks=[slow_sink])
+    async def alert_twice():
+        t0 = time.monotonic()
+        m._alert('signal', "NVDA", "a", "b")
+        m._alert('signal', "NVDA", "b", "c")
+        return time.monotonic() - t0
+    assert asyncio.run(alert_twice()) < 0.1
+    m._sink_pool.shutdown(wait=True)
+    assert delivered == ["b", "c"]
+    assert [a.new for a in m.alerts_since(0)[0]] == ["b", "c"]
+
+def test_slow_ticker_does_not_hold_later_polls(monkeypatch):
+    import data_loader
+    polled = []
+    def fetch(ticker, country):
+        if ticker == "SLOW": time.sleep(1.0)
+        polled.append(ticker)
+        return {('annual', 2027, 0): 1.0}
+    monkeypatch.setattr(data_loader, "fetch_estimate_layers", fetch)
+    m = Monitor([("SLOW", "SLOW", "US"), ("FAST", "FAST", "US")], sinks=[])
+    async def run():
+        await m._resolve()
+        m._due = []
+        now = time.monotonic()
+        m._schedule("SLOW", now)
+        m._schedule("FAST", now + 0.2)     # SLOW 가 도는 중에 때가 됨
+        loop = asyncio.create_task(m.estimate_loop())
+        await asyncio.sleep(0.5)
+        loop.cancel()
+        return list(polled)
+    assert asyncio.run(run()) == ["FAST"]
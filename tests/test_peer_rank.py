@@ -0,0 +1,55 @@
+import math
+import copy
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from peer_rank import PeerRanks, add_peer_ranks
+
+def frame(n=40, seed=0):
+    rng = np.random.default_rng(seed)
+    growth = rng.normal(5, 3, n)
+    growth[3] = np.nan
+    return pd.DataFrame({'Ticker': [f"T{i}" for i in range(n)], 'Country': "KR",
+                         'Market': rng.choice(["KOSPI", "KOSDAQ"], n), 'Sector': rng.choice(["A", "B"], n),
+                         'Growth': growth, 'Accel': rng.normal(0, 1, n)})
+
+def same(a, b):
+    assert a.keys() == b.keys()
+    for level in a:
+        assert (a[level].group, a[level].n) == (b[level].group, b[level].n)
+        assert a[level].pct.keys() == b[level].pct.keys()
+        for m in a[level].pct:
+            assert a[level].pct[m] == pytest.approx(b[level].pct[m])
+            assert a[level].z[m] == pytest.approx(b[level].z[m])
+
+@pytest.mark.parametrize("ticker,market,sector,growth,accel", [
+    ("T0", "KOSPI", "A", 7.5, -0.2),        # 기존 종목, 같은 그룹
+    ("T1", "KOSDAQ", "B", 1.0, 0.3),        # 기존 종목 (그룹이 바뀔 수 있음)
+    ("NEW", "KOSPI", "B", 4.0, 0.1),        # 처음 보는 종목
+    ("T3", "KOSPI", "A", 5.0, math.nan),    # 지표 하나가 비어 있음
+])
+def test_rank_matches_update_without_mutating(ticker, market, sector, growth, accel):
+    ranks = PeerRanks.from_frame(frame())
+    before = copy.deepcopy((ranks.members, {k: (g.sorted, g.sums) for k, g in ranks.groups.items()}))
+    got = ranks.rank(ticker, market, sector, growth, accel)
+    assert before == (ranks.members, {k: (g.sorted, g.sums) for k, g in ranks.groups.items()})
+    ranks.update(ticker, market, sector, growth, accel)
+    same(got, ranks.lookup(ticker))
+    if math.isnan(accel): assert 'Accel' not in got['Market'].pct
+
+def test_incremental_matches_batch():
+    df = frame(n=60, seed=1)
+    batch = add_peer_ranks(df)
+    ranks = PeerRanks()
+    for row in frame(n=60, seed=2).itertuples():    # 다른 값으로 먼저 넣고 덮어써서 제거 경로도 확인
+        ranks.update(row.Ticker, row.Market, row.Sector, row.Growth, row.Accel)
+    for row in df.itertuples():
+        ranks.update(row.Ticker, row.Market, row.Sector, row.Growth, row.Accel)
+    for row in batch.to_dict('records'):
+        peers = ranks.lookup(row['Ticker'])
+        for level in ('Market', 'Sector'):
+            for m in ('Growth', 'Accel'):
+                assert peers[level].pct.get(m, math.nan) == pytest.approx(row[f"{m} Pct ({level})"], nan_ok=True)
+                assert peers[level].z.get(m, math.nan) == pytest.approx(row[f"{m} Z ({level})"], nan_ok=True)
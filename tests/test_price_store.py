@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+
+import price_store
+from price_store import PriceStore
+
+def bars(start, n, close=100.0):
+    idx = pd.bdate_range(start, periods=n)
+    return pd.DataFrame({f: np.full(n, close) for f in price_store.FIELDS}, index=idx)
+
+def test_append_overwrites_same_day_and_keeps_history(tmp_path):
+    store = PriceStore(str(tmp_path))
+    store.append("AAA", bars("2026-01-05", 5, 100.0))
+    held = store.bars("AAA")  # 다른 곳에서 들고 있는 맵과 무관하게 교체돼야 함
+    store.append("AAA", bars("2026-01-09", 3, 101.0))
+    hist = store.history("AAA")
+    assert len(hist) == 7
+    assert hist['Close'].iloc[3] == 100.0 and hist['Close'].iloc[4] == 101.0
+    assert len(held) == 5
+
+def test_missing_ticker_is_not_refetched(tmp_path, monkeypatch):
+    calls = []
+    def fake_fetch(tickers, start):
+        calls.append(list(tickers))
+        return {}
+    monkeypatch.setattr(price_store, "fetch_bars", fake_fetch)
+    store = PriceStore(str(tmp_path))
+    assert store.latest("NOPE") is None
+    assert store.latest("NOPE") is None
+    assert calls == [["NOPE"]]
@@ -0,0 +1,20 @@
+import time
+import threading
+
+from screener import screen_universe
+
+def test_hung_tickers_do_not_starve_pool():
+    release = threading.Event()
+    def analyze(ticker, name, country):
+        if ticker.startswith("HANG"): release.wait(5)
+        return {'Ticker': ticker, 'Status': "OK"}
+    targets = [(f"HANG{i}", "x", "KR") for i in range(2)] + [(f"T{i}", "x", "KR") for i in range(6)]
+    t0 = time.monotonic()
+    try:
+        rows = list(screen_universe(targets, max_workers=2, timeout=0.3, analyze=analyze))
+    finally:
+        release.set()
+    status = {r['Ticker']: r['Status'] for r in rows}
+    assert [status[f"HANG{i}"] for i in range(2)] == ["시간 초과"] * 2
+    assert all(status[f"T{i}"] == "OK" for i in range(6))
+    assert time.monotonic() - t0 < 2
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+import estimate_store
+from data_loader import _pick_trend
+from estimate_store import layers_from_yahoo
+from eps_panel import EpsPanel, SOURCE_ANNUAL, SOURCE_QUARTER
+from logic import TRADE_SIGNALS
+from sensitivity import ticker_sensitivity, signal_sensitivity, GRID_LEVELS
+
+def layers(scale=1.0):
+    past = {(2025, q): 1.0 * scale for q in range(1, 5)}
+    est_q = {(2026, q): (1.2 + 0.1 * q) * scale for q in range(1, 5)}
+    est_a = {2027: 7.0 * scale, 2028: 8.0 * scale}
+    return layers_from_yahoo(past, est_a, est_q)
+
+def test_uses_layers_behind_displayed_trend(monkeypatch):
+    shown = layers()
+    class Store:
+        def layers_asof(self, ticker): return layers(scale=3.0)   # 그 사이 저장소가 더 새 스냅샷을 받음
+    monkeypatch.setattr(estimate_store, "get_store", lambda: Store())
+    trend = _pick_trend("TEST", shown, None)
+    got = ticker_sensitivity("TEST", trend, n=50, seed=0)
+    want = signal_sensitivity(shown, n=50, seed=0)
+    assert (got.base_signal, got.fwd, got.probs) == (want.base_signal, want.fwd, want.probs)
+    assert ticker_sensitivity("TEST", n=50, seed=0).fwd != got.fwd   # 추세가 없을 때만 저장소 값
+
+END = "2026-03-31"
+
+def rising():
+    past = {(2025, q): 1.0 + 0.05 * q for q in range(1, 5)}
+    est_q = {(2026, q): 1.3 + 0.1 * q for q in range(1, 5)}
+    est_a = {2027: 8.0, 2028: 9.0}
+    return layers_from_yahoo(past, est_a, est_q)
+
+def test_probabilities_sum_to_one():
+    s = signal_sensitivity(rising(), n=2000, seed=1, end=END)
+    assert sum(s.probs.values()) == pytest.approx(1.0)
+    assert list(s.probs) == TRADE_SIGNALS and s.n == 2000
+    assert 0.0 <= s.stability <= 1.0
+
+def test_zero_sigma_keeps_base_signal():
+    s = signal_sensitivity(rising(), n=500, sigma=0.0, seed=1, end=END)
+    assert s.probs[s.base_signal] == 1.0
+    assert s.fwd['p5'] == s.fwd['p95']
+
+def test_grid_center_is_base_signal():
+    s = signal_sensitivity(rising(), mode='grid', end=END)
+    assert s.grid.shape == (len(GRID_LEVELS), len(GRID_LEVELS))
+    mid = len(GRID_LEVELS) // 2
+    assert abs(GRID_LEVELS[mid]) < 1e-12
+    assert s.grid.iloc[mid, mid] == s.base_signal
+    assert s.n == len(GRID_LEVELS) ** 2
+
+def test_fixed_seed_is_repeatable():
+    a = signal_sensitivity(rising(), n=1000, seed=7, end=END)
+    b = signal_sensitivity(rising(), n=1000, seed=7, end=END)
+    assert (a.probs, a.fwd, a.growth, a.accel) == (b.probs, b.fwd, b.growth, b.accel)
+    assert signal_sensitivity(rising(), n=1000, seed=8, end=END).fwd != a.fwd
+
+def test_actuals_are_never_shocked():
+    # 확정 실적이 예측 구간 전체를 덮으면 (같은 분기의 추정치보다 우선) 어떤 충격에도 결과가 같아야 함
+    past = {(y, q): 1.0 + 0.1 * (y - 2025) + 0.01 * q for y in range(2025, 2029) for q in range(1, 5)}
+    layers = layers_from_yahoo(past, {2026: 50.0, 2027: 60.0}, {(2026, 2): 40.0})
+    s = signal_sensitivity(layers, n=500, sigma=0.5, seed=3, end=END)
+    assert s.fwd['p5'] == s.fwd['p95'] and s.probs[s.base_signal] == 1.0
+
+def test_only_estimate_cells_are_shocked(monkeypatch):
+    import sensitivity
+    seen = []
+    def capture(values, mask, base, dates):
+        seen.append(values.copy())
+        return real(values, mask, base, dates)
+    real = sensitivity.calculate_12m_fwd_matrix
+    monkeypatch.setattr(sensitivity, "calculate_12m_fwd_matrix", capture)
+    layers = rising()
+    signal_sensitivity(layers, n=200, sigma=0.2, seed=4, end=END)
+    panel = EpsPanel.from_layers({0: layers})
+    estimated = np.isin(panel.source[0], (SOURCE_ANNUAL, SOURCE_QUARTER))
+    scen = seen[0]
+    assert estimated.any() and (~estimated & panel.mask[0]).any()
+    np.testing.assert_array_equal(scen[:, ~estimated], np.broadcast_to(panel.values[0][~estimated], scen[:, ~estimated].shape))
+    assert (scen[1:, estimated] != panel.values[0][estimated]).all()
@@ -0,0 +1,31 @@
+import time
+
+import data_loader
+from ticker_index import SearchCache
+
+def test_fallback_search_result_expires(tmp_path, monkeypatch):
+    cache = SearchCache(str(tmp_path / "search.json"))
+    cache.put("삼성", "005930.KS", "KR")
+    cache.put("없는종목", "없는종목", "US", ttl=60)
+    assert cache.get("없는종목") == ("없는종목", "US")
+    reloaded = SearchCache(cache.path)
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 120)
+    assert reloaded.get("없는종목") is None
+    assert reloaded.get("삼성") == ("005930.KS", "KR")
+
+def test_failed_index_build_backs_off(tmp_path, monkeypatch):
+    calls = []
+    def no_krx():
+        calls.append(1)
+        return None
+    monkeypatch.setattr(data_loader, "get_krx_csv_cache", no_krx)
+    monkeypatch.setattr(data_loader, "INDEX_PATH", str(tmp_path / "index.pkl"))
+    monkeypatch.setattr(data_loader, "_ticker_index", None)
+    assert data_loader.get_ticker_index().lookup("삼성전자") == ("005930.KS", "KR")
+    data_loader.get_ticker_index()
+    assert len(calls) == 1
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + data_loader.INDEX_RETRY_AFTER + 1)
+    data_loader.get_ticker_index()
+    assert len(calls) == 2
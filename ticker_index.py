@@ -0,0 +1,137 @@
+import os
+import json
+import time
+import bisect
+import pickle
+import hashlib
+import threading
+from collections import Counter
+
+INDEX_PATH = os.getenv("TICKER_INDEX_PATH", os.path.join("data", "ticker_index.pkl"))
+YAHOO_CACHE_PATH = os.getenv("YAHOO_SEARCH_CACHE_PATH", os.path.join("data", "yahoo_search_cache.json"))
+INDEX_VERSION = 1
+SEARCH_MISS_TTL = 86400   # 야후 검색에서 못 찾은 입력(그대로 쓰는 대체 결과)은 하루 뒤 다시 검색
+
+# [1단계] 하드코딩 사전 (KRX 목록보다 우선)
+ALIASES = {
+    "테슬라": "TSLA", "애플": "AAPL", "마이크로소프트": "MSFT", "엔비디아": "NVDA", "팔란티어":"PLTR",
+    "구글": "GOOGL", "아마존": "AMZN", "메타": "META", "브로드컴": "AVGO",
+    "티에스엠": "TSM", "AMD": "AMD", "인텔": "INTC", "마이크론": "MU",
+    "스타벅스": "SBUX", "코카콜라": "KO", "나이키": "NKE", "리얼티인컴": "O",
+    "삼성전자": "005930.KS", "SK하이닉스": "000660.KS", "카카오": "035720.KS", "네이버": "035420.KS",
+    "현대차": "005380.KS", "기아": "000270.KS"
+}
+
+def normalize(name):
+    return str(name).replace(" ", "").upper()
+
+def country_of(ticker):
+    return "KR" if (".KS" in ticker or ".KQ" in ticker) else "US"
+
+def ngrams(text):
+    if len(text) < 2: return {text} if text else set()
+    return {text[i:i+2] for i in range(len(text) - 1)}
+
+# -----------------------------------------------------------
+# 1. 정규화 이름/심볼 해시 + 접두어(bisect) + 2-gram 역색인
+# -----------------------------------------------------------
+class TickerIndex:
+    def __init__(self, entries, signature=""):
+        """entries: [(표시 이름, 티커)] - 앞쪽 항목이 같은 이름/심볼에서 우선"""
+        self.entries = list(entries)
+        self.signature = signature
+        self.built_at = time.time()
+        self.by_name, self.by_symbol = {}, {}
+        for i, (name, ticker) in enumerate(self.entries):
+            self.by_name.setdefault(normalize(name), i)
+            self.by_symbol.setdefault(ticker.upper(), i)
+            self.by_symbol.setdefault(ticker.upper().split('.')[0], i)  # 005930 -> 005930.KS
+        self.sorted_names = sorted(self.by_name)
+        grams = {}
+        for key, i in self.by_name.items():
+            for g in ngrams(key): grams.setdefault(g, []).append(i)
+        self.grams = grams
+
+    @classmethod
+    def build(cls, krx_df=None, ticker_of=None):
+        entries = list(ALIASES.items())
+        if krx_df is not None:
+            markets = krx_df['Market'] if 'Market' in krx_df.columns else ['KOSPI'] * len(krx_df)
+            entries += [(str(name), ticker_of(sym, mkt))
+                        for name, sym, mkt in zip(krx_df['Name'], krx_df['Symbol'], markets)]
+        sig = hashlib.sha1(repr((INDEX_VERSION, entries)).encode("utf-8")).hexdigest()
+        return cls(entries, sig)
+
+    def _result(self, i):
+        ticker = self.entries[i][1]
+        return ticker, country_of(ticker)
+
+    def lookup(self, query):
+        """정확 일치(이름 -> 심볼) -> (ticker, country) 또는 None"""
+        key = normalize(query)
+        i = self.by_name.get(key)
+        if i is None: i = self.by_symbol.get(key)
+        return None if i is None else self._result(i)
+
+    def suggest(self, query, limit=5):
+        """입력 중 자동완성/오타 보정 후보: 접두어 일치 우선, 나머지는 2-gram 유사도 순"""
+        key = normalize(query)
+        if not key: return []
+        out, seen = [], set()
+        pos = bisect.bisect_left(self.sorted_names, key)
+        while pos < len(self.sorted_names) and self.sorted_names[pos].startswith(key) and len(out) < limit:
+            i = self.by_name[self.sorted_names[pos]]
+            out.append(i); seen.add(i); pos += 1
+
+        q_grams = ngrams(key)
+        hits = Counter(i for g in q_grams for i in self.grams.get(g, ()))
+        scored = []
+        for i, common in hits.items():
+            if i in seen: continue
+            name_grams = len(ngrams(normalize(self.entries[i][0])))
+            scored.append((2 * common / (len(q_grams) + name_grams), i))
+        scored.sort(key=lambda x: (-x[0], self.entries[x[1]][0]))
+        out += [i for score, i in scored if score >= 0.3][:limit - len(out)]
+        return [(self.entries[i][0], *self._result(i)) for i in out]
+
+    def save(self, path=INDEX_PATH):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f: pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path=INDEX_PATH, max_age=None):
+        try:
+            if max_age is not None and time.time() - os.path.getmtime(path) > max_age: return None
+            with open(path, "rb") as f: idx = pickle.load(f)
+            return idx if isinstance(idx, cls) else None
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            return None
+
+# -----------------------------------------------------------
+# 2. 야후 검색 결과 캐시 (진짜 미스일 때만 호출, 결과는 디스크에 보관)
+# -----------------------------------------------------------
+class SearchCache:
+    def __init__(self, path=YAHOO_CACHE_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        try:
+            with open(path, encoding="utf-8") as f: self.data = json.load(f)
+        except (OSError, ValueError):
+            self.data = {}
+
+    def get(self, query):
+        hit = self.data.get(normalize(query))
+        if not hit: return None
+        if len(hit) > 2 and hit[2] is not None and time.time() > hit[2]: return None  # 만료된 대체 결과
+        return tuple(hit[:2])
+
+    def put(self, query, ticker, country, ttl=None):
+        """ttl 을 주면 그 시간이 지난 뒤 get 이 None (다시 검색)"""
+        with self.lock:
+            self.data[normalize(query)] = [ticker, country] + ([time.time() + ttl] if ttl is not None else [])
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f: json.dump(self.data, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
@@ -0,0 +1,57 @@
+"""서버 부팅 직후 백그라운드 예열: 첫 사용자가 오기 전에 느린 캐시를 미리 채움
+
+  start_warmup()      # main.py 에서 호출 (프로세스당 한 번, 데몬 스레드)
+
+순서: 매크로 -> KRX 목록/티커 색인 -> 인기 종목 추정치 -> 인기 종목 가격.
+예열 중인 키를 화면이 먼저 요청하면 캐시의 single-flight 가 같은 계산을 기다리므로 중복 요청은 없다.
+WARMUP=0 이면 끔, WARMUP_TICKERS 로 종목 목록 변경.
+"""
+import os
+import threading
+
+from telemetry import span
+
+ENABLED = os.getenv("WARMUP", "1") != "0"
+POPULAR_TICKERS = os.getenv("WARMUP_TICKERS", "삼성전자,SK하이닉스,현대차,NVDA,AAPL")
+
+def warmup(tickers=POPULAR_TICKERS):
+    """각 단계는 실패해도 다음 단계로 진행 -> {'macro': bool, 'index': bool, 'tickers': 예열 종목 수}"""
+    from data_loader import get_macro_data, get_ticker_index, get_unified_data, find_ticker
+    from screener import parse_watchlist
+    done = {'macro': False, 'index': False, 'tickers': 0}
+    try:
+        with span("warmup.macro"): get_macro_data()
+        done['macro'] = True
+    except Exception as e: print(f"⚠️ 예열 실패 (매크로): {e}")
+    try:
+        with span("warmup.index"): get_ticker_index()
+        done['index'] = True
+    except Exception as e: print(f"⚠️ 예열 실패 (티커 색인): {e}")
+
+    resolved = []
+    for target in parse_watchlist(tickers):
+        try:
+            with span("warmup.ticker"):
+                ticker, _, country = find_ticker(target)
+                get_unified_data(ticker, country)
+            resolved.append(ticker)
+        except Exception as e: print(f"⚠️ 예열 실패 ({target}): {e}")
+    done['tickers'] = len(resolved)
+    if resolved:
+        try:
+            from price_store import get_price_store
+            with span("warmup.prices"): get_price_store().update(resolved)
+        except Exception as e: print(f"⚠️ 예열 실패 (가격): {e}")
+    return done
+
+_thread = None
+_thread_lock = threading.Lock()
+
+def start_warmup(tickers=POPULAR_TICKERS):
+    """프로세스당 한 번만 시작 (Streamlit 재실행마다 호출돼도 됨)"""
+    global _thread
+    with _thread_lock:
+        if _thread is None and ENABLED:
+            _thread = threading.Thread(target=warmup, args=(tickers,), name="warmup", daemon=True)
+            _thread.start()
+        return _thread